@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+"""
+Dashboard Query Benchmark for Leap Project
+Generates (or reuses) mock datasets at several scale factors and times the reporting
+views and explorer queries against them, writing latency percentiles, rows scanned
+and EXPLAIN plans as JSON.
+"""
+
+import mysql.connector
+from mysql.connector import Error
+from datetime import datetime
+import json
+import numpy as np
+import time
+import argparse
+import sys
+
+from make_mock_data import (
+    DEFAULT_CHUNK_SIZE, DEFAULT_SEED, INDEX_PROFILES, LOADERS, MAX_WRITERS, REPORTING_VIEWS, TABLE_SCHEMAS,
+    MockDataGenerator, MonthSpoolSink, MySQLSink,
+)
+
+DEFAULT_SCALE_FACTORS = '1,10'
+DEFAULT_WARMUP = 2
+DEFAULT_REPEATS = 10
+DEFAULT_REGRESSION_THRESHOLD = 0.2
+DATASET_TABLE = 'benchmark_dataset'
+HANDLER_READ_STATUS = "SHOW SESSION STATUS LIKE 'Handler_read%'"
+
+# Explorer-style ad hoc queries, run next to the views; --queries replaces them
+EXPLORER_QUERIES = {
+    'top_reps_last_12_months': """
+        SELECT rep_user_id, SUM(won_amount) AS won_amount, SUM(jobs_count) AS jobs_count
+        FROM v_sales_performance
+        WHERE period_month >= DATE_FORMAT(CURDATE() - INTERVAL 12 MONTH, '%Y-%m-01')
+        GROUP BY rep_user_id
+        ORDER BY won_amount DESC
+        LIMIT 20
+    """,
+    'office_revenue_by_month': """
+        SELECT period_month, revenue_won, won_jobs, lost_jobs
+        FROM v_company_performance
+        WHERE office_id = 1
+        ORDER BY period_month
+    """,
+    'top_reps_last_12_months_rollup': """
+        SELECT rep_user_id, SUM(won_amount) AS won_amount, SUM(jobs_count) AS jobs_count
+        FROM v_sales_performance_rollup
+        WHERE period_month >= DATE_FORMAT(CURDATE() - INTERVAL 12 MONTH, '%Y-%m-01')
+        GROUP BY rep_user_id
+        ORDER BY won_amount DESC
+        LIMIT 20
+    """,
+    'office_revenue_by_month_rollup': """
+        SELECT period_month, revenue_won, won_jobs, lost_jobs
+        FROM v_company_performance_rollup
+        WHERE office_id = 1
+        ORDER BY period_month
+    """,
+    'won_jobs_last_90_days': """
+        SELECT sales_rep_user_id, COUNT(*) AS won_jobs, SUM(total_contract_amount) AS won_amount
+        FROM jobs
+        WHERE status = 'closed_won' AND closed_at >= CURDATE() - INTERVAL 90 DAY
+        GROUP BY sales_rep_user_id
+    """,
+    'jobs_created_per_office_this_year': """
+        SELECT office_id, COUNT(*) AS jobs_created
+        FROM jobs
+        WHERE created_at >= MAKEDATE(YEAR(CURDATE()), 1)
+        GROUP BY office_id
+    """,
+    'leads_last_3_months_by_office': """
+        SELECT office_id, COUNT(*) AS leads
+        FROM leads
+        WHERE created_at >= DATE_FORMAT(CURDATE() - INTERVAL 2 MONTH, '%Y-%m-01')
+        GROUP BY office_id
+    """,
+    'invoices_issued_last_month': """
+        SELECT status, COUNT(*) AS invoices, SUM(total_amount) AS total_amount
+        FROM invoices
+        WHERE issue_date >= DATE_FORMAT(CURDATE() - INTERVAL 1 MONTH, '%Y-%m-01')
+          AND issue_date < DATE_FORMAT(CURDATE(), '%Y-%m-01')
+        GROUP BY status
+    """,
+    'ar_aging_totals': """
+        SELECT aging_bucket, COUNT(*) AS invoices, SUM(balance) AS balance
+        FROM v_ar
+        GROUP BY aging_bucket
+    """,
+    'lead_conversion_by_source': """
+        SELECT referral_source, SUM(leads) AS leads, SUM(converted_leads) AS converted_leads
+        FROM v_referral_source
+        GROUP BY referral_source
+    """,
+    'master_jobs_latest_page': """
+        SELECT *
+        FROM v_master_jobs
+        WHERE office_id = 1
+        ORDER BY created_at DESC
+        LIMIT 50
+    """,
+}
+
+
+def load_queries(path):
+    """Read explorer queries from a JSON object of {name: sql}"""
+    with open(path, encoding='utf-8') as handle:
+        queries = json.load(handle)
+    if not isinstance(queries, dict) or not all(isinstance(sql, str) for sql in queries.values()):
+        raise ValueError(f"{path} must contain a JSON object mapping query names to SQL")
+    return queries
+
+
+def latency_summary(latencies):
+    """p50/p95/p99 and range of a list of latencies in milliseconds"""
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        'p50': round(float(p50), 3),
+        'p95': round(float(p95), 3),
+        'p99': round(float(p99), 3),
+        'min': round(min(latencies), 3),
+        'max': round(max(latencies), 3),
+        'mean': round(float(np.mean(latencies)), 3),
+    }
+
+
+def partitions_scanned(plan):
+    """Number of partitions each table access of an EXPLAIN FORMAT=JSON plan reads"""
+    found = {}
+    
+    def walk(node):
+        if isinstance(node, dict):
+            if 'table_name' in node and 'partitions' in node:
+                found.setdefault(node['table_name'], set()).update(node['partitions'])
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+    
+    walk(plan)
+    return {table: len(partitions) for table, partitions in found.items()}
+
+
+def compare_to_baseline(report, baseline, threshold):
+    """Annotate queries with their baseline p95 and return those that got slower than the threshold"""
+    previous = {
+        (dataset['scale_factor'], query['name']): query['latency_ms']['p95']
+        for dataset in baseline.get('datasets', ())
+        for query in dataset.get('queries', ())
+    }
+    regressions = []
+    for dataset in report['datasets']:
+        for query in dataset['queries']:
+            before = previous.get((dataset['scale_factor'], query['name']))
+            if not before:
+                continue
+            ratio = query['latency_ms']['p95'] / before
+            query['baseline_p95_ms'] = before
+            query['p95_ratio'] = round(ratio, 3)
+            if ratio > 1 + threshold:
+                regressions.append({'scale_factor': dataset['scale_factor'], 'name': query['name'],
+                                    'baseline_p95_ms': before, 'p95_ms': query['latency_ms']['p95'],
+                                    'ratio': round(ratio, 3)})
+    return regressions
+
+
+class QueryBenchmark:
+    def __init__(self, host='localhost', user='root', password='', database_prefix='leap_bench',
+                 seed=DEFAULT_SEED, as_of=None, index_profile='none', loader='executemany',
+                 workers=1, chunk_size=DEFAULT_CHUNK_SIZE, writers=1, rows_per_transaction=None,
+                 partition_by_month=False, warmup=DEFAULT_WARMUP, repeats=DEFAULT_REPEATS, regenerate=False):
+        self.host = host
+        self.user = user
+        self.password = password
+        self.database_prefix = database_prefix
+        self.seed = seed
+        self.as_of = as_of
+        self.index_profile = index_profile
+        self.loader = loader
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.writers = writers
+        self.rows_per_transaction = rows_per_transaction
+        self.partition_by_month = partition_by_month
+        self.warmup = warmup
+        self.repeats = repeats
+        self.regenerate = regenerate
+    
+    def database_name(self, scale_factor):
+        """One database per scale factor, e.g. leap_bench_sf0_5"""
+        return f"{self.database_prefix}_sf{scale_factor:g}".replace('.', '_')
+    
+    def connect(self, database=None):
+        return mysql.connector.connect(host=self.host, user=self.user, password=self.password, database=database)
+    
+    def stored_settings(self, database):
+        """Settings the dataset in a database was generated with ({} if there is none)"""
+        connection = self.connect()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(f"CREATE DATABASE IF NOT EXISTS {database}")
+            cursor.execute("SELECT COUNT(*) FROM information_schema.TABLES WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s",
+                           (database, DATASET_TABLE))
+            if not cursor.fetchone()[0]:
+                return {}
+            cursor.execute(f"SELECT name, value FROM {database}.{DATASET_TABLE}")
+            return dict(cursor.fetchall())
+        finally:
+            connection.close()
+    
+    def prepare_dataset(self, scale_factor):
+        """Generate the dataset for a scale factor, or reuse it if its settings match.
+        
+        A reused dataset whose index profile differs only gets its indexes rebuilt.
+        Returns (database, status, seconds).
+        """
+        database = self.database_name(scale_factor)
+        stored = self.stored_settings(database)
+        sink = MySQLSink(self.host, database, self.user, self.password,
+                         loader=self.loader, chunk_size=self.chunk_size,
+                         rows_per_transaction=self.rows_per_transaction, writers=self.writers)
+        generator = MockDataGenerator(
+            scale_factor=scale_factor,
+            chunk_size=self.chunk_size,
+            seed=self.seed,
+            workers=self.workers,
+            as_of=self.as_of,
+            sink=MonthSpoolSink(sink) if self.partition_by_month else sink,
+            defer_indexes=True,
+            index_profile=self.index_profile,
+            rollups=True,
+            partition_by_month=self.partition_by_month
+        )
+        settings = {
+            'scale_factor': f"{scale_factor:g}",
+            'seed': str(self.seed),
+            'as_of': generator.now.strftime('%Y-%m-%d'),
+            'index_profile': self.index_profile,
+            'rollups': 'yes',
+            'layout': 'monthly' if self.partition_by_month else 'flat',
+        }
+        # Without --as-of the data is anchored at today; any earlier dataset will do
+        data_keys = ('scale_factor', 'seed', 'rollups', 'layout') + (('as_of',) if self.as_of else ())
+        
+        start = time.perf_counter()
+        generator.connect()
+        try:
+            if self.regenerate or any(stored.get(key) != settings[key] for key in data_keys):
+                print(f"Generating dataset {database} (scale factor {scale_factor:g})...")
+                generator.drop_tables()
+                generator.execute_schema()
+                generator.generate_all_mock_data()
+                status = 'generated'
+            elif stored.get('index_profile') != self.index_profile:
+                print(f"Rebuilding indexes of {database} for the {self.index_profile} profile...")
+                generator.drop_indexes()
+                generator.build_indexes()
+                generator.create_views()
+                status = 'reindexed'
+            else:
+                settings['as_of'] = stored['as_of']
+                generator.create_views()
+                status = 'reused'
+            
+            cursor = generator.sink.cursor
+            cursor.execute(f"CREATE TABLE IF NOT EXISTS {DATASET_TABLE} "
+                           "(name VARCHAR(64) PRIMARY KEY, value VARCHAR(255) NOT NULL)")
+            cursor.executemany(f"REPLACE INTO {DATASET_TABLE} (name, value) VALUES (%s, %s)",
+                               list(settings.items()))
+            generator.sink.commit()
+        finally:
+            generator.disconnect()
+        return database, status, time.perf_counter() - start
+    
+    def handler_reads(self, cursor):
+        """Sum of the session Handler_read_* counters (rows the storage engine handed to the server)"""
+        cursor.execute(HANDLER_READ_STATUS)
+        return sum(int(value) for _, value in cursor.fetchall())
+    
+    def run_query(self, cursor, name, kind, sql, status_overhead):
+        """EXPLAIN the query, run it warmup + repeats times and measure rows scanned on one extra run"""
+        sql = ' '.join(sql.split())
+        cursor.execute(f"EXPLAIN FORMAT=JSON {sql}")
+        plan = json.loads(cursor.fetchone()[0])
+        
+        for _ in range(self.warmup):
+            cursor.execute(sql)
+            cursor.fetchall()
+        
+        latencies = []
+        for _ in range(self.repeats):
+            start = time.perf_counter()
+            cursor.execute(sql)
+            rows = cursor.fetchall()
+            latencies.append((time.perf_counter() - start) * 1000)
+        
+        before = self.handler_reads(cursor)
+        cursor.execute(sql)
+        cursor.fetchall()
+        rows_scanned = self.handler_reads(cursor) - before - status_overhead
+        
+        return {
+            'name': name,
+            'kind': kind,
+            'sql': sql,
+            'rows_returned': len(rows),
+            'rows_scanned': max(rows_scanned, 0),
+            'latency_ms': latency_summary(latencies),
+            'partitions_scanned': partitions_scanned(plan),
+            'explain': plan,
+        }
+    
+    def run(self, scale_factors, queries):
+        """Benchmark every query on every scale factor and return the report"""
+        report = {
+            'started_at': datetime.now().isoformat(timespec='seconds'),
+            'host': self.host,
+            'settings': {
+                'seed': self.seed,
+                'index_profile': self.index_profile,
+                'partition_by_month': self.partition_by_month,
+                'loader': self.loader,
+                'warmup': self.warmup,
+                'repeats': self.repeats,
+            },
+            'datasets': [],
+        }
+        
+        for scale_factor in scale_factors:
+            database, status, setup_seconds = self.prepare_dataset(scale_factor)
+            connection = self.connect(database)
+            try:
+                cursor = connection.cursor()
+                report['server_version'] = connection.get_server_info()
+                # Ids are dense from 1, so MAX(id) is the row count without a full scan
+                row_counts = {}
+                for table in TABLE_SCHEMAS:
+                    cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}")
+                    row_counts[table] = cursor.fetchone()[0]
+                cursor.execute("SELECT TABLE_NAME, COUNT(*) FROM information_schema.PARTITIONS "
+                               "WHERE TABLE_SCHEMA = DATABASE() AND PARTITION_NAME IS NOT NULL GROUP BY TABLE_NAME")
+                partition_counts = dict(cursor.fetchall())
+                
+                # SHOW STATUS bumps the handler counters itself; measure that once and subtract it
+                first = self.handler_reads(cursor)
+                status_overhead = self.handler_reads(cursor) - first
+                
+                print(f"\nBenchmarking {database} ({status}, {row_counts['jobs']:,} jobs)")
+                results = []
+                for name, kind, sql in queries:
+                    try:
+                        result = self.run_query(cursor, name, kind, sql, status_overhead)
+                    except Error as e:
+                        print(f"  {name:<36} failed: {e}")
+                        results.append({'name': name, 'kind': kind, 'sql': sql, 'error': str(e)})
+                        continue
+                    latency = result['latency_ms']
+                    pruning = "".join(f"  {table} {used}/{partition_counts[table]} partitions"
+                                      for table, used in result['partitions_scanned'].items()
+                                      if table in partition_counts)
+                    print(f"  {name:<36} p50 {latency['p50']:9.2f} ms  p95 {latency['p95']:9.2f} ms  "
+                          f"p99 {latency['p99']:9.2f} ms  {result['rows_scanned']:>12,} rows scanned{pruning}")
+                    results.append(result)
+            finally:
+                connection.close()
+            
+            report['datasets'].append({
+                'scale_factor': scale_factor,
+                'database': database,
+                'status': status,
+                'setup_seconds': round(setup_seconds, 3),
+                'row_counts': row_counts,
+                'partitions': partition_counts,
+                'queries': results,
+            })
+        return report
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Leap dashboard queries on mock datasets')
+    parser.add_argument('--host', default='localhost', help='MySQL host (default: localhost)')
+    parser.add_argument('--user', default='root', help='MySQL user (default: root)')
+    parser.add_argument('--password', default='', help='MySQL password (default: empty)')
+    parser.add_argument('--database-prefix', default='leap_bench',
+                        help='Datasets go into <prefix>_sf<scale factor> databases (default: leap_bench)')
+    parser.add_argument('--scale-factors', default=DEFAULT_SCALE_FACTORS,
+                        help=f'Comma-separated scale factors to benchmark (default: {DEFAULT_SCALE_FACTORS})')
+    parser.add_argument('--regenerate', action='store_true',
+                        help='Regenerate datasets even when a matching one exists')
+    parser.add_argument('--index-profile', choices=tuple(INDEX_PROFILES), default='none',
+                        help='Secondary index set to benchmark with (default: none)')
+    parser.add_argument('--partition-by-month', action='store_true',
+                        help='Benchmark on the month-partitioned layout of leads, jobs and invoices')
+    parser.add_argument('--queries', default=None,
+                        help='JSON file of {name: sql} explorer queries replacing the built-in set')
+    parser.add_argument('--skip-views', action='store_true', help='Do not benchmark the reporting views')
+    parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP,
+                        help=f'Untimed runs per query (default: {DEFAULT_WARMUP})')
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS,
+                        help=f'Timed runs per query (default: {DEFAULT_REPEATS})')
+    parser.add_argument('--output', default='benchmark_results.json',
+                        help='Where to write the JSON report (default: benchmark_results.json)')
+    parser.add_argument('--baseline', default=None,
+                        help='Earlier JSON report to compare p95 latencies against')
+    parser.add_argument('--regression-threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help='Flag queries whose p95 grew by more than this fraction (default: 0.2)')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED,
+                        help=f'Random seed for generated datasets (default: {DEFAULT_SEED})')
+    parser.add_argument('--as-of', type=lambda s: datetime.strptime(s, '%Y-%m-%d'), default=None,
+                        help='Anchor date (YYYY-MM-DD) for generated datasets (default: today)')
+    parser.add_argument('--loader', choices=LOADERS, default='executemany',
+                        help='Bulk-load strategy for generated datasets (default: executemany)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes for dataset generation (default: 1)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f'Rows per insert batch for dataset generation (default: {DEFAULT_CHUNK_SIZE})')
+    parser.add_argument('--writers', type=int, default=1,
+                        help=f'MySQL writer threads for dataset generation (default: 1, at most {MAX_WRITERS})')
+    parser.add_argument('--rows-per-transaction', type=int, default=None,
+                        help='Rows committed per transaction during dataset generation (default: --chunk-size)')
+    
+    args = parser.parse_args()
+    try:
+        scale_factors = [float(value) for value in args.scale_factors.split(',') if value.strip()]
+    except ValueError:
+        parser.error('--scale-factors must be comma-separated numbers')
+    if not scale_factors or min(scale_factors) <= 0:
+        parser.error('--scale-factors must list positive numbers')
+    if not 1 <= args.writers <= MAX_WRITERS:
+        parser.error(f'--writers must be between 1 and {MAX_WRITERS}')
+    if args.rows_per_transaction is not None and args.rows_per_transaction < 1:
+        parser.error('--rows-per-transaction must be at least 1')
+    if args.warmup < 0:
+        parser.error('--warmup cannot be negative')
+    if args.repeats < 1:
+        parser.error('--repeats must be at least 1')
+    
+    try:
+        explorer_queries = load_queries(args.queries) if args.queries else EXPLORER_QUERIES
+        baseline = None
+        if args.baseline:
+            with open(args.baseline, encoding='utf-8') as handle:
+                baseline = json.load(handle)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    
+    queries = [] if args.skip_views else [(name, 'view', f"SELECT * FROM {name}") for name in REPORTING_VIEWS]
+    queries += [(name, 'explorer', sql) for name, sql in explorer_queries.items()]
+    
+    benchmark = QueryBenchmark(
+        host=args.host,
+        user=args.user,
+        password=args.password,
+        database_prefix=args.database_prefix,
+        seed=args.seed,
+        as_of=args.as_of,
+        index_profile=args.index_profile,
+        loader=args.loader,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        writers=args.writers,
+        rows_per_transaction=args.rows_per_transaction,
+        partition_by_month=args.partition_by_month,
+        warmup=args.warmup,
+        repeats=args.repeats,
+        regenerate=args.regenerate
+    )
+    
+    try:
+        report = benchmark.run(scale_factors, queries)
+    except Error as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    
+    if baseline is not None:
+        report['regressions'] = compare_to_baseline(report, baseline, args.regression_threshold)
+        for regression in report['regressions']:
+            print(f"Regression: {regression['name']} at scale factor {regression['scale_factor']:g} "
+                  f"p95 {regression['baseline_p95_ms']:.2f} -> {regression['p95_ms']:.2f} ms "
+                  f"({regression['ratio']:.2f}x)")
+        if not report['regressions']:
+            print(f"No p95 regressions beyond {args.regression_threshold:.0%} against {args.baseline}")
+    
+    with open(args.output, 'w', encoding='utf-8') as handle:
+        json.dump(report, handle, indent=2, default=str)
+    print(f"\nWrote benchmark report to {args.output}")
+
+if __name__ == "__main__":
+    main()
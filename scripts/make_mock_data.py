@@ -5,218 +5,2822 @@ Generates realistic mock data for all tables in the schema and inserts into MySQ
 """
 
 import mysql.connector
-from mysql.connector import Error
-import random
-from datetime import datetime, timedelta
+import mysql.connector.pooling
+from mysql.connector import Error, errorcode
+from datetime import date, datetime, timedelta
+from collections import deque
+import bz2
+import contextlib
+import cProfile
+import csv
+import functools
+import gzip
+import hashlib
+import io
+import json
+import lzma
+import multiprocessing
+import numpy as np
+import os
+import pickle
+import pstats
+import queue
+import re
+import shutil
+import tempfile
+import textwrap
+import threading
+import time
+import tracemalloc
 import uuid
-from faker import Faker
 import argparse
 import sys
 
-# Initialize Faker for generating realistic data
-fake = Faker('en_US')
-Faker.seed(42)  # For reproducible results
-random.seed(42)
+try:
+    import resource
+except ImportError:  # not available on Windows; peak RSS is then reported as 0
+    resource = None
 
-class MockDataGenerator:
-    def __init__(self, host='localhost', database='leap_mock', user='root', password=''):
+DEFAULT_SEED = 42  # For reproducible results
+DEFAULT_LOCALE = 'en_US'
+
+# Row counts at scale factor 1. Like TPC-H, --scale-factor multiplies the number of
+# offices and every per-office table grows with it, so all tables scale proportionally.
+BASE_OFFICE_COUNT = 5
+TEAMS_PER_OFFICE = 3
+USERS_PER_OFFICE = 10
+CUSTOMERS_PER_OFFICE = 50
+LEADS_PER_OFFICE = 30
+JOBS_PER_OFFICE = 40
+
+# Rows buffered per executemany/commit; bounds peak memory regardless of scale
+DEFAULT_CHUNK_SIZE = 10000
+
+# Offices per generation partition. Partitions are the unit of seeding and of work
+# handed to --workers, so this is fixed rather than derived from the chunk size.
+OFFICES_PER_PARTITION = 200
+
+SECONDS_PER_DAY = 86400
+
+# Faker value pools: entries generated per kind (before dedup) and on-disk format version
+VALUE_POOL_SIZE = 50000
+VALUE_POOL_FORMAT = 1
+VALUE_POOL_KINDS = ('name', 'email', 'phone_number', 'street_address', 'city', 'state_abbr', 'postcode')
+DEFAULT_POOL_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'leap-mock-data', 'pools')
+DEFAULT_CHECKPOINT_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'leap-mock-data', 'checkpoints')
+
+# Snapshot cache of whole generated datasets. Bump GENERATOR_VERSION whenever a change
+# alters the generated rows, so cached snapshots of the old rows stop matching.
+GENERATOR_VERSION = 1
+DEFAULT_SNAPSHOT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'leap-mock-data', 'snapshots')
+DEFAULT_SNAPSHOT_CACHE_GB = 10
+
+# Pools loaded in this process, by kind (see load_value_pools)
+VALUE_POOLS = {}
+
+USER_ROLES = ['admin', 'manager', 'rep', 'tech']
+USER_ROLE_WEIGHTS = [0.1, 0.2, 0.4, 0.3]
+LEAD_STATUSES = ['new', 'contacted', 'qualified', 'converted', 'lost']
+LEAD_STATUS_WEIGHTS = [0.2, 0.3, 0.2, 0.2, 0.1]
+JOB_STATUSES = ['estimate', 'scheduled', 'in_progress', 'completed', 'closed_won', 'closed_lost', 'cancelled']
+JOB_STATUS_WEIGHTS = [0.15, 0.15, 0.1, 0.2, 0.25, 0.1, 0.05]
+JOB_TYPES = ['residential', 'commercial', 'emergency', 'maintenance']
+JOB_TYPE_AMOUNT_RANGES = {
+    'residential': (500, 15000),
+    'commercial': (2000, 50000),
+    'emergency': (200, 8000),
+    'maintenance': (100, 3000),
+}
+
+# Fact tables derived from each job batch
+APPOINTMENTS_PER_JOB = 1.6  # mean; one of them is the appointment the job converted from
+APPOINTMENT_OUTCOMES = ['scheduled', 'completed', 'cancelled', 'no_show']
+APPOINTMENT_OUTCOME_WEIGHTS = [0.15, 0.45, 0.2, 0.2]
+INVOICE_STATUSES = ['draft', 'sent', 'paid', 'overdue', 'partial', 'cancelled']
+INVOICE_STATUS_WEIGHTS = [0.05, 0.15, 0.55, 0.1, 0.1, 0.05]
+INVOICE_PAYMENT_TERMS_DAYS = [15, 30, 45]
+MAX_LINE_ITEMS_PER_INVOICE = 5
+LINE_ITEM_DESCRIPTIONS = ['Labor', 'Materials', 'Equipment rental', 'Permit fee', 'Disposal fee',
+                          'Service call', 'Inspection', 'Replacement parts']
+PAYMENT_METHODS = ['cash', 'check', 'credit_card', 'bank_transfer']
+PAYMENT_METHOD_WEIGHTS = [0.1, 0.25, 0.45, 0.2]
+COMMISSION_RATES = [0.03, 0.04, 0.05, 0.06, 0.07]
+TAX_JURISDICTIONS = [
+    ('New York State', 0.04),
+    ('New York City', 0.045),
+    ('California State', 0.0725),
+    ('Los Angeles County', 0.0225),
+    ('Illinois State', 0.0625),
+    ('Cook County', 0.0175),
+    ('Texas State', 0.0625),
+    ('Arizona State', 0.056),
+    ('Pennsylvania State', 0.06),
+]
+
+# Skew and seasonality profiles (--skew-profile). In production a few offices, reps and
+# customers carry most of the volume, spring/summer and month ends are busy, weekends
+# are quiet and contract amounts have a long tail. Per profile:
+#   office_zipf: Zipf exponent of lead and job volume across offices (0 = the same for every office)
+#   rep_zipf / customer_zipf: Zipf exponent of which rep / customer of an office a job or lead gets
+#   month_weights / weekday_weights: relative intensity per calendar month (Jan..Dec) and
+#     weekday (Mon..Sun) of created_at; None for uniform timestamps
+#   month_end_boost: intensity factor of the last MONTH_END_DAYS days of every month
+#   amount_tail: sigma of a mean-preserving lognormal factor on contract amounts (0 = uniform in range)
+SKEW_PROFILES = {
+    'uniform': {
+        'office_zipf': 0, 'rep_zipf': 0, 'customer_zipf': 0,
+        'month_weights': None, 'weekday_weights': None, 'month_end_boost': 1.0,
+        'amount_tail': 0,
+    },
+    'production': {
+        'office_zipf': 1.1, 'rep_zipf': 1.2, 'customer_zipf': 0.8,
+        'month_weights': [0.7, 0.75, 0.95, 1.1, 1.2, 1.25, 1.2, 1.15, 1.05, 0.95, 0.85, 0.75],
+        'weekday_weights': [1.15, 1.2, 1.2, 1.15, 1.1, 0.5, 0.2],
+        'month_end_boost': 1.8,
+        'amount_tail': 0.8,
+    },
+}
+MONTH_END_DAYS = 3
+MAX_CONTRACT_AMOUNT = 99999999.99  # DECIMAL(10,2)
+
+# How rows reach MySQL: parameterized executemany, or TSV files ingested with LOAD DATA LOCAL INFILE
+LOADERS = ('executemany', 'load-data')
+
+# MySQL writers: errors a transaction is retried on, attempts, and the first backoff (doubles per retry)
+RETRYABLE_ERRORS = (errorcode.ER_LOCK_DEADLOCK, errorcode.ER_LOCK_WAIT_TIMEOUT)
+WRITE_RETRIES = 5
+RETRY_BACKOFF_SECONDS = 0.05
+MAX_WRITERS = 32  # mysql.connector pool size limit
+
+# Append mode (--append): forward status lifecycle of leads and jobs, the share of
+# writes per operation, and how many open rows one transition lookup samples
+LEAD_TRANSITIONS = {
+    'new': ('contacted', 'lost'),
+    'contacted': ('qualified', 'lost'),
+    'qualified': ('converted', 'lost'),
+}
+JOB_TRANSITIONS = {
+    'estimate': ('scheduled', 'closed_lost', 'cancelled'),
+    'scheduled': ('in_progress', 'cancelled'),
+    'in_progress': ('completed',),
+    'completed': ('closed_won',),
+}
+INGEST_MIX = {'lead': 0.3, 'job': 0.25, 'lead_transition': 0.2, 'job_transition': 0.25}
+DEFAULT_INGEST_RATE = 50
+DEFAULT_ROWS_PER_TRANSACTION = 20
+INGEST_CANDIDATES = 200
+INGEST_REPORT_SECONDS = 5
+
+# Load profiling
+PROGRESS_SECONDS = 10  # live progress line interval for long loads
+PROFILE_TOP_FUNCTIONS = 25  # functions printed from a --cprofile run
+TRACEMALLOC_FRAMES = 10
+
+# Validation (--validate): rows read per chunk, and the categorical columns sampled from
+# configured weights as (table, column, values, weights or None for uniform, (column,
+# value) the checked rows must have or None). Converted appointments are always
+# 'completed', so only the others follow the outcome weights; invoice status is
+# rewritten from the due dates and is not checked. A category share may miss its
+# weight by DISTRIBUTION_SIGMAS binomial standard errors plus the tolerance.
+VALIDATE_CHUNK_SIZE = 200000
+DISTRIBUTION_CHECKS = [
+    ('users', 'role', USER_ROLES, USER_ROLE_WEIGHTS, None),
+    ('leads', 'status', LEAD_STATUSES, LEAD_STATUS_WEIGHTS, None),
+    ('jobs', 'status', JOB_STATUSES, JOB_STATUS_WEIGHTS, None),
+    ('jobs', 'job_type', JOB_TYPES, None, None),
+    ('appointments', 'outcome', APPOINTMENT_OUTCOMES, APPOINTMENT_OUTCOME_WEIGHTS, ('converted_to_job', 0)),
+    ('payment_applications', 'payment_method', PAYMENT_METHODS, PAYMENT_METHOD_WEIGHTS, None),
+]
+DISTRIBUTION_SIGMAS = 5
+DISTRIBUTION_TOLERANCE = 0.005
+
+# File sinks: buffer size per open file, rows per part file, and text compressors (opener, extension)
+WRITE_BUFFER_SIZE = 1 << 20
+DEFAULT_ROWS_PER_FILE = 1000000
+TEXT_COMPRESSORS = {
+    'none': (None, ''),
+    'gzip': (gzip.open, '.gz'),
+    'bz2': (bz2.open, '.bz2'),
+    'xz': (lzma.open, '.xz'),
+}
+
+# Column order of the batches each builder produces. Primary keys are assigned
+# client side (see IdAllocator), so every table starts with an explicit id.
+TABLE_COLUMNS = {
+    'offices': ('id', 'name', 'tz', 'latitude', 'longitude'),
+    'teams': ('id', 'office_id', 'name'),
+    'users': ('id', 'office_id', 'team_id', 'role', 'full_name', 'email', 'active'),
+    'referral_sources': ('id', 'name', 'channel'),
+    'customers': ('id', 'office_id', 'full_name', 'email', 'phone', 'address1', 'city', 'state',
+                  'postal_code', 'latitude', 'longitude', 'created_at'),
+    'leads': ('id', 'office_id', 'customer_id', 'referral_source_id', 'status', 'created_at'),
+    'jobs': ('id', 'office_id', 'customer_id', 'sales_rep_user_id', 'job_number', 'status', 'job_type',
+             'total_contract_amount', 'created_at', 'scheduled_start', 'scheduled_end', 'closed_at'),
+    'tax_jurisdictions': ('id', 'name', 'rate'),
+    'appointments': ('id', 'office_id', 'customer_id', 'sales_rep_user_id', 'scheduled_at', 'outcome',
+                     'converted_to_job'),
+    'invoices': ('id', 'job_id', 'invoice_number', 'status', 'issue_date', 'due_date', 'total_amount'),
+    'invoice_line_items': ('id', 'invoice_id', 'tax_jurisdiction_id', 'description', 'quantity', 'unit_price'),
+    'payment_applications': ('id', 'invoice_id', 'payment_date', 'amount_applied', 'payment_method'),
+    'commissions': ('id', 'rep_user_id', 'job_id', 'period_month', 'basis_amount', 'rate', 'amount'),
+}
+
+# Tables written for each job partition, parents before children
+JOB_FACT_TABLES = ('jobs', 'appointments', 'invoices', 'invoice_line_items', 'payment_applications', 'commissions')
+
+# FK columns of derived fact tables that hold positions within the same job partition
+PARTITION_LOCAL_KEYS = {
+    'invoice_line_items': {'invoice_id': 'invoices'},
+    'payment_applications': {'invoice_id': 'invoices'},
+}
+
+# Table definitions, in creation order (parents before children). Constraints are
+# kept apart from the columns so they can be declared at CREATE time or, with
+# --defer-indexes, built in one ALTER TABLE per table after the data is loaded.
+TABLE_SCHEMAS = {
+    'offices': {
+        'columns': [
+            ('id', 'BIGINT AUTO_INCREMENT'),
+            ('name', 'VARCHAR(120) NOT NULL'),
+            ('tz', 'VARCHAR(64) NOT NULL'),
+            ('latitude', 'DECIMAL(9,6)'),
+            ('longitude', 'DECIMAL(9,6)'),
+        ],
+    },
+    'teams': {
+        'columns': [
+            ('id', 'BIGINT AUTO_INCREMENT'),
+            ('office_id', 'BIGINT NOT NULL'),
+            ('name', 'VARCHAR(120) NOT NULL'),
+        ],
+        'foreign_keys': [('office_id', 'offices')],
+    },
+    'users': {
+        'columns': [
+            ('id', 'BIGINT AUTO_INCREMENT'),
+            ('office_id', 'BIGINT NOT NULL'),
+            ('team_id', 'BIGINT NULL'),
+            ('role', "ENUM('admin','manager','rep','tech') NOT NULL"),
+            ('full_name', 'VARCHAR(160) NOT NULL'),
+            ('email', 'VARCHAR(190)'),
+            ('active', 'TINYINT(1) DEFAULT 1'),
+        ],
+        'unique': ['email'],
+        'foreign_keys': [('office_id', 'offices'), ('team_id', 'teams')],
+    },
+    'customers': {
+        'columns': [
+            ('id', 'BIGINT AUTO_INCREMENT'),
+            ('office_id', 'BIGINT NOT NULL'),
+            ('full_name', 'VARCHAR(160) NOT NULL'),
+            ('email', 'VARCHAR(190)'),
+            ('phone', 'VARCHAR(40)'),
+            ('address1', 'VARCHAR(160)'),
+            ('city', 'VARCHAR(100)'),
+            ('state', 'VARCHAR(64)'),
+            ('postal_code', 'VARCHAR(32)'),
+            ('latitude', 'DECIMAL(9,6)'),
+            ('longitude', 'DECIMAL(9,6)'),
+            ('created_at', 'DATETIME NOT NULL'),
+        ],
+        'foreign_keys': [('office_id', 'offices')],
+    },
+    'referral_sources': {
+        'columns': [
+            ('id', 'BIGINT AUTO_INCREMENT'),
+            ('name', 'VARCHAR(120) NOT NULL'),
+            ('channel', "ENUM('web','ad','partner','event','word_of_mouth','other') NOT NULL"),
+        ],
+    },
+    'leads': {
+        'columns': [
+            ('id', 'BIGINT AUTO_INCREMENT'),
+            ('office_id', 'BIGINT NOT NULL'),
+            ('customer_id', 'BIGINT'),
+            ('referral_source_id', 'BIGINT'),
+            ('status', "ENUM('new','contacted','qualified','converted','lost') NOT NULL"),
+            ('created_at', 'DATETIME NOT NULL'),
+        ],
+        'foreign_keys': [('office_id', 'offices'), ('customer_id', 'customers'),
+                         ('referral_source_id', 'referral_sources')],
+    },
+    'jobs': {
+        'columns': [
+            ('id', 'BIGINT AUTO_INCREMENT'),
+            ('office_id', 'BIGINT NOT NULL'),
+            ('customer_id', 'BIGINT NOT NULL'),
+            ('sales_rep_user_id', 'BIGINT'),
+            ('job_number', 'VARCHAR(50)'),
+            ('status', "ENUM('estimate','scheduled','in_progress','completed','closed_won','closed_lost','cancelled') NOT NULL"),
+            ('job_type', "ENUM('residential','commercial','emergency','maintenance') NOT NULL"),
+            ('total_contract_amount', 'DECIMAL(10,2)'),
+            ('created_at', 'DATETIME NOT NULL'),
+            ('scheduled_start', 'DATETIME'),
+            ('scheduled_end', 'DATETIME'),
+            ('closed_at', 'DATETIME'),
+        ],
+        'unique': ['job_number'],
+        'foreign_keys': [('office_id', 'offices'), ('customer_id', 'customers'), ('sales_rep_user_id', 'users')],
+    },
+    'appointments': {
+        'columns': [
+            ('id', 'BIGINT AUTO_INCREMENT'),
+            ('office_id', 'BIGINT NOT NULL'),
+            ('customer_id', 'BIGINT'),
+            ('sales_rep_user_id', 'BIGINT'),
+            ('scheduled_at', 'DATETIME NOT NULL'),
+            ('outcome', "ENUM('scheduled','completed','cancelled','no_show') NOT NULL"),
+            ('converted_to_job', 'TINYINT(1) DEFAULT 0'),
+        ],
+        'foreign_keys': [('office_id', 'offices'), ('customer_id', 'customers'), ('sales_rep_user_id', 'users')],
+    },
+    'invoices': {
+        'columns': [
+            ('id', 'BIGINT AUTO_INCREMENT'),
+            ('job_id', 'BIGINT NOT NULL'),
+            ('invoice_number', 'VARCHAR(50)'),
+            ('status', "ENUM('draft','sent','paid','overdue','partial','cancelled') NOT NULL"),
+            ('issue_date', 'DATE NOT NULL'),
+            ('due_date', 'DATE NOT NULL'),
+            ('total_amount', 'DECIMAL(10,2) NOT NULL'),
+        ],
+        'unique': ['invoice_number'],
+        'foreign_keys': [('job_id', 'jobs')],
+    },
+    'tax_jurisdictions': {
+        'columns': [
+            ('id', 'BIGINT AUTO_INCREMENT'),
+            ('name', 'VARCHAR(120) NOT NULL'),
+            ('rate', 'DECIMAL(5,4) NOT NULL'),
+        ],
+    },
+    'invoice_line_items': {
+        'columns': [
+            ('id', 'BIGINT AUTO_INCREMENT'),
+            ('invoice_id', 'BIGINT NOT NULL'),
+            ('tax_jurisdiction_id', 'BIGINT'),
+            ('description', 'TEXT'),
+            ('quantity', 'DECIMAL(8,2) NOT NULL'),
+            ('unit_price', 'DECIMAL(8,2) NOT NULL'),
+        ],
+        'foreign_keys': [('invoice_id', 'invoices'), ('tax_jurisdiction_id', 'tax_jurisdictions')],
+    },
+    'payment_applications': {
+        'columns': [
+            ('id', 'BIGINT AUTO_INCREMENT'),
+            ('invoice_id', 'BIGINT NOT NULL'),
+            ('payment_date', 'DATE NOT NULL'),
+            ('amount_applied', 'DECIMAL(10,2) NOT NULL'),
+            ('payment_method', "ENUM('cash','check','credit_card','bank_transfer') NOT NULL"),
+        ],
+        'foreign_keys': [('invoice_id', 'invoices')],
+    },
+    'commissions': {
+        'columns': [
+            ('id', 'BIGINT AUTO_INCREMENT'),
+            ('rep_user_id', 'BIGINT NOT NULL'),
+            ('job_id', 'BIGINT NOT NULL'),
+            ('period_month', 'DATE NOT NULL'),
+            ('basis_amount', 'DECIMAL(10,2) NOT NULL'),
+            ('rate', 'DECIMAL(5,4) NOT NULL'),
+            ('amount', 'DECIMAL(10,2) NOT NULL'),
+        ],
+        'foreign_keys': [('rep_user_id', 'users'), ('job_id', 'jobs')],
+    },
+}
+
+# Optional secondary indexes (name, columns) per table, tuned for the reporting
+# views in _docs/mock_schema.md: per-rep and per-office monthly rollups over jobs,
+# monthly lead counts, receivables aging, per-invoice payment sums and commissions.
+INDEX_PROFILES = {
+    'none': {},
+    'reporting': {
+        'jobs': [
+            ('ix_jobs_rep_closed', ('sales_rep_user_id', 'closed_at')),
+            ('ix_jobs_office_created', ('office_id', 'created_at')),
+            ('ix_jobs_status_closed', ('status', 'closed_at')),
+        ],
+        'leads': [
+            ('ix_leads_office_created', ('office_id', 'created_at')),
+        ],
+        'invoices': [
+            ('ix_invoices_status_due', ('status', 'due_date')),
+            ('ix_invoices_issue_date', ('issue_date',)),
+        ],
+        'payment_applications': [
+            ('ix_payments_invoice_amount', ('invoice_id', 'amount_applied')),
+        ],
+        'appointments': [
+            ('ix_appointments_office_scheduled', ('office_id', 'scheduled_at')),
+        ],
+        'commissions': [
+            ('ix_commissions_rep_period', ('rep_user_id', 'period_month')),
+        ],
+    },
+}
+
+
+# Reporting views from _docs/mock_schema.md, created with the schema
+REPORTING_VIEWS = {
+    'v_sales_performance': """
+        SELECT
+          j.office_id,
+          j.sales_rep_user_id AS rep_user_id,
+          DATE_FORMAT(COALESCE(j.closed_at, j.created_at), '%Y-%m-01') AS period_month,
+          SUM(CASE WHEN j.status='closed_won' THEN j.total_contract_amount ELSE 0 END) AS won_amount,
+          COUNT(*) AS jobs_count
+        FROM jobs j
+        GROUP BY 1,2,3
+    """,
+    'v_company_performance': """
+        SELECT
+          j.office_id,
+          DATE_FORMAT(COALESCE(j.closed_at, j.created_at), '%Y-%m-01') AS period_month,
+          SUM(CASE WHEN j.status='closed_won' THEN j.total_contract_amount ELSE 0 END) AS revenue_won,
+          SUM(CASE WHEN j.status IN ('closed_lost','cancelled') THEN 1 ELSE 0 END) AS lost_jobs,
+          SUM(CASE WHEN j.status='closed_won' THEN 1 ELSE 0 END) AS won_jobs
+        FROM jobs j
+        GROUP BY 1,2
+    """,
+    'v_referral_source': """
+        SELECT
+          l.office_id,
+          rs.name AS referral_source,
+          DATE_FORMAT(l.created_at, '%Y-%m-01') AS period_month,
+          COUNT(*) AS leads,
+          SUM(CASE WHEN l.status='converted' THEN 1 ELSE 0 END) AS converted_leads
+        FROM leads l
+        LEFT JOIN referral_sources rs ON rs.id = l.referral_source_id
+        GROUP BY 1,2,3
+    """,
+    'v_ar': """
+        SELECT
+          i.id AS invoice_id,
+          j.office_id,
+          i.issue_date, i.due_date,
+          i.total_amount,
+          IFNULL((
+            SELECT SUM(pa.amount_applied) FROM payment_applications pa WHERE pa.invoice_id = i.id
+          ),0) AS total_paid,
+          (i.total_amount - IFNULL((
+            SELECT SUM(pa.amount_applied) FROM payment_applications pa WHERE pa.invoice_id = i.id
+          ),0)) AS balance,
+          CASE
+            WHEN DATEDIFF(CURDATE(), i.due_date) <= 30 THEN '0-30'
+            WHEN DATEDIFF(CURDATE(), i.due_date) <= 60 THEN '31-60'
+            WHEN DATEDIFF(CURDATE(), i.due_date) <= 90 THEN '61-90'
+            ELSE '90+'
+          END AS aging_bucket
+        FROM invoices i
+        JOIN jobs j ON j.id = i.job_id
+        WHERE i.status IN ('sent','overdue','partial')
+    """,
+    'v_sales_tax': """
+        SELECT
+          tj.id AS tax_jurisdiction_id,
+          tj.name,
+          DATE_FORMAT(i.issue_date, '%Y-%m-01') AS period_month,
+          SUM(ili.quantity * ili.unit_price * tj.rate) AS tax_collected
+        FROM invoice_line_items ili
+        JOIN invoices i ON i.id = ili.invoice_id
+        LEFT JOIN tax_jurisdictions tj ON tj.id = ili.tax_jurisdiction_id
+        GROUP BY 1,2,3
+    """,
+    'v_commissions': """
+        SELECT
+          rep_user_id,
+          period_month,
+          SUM(basis_amount) AS basis_total,
+          AVG(rate) AS avg_rate,
+          SUM(amount) AS commission_total
+        FROM commissions
+        GROUP BY 1,2
+    """,
+    'v_master_jobs': """
+        SELECT
+          j.id AS job_id, j.job_number, j.status, j.job_type,
+          j.created_at, j.scheduled_start, j.scheduled_end, j.closed_at,
+          j.total_contract_amount,
+          c.full_name AS customer_name, c.city, c.state,
+          j.office_id
+        FROM jobs j
+        JOIN customers c ON c.id = j.customer_id
+    """,
+    'v_appointments': """
+        SELECT
+          a.office_id,
+          DATE(a.scheduled_at) AS sched_date,
+          COUNT(*) AS appt_count,
+          SUM(CASE WHEN a.outcome='completed' THEN 1 ELSE 0 END) AS completed,
+          SUM(CASE WHEN a.converted_to_job=1 THEN 1 ELSE 0 END) AS converted
+        FROM appointments a
+        GROUP BY 1,2
+    """,
+}
+
+
+# Month-partitioned layout (--partition-by-month): RANGE COLUMNS partitions on these
+# columns, one per month from PARTITION_HISTORY_DAYS before the as-of date (how far
+# back jobs.created_at reaches) to PARTITION_MONTHS_AHEAD after it, plus catch-alls
+# on both ends. MySQL requires every unique key, the primary key included, to
+# contain the partition column and allows no foreign keys on or to partitioned
+# tables, so in this layout the ids become (id, column) keys, job_number and
+# invoice_number plain indexes, and the foreign keys touching these tables go away.
+PARTITIONED_TABLES = {'leads': 'created_at', 'jobs': 'created_at', 'invoices': 'issue_date'}
+PARTITION_HISTORY_DAYS = 540
+PARTITION_MONTHS_AHEAD = 3
+
+
+def partition_months(now):
+    """First day of every month that gets its own partition"""
+    first = np.datetime64(now - timedelta(days=PARTITION_HISTORY_DAYS), 'M')
+    last = np.datetime64(now, 'M') + PARTITION_MONTHS_AHEAD
+    return np.arange(first, last + 1).astype('datetime64[D]')
+
+
+def partition_clause(table, months):
+    """PARTITION BY RANGE COLUMNS clause with one partition per month"""
+    column = PARTITIONED_TABLES[table]
+    partitions = [f"PARTITION p_history VALUES LESS THAN ('{months[0]}')"]
+    for month in months:
+        upper = (np.datetime64(month, 'M') + 1).astype('datetime64[D]')
+        partitions.append(f"PARTITION p{str(month)[:7].replace('-', '_')} VALUES LESS THAN ('{upper}')")
+    partitions.append("PARTITION p_future VALUES LESS THAN (MAXVALUE)")
+    return f"PARTITION BY RANGE COLUMNS({column}) (\n  " + ",\n  ".join(partitions) + "\n)"
+
+
+# Embedded engines (--sink duckdb / sqlite) get the same tables and views in their
+# own dialect: MySQL-only column types are rewritten, ENUMs stay native ENUM types
+# on DuckDB and become CHECK constraints on SQLite, and profile indexes become
+# CREATE INDEX statements (neither engine has inline KEY clauses). DuckDB gets no
+# FOREIGN KEYs: it would probe the parent index for every appended row, and the
+# keys are valid by construction (see build_indexes()).
+SQL_DIALECTS = ('mysql', 'duckdb', 'sqlite')
+DIALECT_TYPES = {
+    'duckdb': [('BIGINT AUTO_INCREMENT', 'BIGINT'), ('TINYINT(1)', 'TINYINT')],
+    # INTEGER PRIMARY KEY makes id the rowid
+    'sqlite': [('BIGINT AUTO_INCREMENT', 'INTEGER'), ('TINYINT(1)', 'INTEGER')],
+}
+ENUM_TYPE = re.compile(r"ENUM\(([^)]*)\)")
+# MySQL functions of the reporting views and their equivalents, as (pattern, replacement)
+DIALECT_FUNCTIONS = {
+    'duckdb': [
+        (r"DATE_FORMAT\((.+?), ('[^']*')\)", r"strftime(\1, \2)"),
+        (r"DATEDIFF\(CURDATE\(\), ([\w.]+)\)", r"(current_date - \1)"),
+        (r"\bDATE\(([\w.]+)\)", r"CAST(\1 AS DATE)"),
+    ],
+    'sqlite': [
+        (r"DATE_FORMAT\((.+?), ('[^']*')\)", r"strftime(\2, \1)"),
+        (r"DATEDIFF\(CURDATE\(\), ([\w.]+)\)",
+         r"CAST(julianday('now', 'localtime', 'start of day') - julianday(\1) AS INTEGER)"),
+    ],
+}
+
+
+def column_sql(name, definition, dialect='mysql'):
+    """Column definition in a dialect's types"""
+    for mysql_type, dialect_type in DIALECT_TYPES.get(dialect, ()):
+        definition = definition.replace(mysql_type, dialect_type)
+    enum = ENUM_TYPE.search(definition)
+    if enum and dialect == 'sqlite':
+        definition = f"{ENUM_TYPE.sub('TEXT', definition)} CHECK ({name} IN ({enum.group(1)}))"
+    return f"{name} {definition}"
+
+
+def create_index_sql(table, index_profile='none'):
+    """CREATE INDEX statements for the profile indexes of a table on an embedded engine"""
+    return [f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+            for name, columns in INDEX_PROFILES[index_profile].get(table, ())]
+
+
+def create_view_sql(name, query, dialect='mysql'):
+    """Statements creating (or replacing) a reporting view in a dialect"""
+    query = textwrap.dedent(query).strip()
+    for pattern, replacement in DIALECT_FUNCTIONS.get(dialect, ()):
+        query = re.sub(pattern, replacement, query)
+    if dialect == 'sqlite':  # no CREATE OR REPLACE VIEW
+        return [f"DROP VIEW IF EXISTS {name}", f"CREATE VIEW {name} AS {query}"]
+    return [f"CREATE OR REPLACE VIEW {name} AS {query}"]
+
+
+def index_clauses(table, index_profile='none', partitioned=False, dialect='mysql'):
+    """UNIQUE keys, profile indexes and FOREIGN KEY constraints of a table, as table-definition clauses"""
+    schema = TABLE_SCHEMAS[table]
+    if dialect != 'mysql':
+        clauses = [f"CONSTRAINT uq_{table}_{column} UNIQUE ({column})" for column in schema.get('unique', ())]
+        if dialect == 'sqlite':
+            clauses += [f"CONSTRAINT fk_{table}_{column} FOREIGN KEY ({column}) REFERENCES {parent}(id)"
+                        for column, parent in schema.get('foreign_keys', ())]
+        return clauses
+    if partitioned and table in PARTITIONED_TABLES:
+        clauses = [f"KEY ix_{table}_{column} ({column})" for column in schema.get('unique', ())]
+    else:
+        clauses = [f"UNIQUE KEY uq_{table}_{column} ({column})" for column in schema.get('unique', ())]
+    clauses += [f"KEY {name} ({', '.join(columns)})" for name, columns in INDEX_PROFILES[index_profile].get(table, ())]
+    clauses += [
+        f"CONSTRAINT fk_{table}_{column} FOREIGN KEY ({column}) REFERENCES {parent}(id)"
+        for column, parent in schema.get('foreign_keys', ())
+        if not (partitioned and (table in PARTITIONED_TABLES or parent in PARTITIONED_TABLES))
+    ]
+    return clauses
+
+
+def create_table_sql(table, deferred=False, index_profile='none', months=None, dialect='mysql'):
+    """CREATE TABLE for a table; deferred tables get only their primary key.
+    
+    With `months` (see partition_months()) the PARTITIONED_TABLES are created
+    month-partitioned. Other dialects leave the profile indexes to create_index_sql().
+    """
+    partitioned = months is not None and table in PARTITIONED_TABLES
+    lines = [column_sql(name, definition, dialect) for name, definition in TABLE_SCHEMAS[table]['columns']]
+    lines.append(f"PRIMARY KEY (id, {PARTITIONED_TABLES[table]})" if partitioned else "PRIMARY KEY (id)")
+    if not deferred:
+        lines += index_clauses(table, index_profile, months is not None, dialect)
+    statement = f"CREATE TABLE IF NOT EXISTS {table} (\n  " + ",\n  ".join(lines) + "\n)"
+    return statement + "\n" + partition_clause(table, months) if partitioned else statement
+
+
+# Pre-aggregated rollups of the jobs views (rep x month and office x month). The
+# generator adds every jobs batch to them as it loads it and marks the months it
+# touched in rollup_dirty_months; --refresh-rollups recomputes just those months
+# from jobs, which also repairs anything the additive updates cannot see.
+# rep_user_id 0 stands for jobs without a sales rep (primary key columns cannot be NULL).
+ROLLUP_TABLES = {
+    'rollup_sales_performance': """
+        CREATE TABLE IF NOT EXISTS rollup_sales_performance (
+          office_id BIGINT NOT NULL,
+          rep_user_id BIGINT NOT NULL,
+          period_month DATE NOT NULL,
+          won_amount DECIMAL(16,2) NOT NULL DEFAULT 0,
+          jobs_count INT NOT NULL DEFAULT 0,
+          PRIMARY KEY (office_id, rep_user_id, period_month),
+          KEY ix_rollup_sales_month (period_month)
+        )
+    """,
+    'rollup_company_performance': """
+        CREATE TABLE IF NOT EXISTS rollup_company_performance (
+          office_id BIGINT NOT NULL,
+          period_month DATE NOT NULL,
+          revenue_won DECIMAL(16,2) NOT NULL DEFAULT 0,
+          lost_jobs INT NOT NULL DEFAULT 0,
+          won_jobs INT NOT NULL DEFAULT 0,
+          PRIMARY KEY (office_id, period_month),
+          KEY ix_rollup_company_month (period_month)
+        )
+    """,
+    'rollup_dirty_months': """
+        CREATE TABLE IF NOT EXISTS rollup_dirty_months (
+          period_month DATE NOT NULL PRIMARY KEY,
+          marked_at DATETIME(6) NOT NULL
+        )
+    """,
+}
+
+# Drop-in replacements for v_sales_performance / v_company_performance over the rollups
+ROLLUP_VIEWS = {
+    'v_sales_performance_rollup': """
+        SELECT office_id, NULLIF(rep_user_id, 0) AS rep_user_id,
+          DATE_FORMAT(period_month, '%Y-%m-01') AS period_month, won_amount, jobs_count
+        FROM rollup_sales_performance
+    """,
+    'v_company_performance_rollup': """
+        SELECT office_id, DATE_FORMAT(period_month, '%Y-%m-01') AS period_month,
+          revenue_won, lost_jobs, won_jobs
+        FROM rollup_company_performance
+    """,
+}
+
+# Full recompute of the rollup rows of the jobs selected by {window} (see rollup_window())
+ROLLUP_REFRESH = {
+    'rollup_sales_performance': """
+        INSERT INTO rollup_sales_performance (office_id, rep_user_id, period_month, won_amount, jobs_count)
+        SELECT
+          j.office_id,
+          COALESCE(j.sales_rep_user_id, 0),
+          DATE_FORMAT(COALESCE(j.closed_at, j.created_at), '%Y-%m-01'),
+          SUM(CASE WHEN j.status='closed_won' THEN j.total_contract_amount ELSE 0 END),
+          COUNT(*)
+        FROM jobs j
+        WHERE {window}
+        GROUP BY 1,2,3
+    """,
+    'rollup_company_performance': """
+        INSERT INTO rollup_company_performance (office_id, period_month, revenue_won, lost_jobs, won_jobs)
+        SELECT
+          j.office_id,
+          DATE_FORMAT(COALESCE(j.closed_at, j.created_at), '%Y-%m-01'),
+          SUM(CASE WHEN j.status='closed_won' THEN j.total_contract_amount ELSE 0 END),
+          SUM(CASE WHEN j.status IN ('closed_lost','cancelled') THEN 1 ELSE 0 END),
+          SUM(CASE WHEN j.status='closed_won' THEN 1 ELSE 0 END)
+        FROM jobs j
+        WHERE {window}
+        GROUP BY 1,2
+    """,
+}
+
+
+# Serves both halves of rollup_window(): closed_at ranges use its prefix, and open jobs
+# (closed_at IS NULL) are a created_at range within it
+ROLLUP_SOURCE_INDEX = ('ix_jobs_closed_created', ('closed_at', 'created_at'))
+
+
+def month_ranges(months):
+    """Merge ascending first-of-month dates into [start, stop) ranges of consecutive months"""
+    ranges = []
+    for month in np.asarray(months, dtype='datetime64[M]'):
+        if ranges and ranges[-1][1] == month:
+            ranges[-1][1] = month + 1
+        else:
+            ranges.append([month, month + 1])
+    return [(start.astype('datetime64[D]'), stop.astype('datetime64[D]')) for start, stop in ranges]
+
+
+def rollup_window(months):
+    """Jobs whose COALESCE(closed_at, created_at) falls in `months`, as index range predicates"""
+    def within(column):
+        return " OR ".join(f"(j.{column} >= '{start}' AND j.{column} < '{stop}')"
+                           for start, stop in month_ranges(months))
+    return f"({within('closed_at')}) OR (j.closed_at IS NULL AND ({within('created_at')}))"
+
+
+def job_rollups(batch):
+    """Aggregate a jobs column batch into rollup rows.
+    
+    Returns (sales rows, company rows, months) where the rows are tuples in the
+    column order of rollup_sales_performance / rollup_company_performance.
+    """
+    jobs = dict(zip(TABLE_COLUMNS['jobs'], batch))
+    closed_at = jobs['closed_at']
+    period = np.where(np.isnat(closed_at), jobs['created_at'], closed_at).astype('datetime64[M]')
+    rep = np.ma.filled(np.ma.asarray(jobs['sales_rep_user_id']), 0)
+    status = jobs['status']
+    won = status == 'closed_won'
+    lost = (status == 'closed_lost') | (status == 'cancelled')
+    # Sum in cents so the totals stay exact
+    won_cents = np.where(won, np.rint(np.asarray(jobs['total_contract_amount'], dtype=float) * 100), 0)
+    
+    keys = np.stack([jobs['office_id'], rep, period.astype(np.int64)], axis=1)
+    sales_keys, sales_index = np.unique(keys, axis=0, return_inverse=True)
+    sales_index = sales_index.ravel()
+    sales_won = np.bincount(sales_index, weights=won_cents, minlength=len(sales_keys))
+    sales_jobs = np.bincount(sales_index, minlength=len(sales_keys))
+    sales_rows = [
+        (int(office), int(rep_id), str(np.datetime64(int(month), 'M').astype('datetime64[D]')),
+         round(float(cents) / 100, 2), int(count))
+        for (office, rep_id, month), cents, count in zip(sales_keys, sales_won, sales_jobs)
+    ]
+    
+    company_keys, company_index = np.unique(keys[:, [0, 2]], axis=0, return_inverse=True)
+    company_index = company_index.ravel()
+    company_won = np.bincount(company_index, weights=won_cents, minlength=len(company_keys))
+    company_lost = np.bincount(company_index, weights=lost, minlength=len(company_keys))
+    company_won_jobs = np.bincount(company_index, weights=won, minlength=len(company_keys))
+    company_rows = [
+        (int(office), str(np.datetime64(int(month), 'M').astype('datetime64[D]')),
+         round(float(cents) / 100, 2), int(lost_jobs), int(won_jobs))
+        for (office, month), cents, lost_jobs, won_jobs
+        in zip(company_keys, company_won, company_lost, company_won_jobs)
+    ]
+    
+    months = sorted({row[1] for row in company_rows})
+    return sales_rows, company_rows, months
+
+
+OFFICE_CITIES = [
+    ('New York', 'America/New_York', 40.7128, -74.0060),
+    ('Los Angeles', 'America/Los_Angeles', 34.0522, -118.2437),
+    ('Chicago', 'America/Chicago', 41.8781, -87.6298),
+    ('Houston', 'America/Chicago', 29.7604, -95.3698),
+    ('Phoenix', 'America/Phoenix', 33.4484, -112.0740),
+    ('Philadelphia', 'America/New_York', 39.9526, -75.1652),
+    ('San Antonio', 'America/Chicago', 29.4241, -98.4936),
+    ('San Diego', 'America/Los_Angeles', 32.7157, -117.1611),
+    ('Dallas', 'America/Chicago', 32.7767, -96.7970),
+    ('San Jose', 'America/Los_Angeles', 37.3382, -121.8863)
+]
+
+
+def partition_seed(seed, table, partition):
+    """Derive a stable sub-seed from (global seed, table, partition).
+    
+    Uses a cryptographic hash rather than hash(), which is randomized per process.
+    """
+    key = f"{seed}:{table}:{partition}".encode()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'big')
+
+
+def chunked(iterable, size):
+    """Yield lists of at most `size` items from an iterable"""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def transition_weights(transitions, statuses, weights):
+    """Successor probabilities for a forward status lifecycle.
+    
+    Each successor is weighted by the share of rows the one-shot generator leaves
+    in it or in any status after it, so rows that all start in the first status
+    drift towards the same mix of statuses as a full load.
+    """
+    weight = dict(zip(statuses, weights))
+    reach = {}
+    
+    def reach_weight(status):
+        if status not in reach:
+            reach[status] = weight.get(status, 0) + sum(map(reach_weight, transitions.get(status, ())))
+        return reach[status]
+    
+    return {
+        status: np.array([reach_weight(s) for s in successors]) / sum(map(reach_weight, successors))
+        for status, successors in transitions.items()
+    }
+
+
+def group_by_office(office_ids, member_offices, member_ids):
+    """(starts, counts, ids) to pick existing rows per office with pick_keys.
+    
+    member_offices/member_ids must be sorted by office; pick_keys then returns
+    positions into `ids`, which ends with a 0 sentinel for offices without rows.
+    """
+    starts = np.searchsorted(member_offices, office_ids, side='left')
+    counts = np.searchsorted(member_offices, office_ids, side='right') - starts
+    return starts, counts, np.append(member_ids, 0)
+
+
+TSV_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r', '\0': '\\0'})
+
+
+def tsv_line(row):
+    """Encode a row in the default LOAD DATA format (tab separated, backslash escaped, \\N for NULL)"""
+    fields = []
+    for value in row:
+        if value is None:
+            fields.append('\\N')
+        elif isinstance(value, str):
+            fields.append(value.translate(TSV_ESCAPES))
+        else:
+            fields.append(str(value))
+    return '\t'.join(fields) + '\n'
+
+
+# Faker value pools. Faker is by far the slowest part of generation and slow to
+# import, so each kind of value is generated once per (locale, seed), deduplicated
+# and cached on disk. Builders sample pool entries by index.
+
+class ValuePool:
+    """Deduplicated Faker values, stored on disk as a UTF-8 blob plus an offsets array.
+    
+    Both files are memory mapped on load; the values are decoded once into an
+    object array so sampling is a single vectorized gather.
+    """
+    
+    def __init__(self, values):
+        self.values = values
+    
+    def __len__(self):
+        return len(self.values)
+    
+    def sample(self, rng, size):
+        """Draw `size` values uniformly (with replacement) as an object array"""
+        return self.values[rng.integers(0, len(self.values), size)]
+    
+    @staticmethod
+    def save(directory, kind, values):
+        encoded = [value.encode('utf-8') for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        
+        # Write under temporary names and rename, so concurrent runs never see partial files
+        blob_path = os.path.join(directory, f'{kind}.bin')
+        offsets_path = os.path.join(directory, f'{kind}.offsets.npy')
+        with open(blob_path + '.tmp', 'wb') as f:
+            f.write(b''.join(encoded))
+        with open(offsets_path + '.tmp', 'wb') as f:
+            np.save(f, offsets)
+        os.replace(blob_path + '.tmp', blob_path)
+        os.replace(offsets_path + '.tmp', offsets_path)
+    
+    @classmethod
+    def load(cls, directory, kind):
+        offsets = np.load(os.path.join(directory, f'{kind}.offsets.npy'), mmap_mode='r').tolist()
+        blob = np.memmap(os.path.join(directory, f'{kind}.bin'), dtype=np.uint8, mode='r').tobytes()
+        values = np.empty(len(offsets) - 1, dtype=object)
+        values[:] = [blob[start:end].decode('utf-8') for start, end in zip(offsets, offsets[1:])]
+        return cls(values)
+
+
+def value_pool_dir(cache_dir, locale, seed):
+    return os.path.join(cache_dir, f"{locale}-seed{seed}-n{VALUE_POOL_SIZE}-v{VALUE_POOL_FORMAT}")
+
+
+def build_value_pools(directory, locale, seed):
+    """Generate every pool kind with Faker and persist it to `directory`"""
+    from faker import Faker  # Imported lazily: only needed when the cache is cold
+    
+    fake = Faker(locale)
+    os.makedirs(directory, exist_ok=True)
+    for kind in VALUE_POOL_KINDS:
+        fake.seed_instance(partition_seed(seed, 'value_pool', kind))
+        generate = getattr(fake, kind)
+        values = list(dict.fromkeys(generate() for _ in range(VALUE_POOL_SIZE)))
+        ValuePool.save(directory, kind, values)
+        print(f"Built {kind} pool ({len(values)} unique values)")
+    open(os.path.join(directory, 'complete'), 'w').close()
+
+
+def load_value_pools(cache_dir, locale, seed):
+    """Load the pools for (locale, seed) into VALUE_POOLS, building the cache first if missing.
+    
+    Also used as the worker pool initializer, so every process samples from the same pools.
+    """
+    directory = value_pool_dir(cache_dir, locale, seed)
+    if not os.path.exists(os.path.join(directory, 'complete')):
+        print(f"Building Faker value pools in {directory}...")
+        build_value_pools(directory, locale, seed)
+    for kind in VALUE_POOL_KINDS:
+        VALUE_POOLS[kind] = ValuePool.load(directory, kind)
+
+
+def unique_emails(rng, office_ids, seqs):
+    """Pool emails made unique by tagging the local part with the office and per-office sequence"""
+    emails = VALUE_POOLS['email'].sample(rng, len(office_ids))
+    return [
+        f"{local}.{office_id}.{seq}@{domain}"
+        for (local, _, domain), office_id, seq in zip(
+            (email.partition('@') for email in emails), office_ids.tolist(), seqs.tolist())
+    ]
+
+
+# Column builders. Each one produces a single partition -- a block of consecutive
+# offices, or part of one busy office's rows -- as a list of columns in TABLE_COLUMNS order. Columns are
+# drawn in whole batches with NumPy from the partition's own seeded generator, so
+# builders can run in any process and in any order. Nullable columns are masked
+# arrays or lists containing None.
+
+def weighted_choice(rng, values, weights, size):
+    """Draw `size` values from a weighted enum as an object array"""
+    return np.asarray(values, dtype=object)[rng.choice(len(values), size=size, p=weights)]
+
+
+def random_datetimes(rng, now, days_back, size, skew=None):
+    """Timestamps (second resolution) in the `days_back` days leading up to now.
+    
+    Uniform unless a skew profile weights the days by month, weekday and month end.
+    """
+    if skew is None or skew['month_weights'] is None:
+        end = np.datetime64(now, 's')
+        return end - rng.integers(0, days_back * SECONDS_PER_DAY, size=size, endpoint=True).astype('timedelta64[s]')
+    days = np.datetime64(now, 'D') - np.arange(1, days_back + 1)
+    months = days.astype('datetime64[M]')
+    weekdays = (days.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+    to_month_end = ((months + 1).astype('datetime64[D]') - days).astype(np.int64)
+    weights = (np.asarray(skew['month_weights'])[months.astype(np.int64) % 12]
+               * np.asarray(skew['weekday_weights'])[weekdays]
+               * np.where(to_month_end <= MONTH_END_DAYS, skew['month_end_boost'], 1.0))
+    day = days[rng.choice(days_back, size=size, p=weights / weights.sum())]
+    return day.astype('datetime64[s]') + seconds(rng.integers(0, SECONDS_PER_DAY, size))
+
+
+def seconds(values):
+    return np.asarray(values).astype('timedelta64[s]')
+
+
+def nullable(values, present):
+    """Replace entries of an object array with None where `present` is False"""
+    return np.where(present, values, None)
+
+
+def column_rows(columns):
+    """Zip a batch of columns into row tuples, converting NumPy values to Python types"""
+    return zip(*(col.tolist() if isinstance(col, np.ndarray) else col for col in columns))
+
+
+def office_rows(counts, first_rows=None):
+    """Expand per-office row counts into each row's office position and 1-based sequence within its office.
+    
+    `first_rows` gives, per office, how many of its rows come before this
+    partition, when a busy office is built over several partitions.
+    """
+    position = np.repeat(np.arange(len(counts)), counts)
+    seq = np.arange(len(position)) - np.repeat(np.cumsum(counts) - counts, counts) + 1
+    if first_rows is not None:
+        seq = seq + first_rows[position]
+    return position, seq
+
+
+def zipf_ranks(rng, counts, exponent):
+    """A 0-based rank below each of `counts`, drawn from a bounded Zipf law (rank 0 the most likely).
+    
+    Uses the inverse CDF of the continuous power law x**-exponent on [1, count + 1).
+    """
+    u = rng.random(len(counts))
+    n = counts + 1.0
+    if exponent == 1:
+        x = n ** u
+    else:
+        x = (1 + u * (n ** (1 - exponent) - 1)) ** (1 / (1 - exponent))
+    return np.minimum(x.astype(np.int64) - 1, np.maximum(counts - 1, 0))
+
+
+def pick_keys(rng, starts, counts, position, exponent=0):
+    """Pick a key from each row's office key range [start, start + count).
+    
+    Uniform, or Zipf-skewed toward the first keys of each office with a non-zero
+    exponent. Rows whose office has no keys get `start`; callers mask those where
+    the FK is nullable.
+    """
+    if exponent:
+        return starts[position] + zipf_ranks(rng, counts[position], exponent)
+    return starts[position] + (rng.random(len(position)) * counts[position]).astype(np.int64)
+
+
+def office_activity(skew, seed, office_count):
+    """Share of lead and job volume per office position, or None when every office gets the same.
+    
+    Offices take Zipf weights in a seeded random rank order, so the busiest office
+    is not always the first one.
+    """
+    if not skew['office_zipf']:
+        return None
+    ranks = np.random.default_rng(partition_seed(seed, 'office_activity', 0)).permutation(office_count)
+    weights = 1.0 / (ranks + 1.0) ** skew['office_zipf']
+    return weights / weights.sum()
+
+
+def apportion(total, weights):
+    """Split `total` rows in proportion to `weights` (largest remainder, so the counts add up)"""
+    exact = total * weights
+    counts = np.floor(exact).astype(np.int64)
+    counts[np.argsort(counts - exact, kind='stable')[:total - counts.sum()]] += 1
+    return counts
+
+
+def build_office_columns(rng, now, ids, office_indexes):
+    cities = [OFFICE_CITIES[i % len(OFFICE_CITIES)] for i in office_indexes.tolist()]
+    n = len(cities)
+    return [
+        ids,
+        [f"{city[0]} Office" for city in cities],
+        [city[1] for city in cities],
+        np.array([city[2] for city in cities]) + rng.uniform(-0.1, 0.1, n),
+        np.array([city[3] for city in cities]) + rng.uniform(-0.1, 0.1, n),
+    ]
+
+
+def build_team_columns(rng, now, office_ids, team_starts, team_counts):
+    team_names = ['Sales Team', 'Service Team', 'Installation Team', 'Admin Team', 'Support Team']
+    position, seq = office_rows(team_counts)
+    return [
+        team_starts[position] + seq - 1,
+        office_ids[position],
+        np.asarray(team_names, dtype=object)[(seq - 1) % len(team_names)],
+    ]
+
+
+def build_user_columns(rng, now, office_ids, user_starts, user_counts, team_starts, team_counts, first_rows=None):
+    position, seq = office_rows(user_counts, first_rows)
+    n = len(position)
+    team_id = pick_keys(rng, team_starts, team_counts, position)
+    has_team = (rng.random(n) > 0.2) & (team_counts[position] > 0)
+    office_id = office_ids[position]
+    
+    return [
+        user_starts[position] + seq - 1,
+        office_id,
+        np.ma.array(team_id, mask=~has_team),
+        weighted_choice(rng, USER_ROLES, USER_ROLE_WEIGHTS, n),
+        VALUE_POOLS['name'].sample(rng, n),
+        unique_emails(rng, office_id, seq),  # users.email is UNIQUE
+        (rng.random(n) > 0.1).astype(np.int8),  # 90% active users
+    ]
+
+
+def build_customer_columns(rng, now, office_ids, customer_starts, customer_counts, skew=None, first_rows=None):
+    position, seq = office_rows(customer_counts, first_rows)
+    n = len(position)
+    has_email = rng.random(n) > 0.2
+    has_phone = rng.random(n) > 0.1
+    
+    return [
+        customer_starts[position] + seq - 1,
+        office_ids[position],
+        VALUE_POOLS['name'].sample(rng, n),
+        nullable(VALUE_POOLS['email'].sample(rng, n), has_email),
+        nullable(VALUE_POOLS['phone_number'].sample(rng, n), has_phone),
+        VALUE_POOLS['street_address'].sample(rng, n),
+        VALUE_POOLS['city'].sample(rng, n),
+        VALUE_POOLS['state_abbr'].sample(rng, n),
+        VALUE_POOLS['postcode'].sample(rng, n),
+        np.round(rng.uniform(-90, 90, n), 6),
+        np.round(rng.uniform(-180, 180, n), 6),
+        random_datetimes(rng, now, 730, n, skew),
+    ]
+
+
+def build_lead_columns(rng, now, office_ids, lead_starts, lead_counts, customer_starts, customer_counts,
+                       referral_start_id, referral_end_id, skew=None, first_rows=None):
+    skew = skew or SKEW_PROFILES['uniform']
+    position, seq = office_rows(lead_counts, first_rows)
+    n = len(position)
+    customer_id = pick_keys(rng, customer_starts, customer_counts, position, skew['customer_zipf'])
+    
+    return [
+        lead_starts[position] + seq - 1,
+        office_ids[position],
+        np.ma.array(customer_id, mask=customer_counts[position] == 0),
+        rng.integers(referral_start_id, referral_end_id, n, endpoint=True),
+        weighted_choice(rng, LEAD_STATUSES, LEAD_STATUS_WEIGHTS, n),
+        random_datetimes(rng, now, 365, n, skew),
+    ]
+
+
+def build_job_columns(rng, now, office_ids, job_starts, job_counts, customer_starts, customer_counts,
+                      user_starts, user_counts, skew=None, first_rows=None):
+    skew = skew or SKEW_PROFILES['uniform']
+    position, seq = office_rows(job_counts, first_rows)
+    n = len(position)
+    office_id = office_ids[position]
+    customer_id = pick_keys(rng, customer_starts, customer_counts, position, skew['customer_zipf'])
+    sales_rep_id = pick_keys(rng, user_starts, user_counts, position, skew['rep_zipf'])
+    job_number = [f"JOB-{o}-{i:04d}" for o, i in zip(office_id.tolist(), seq.tolist())]
+    
+    status_index = rng.choice(len(JOB_STATUSES), size=n, p=JOB_STATUS_WEIGHTS)
+    status = np.asarray(JOB_STATUSES, dtype=object)[status_index]
+    job_type_index = rng.integers(0, len(JOB_TYPES), n)
+    
+    # Contract amount range depends on job type
+    low, high = np.array([JOB_TYPE_AMOUNT_RANGES[t] for t in JOB_TYPES]).T
+    amount = rng.uniform(low[job_type_index], high[job_type_index])
+    if skew['amount_tail']:
+        sigma = skew['amount_tail']
+        amount = np.minimum(amount * np.exp(sigma * rng.standard_normal(n) - sigma ** 2 / 2), MAX_CONTRACT_AMOUNT)
+    amount = np.round(amount, 2)
+    
+    created_at = random_datetimes(rng, now, 540, n, skew)
+    scheduled_start = created_at + seconds(rng.integers(1, 30, n, endpoint=True) * SECONDS_PER_DAY)
+    scheduled_end = scheduled_start + seconds(rng.integers(2, 48, n, endpoint=True) * 3600)
+    closed_after_work = scheduled_end + seconds(rng.integers(0, 7, n, endpoint=True) * SECONDS_PER_DAY)
+    closed_without_work = created_at + seconds(rng.integers(1, 60, n, endpoint=True) * SECONDS_PER_DAY)
+    
+    scheduled = np.isin(status, ['scheduled', 'in_progress', 'completed', 'closed_won'])
+    finished = np.isin(status, ['completed', 'closed_won'])
+    abandoned = np.isin(status, ['closed_lost', 'cancelled'])
+    nat = np.datetime64('NaT', 's')
+    closed_at = np.where(finished, closed_after_work, np.where(abandoned, closed_without_work, nat))
+    
+    return [
+        job_starts[position] + seq - 1, office_id, customer_id,
+        np.ma.array(sales_rep_id, mask=user_counts[position] == 0), job_number, status,
+        np.asarray(JOB_TYPES, dtype=object)[job_type_index], amount, created_at,
+        np.where(scheduled, scheduled_start, nat), np.where(scheduled, scheduled_end, nat), closed_at,
+    ]
+
+
+def split_amounts(rng, totals, counts):
+    """Split totals[i] into counts[i] random parts that add up to it exactly, to the cent"""
+    counts = np.asarray(counts)
+    cents = np.round(np.asarray(totals) * 100).astype(np.int64)
+    owner = np.repeat(np.arange(len(counts)), counts)
+    weights = rng.random(len(owner)) + 0.2
+    weight_sums = np.bincount(owner, weights=weights, minlength=len(counts))
+    parts = np.floor(weights / weight_sums[owner] * cents[owner]).astype(np.int64)
+    
+    # Rounding leftovers go to the last part of each group
+    remainder = cents - np.bincount(owner, weights=parts, minlength=len(counts)).astype(np.int64)
+    has_parts = counts > 0
+    parts[(np.cumsum(counts) - 1)[has_parts]] += remainder[has_parts]
+    return parts / 100
+
+
+def random_days(rng, max_days):
+    """Uniform whole days in [0, max_days] per row, as timedelta64[D]"""
+    return np.floor(rng.random(len(max_days)) * (np.asarray(max_days) + 1)).astype('timedelta64[D]')
+
+
+def build_appointment_columns(rng, now, jobs):
+    """One converted appointment ahead of every job, plus unconverted ones for the same customer"""
+    office_id, customer_id, sales_rep_id, created_at = jobs['office_id'], jobs['customer_id'], jobs['sales_rep_user_id'], jobs['created_at']
+    extra = rng.poisson(APPOINTMENTS_PER_JOB - 1, len(office_id))
+    owner = np.concatenate([np.arange(len(office_id)), np.repeat(np.arange(len(office_id)), extra)])
+    n_converted = len(office_id)
+    n = len(owner)
+    
+    outcome = np.empty(n, dtype=object)
+    outcome[:n_converted] = 'completed'
+    outcome[n_converted:] = weighted_choice(rng, APPOINTMENT_OUTCOMES, APPOINTMENT_OUTCOME_WEIGHTS, n - n_converted)
+    
+    # Held a few days before the job was created; still-scheduled ones are upcoming
+    scheduled_at = created_at[owner] - seconds(rng.integers(1, 14 * SECONDS_PER_DAY, n, endpoint=True))
+    upcoming = outcome == 'scheduled'
+    scheduled_at[upcoming] = random_datetimes(rng, now + timedelta(days=30), 30, int(upcoming.sum()))
+    
+    return [
+        np.arange(n),
+        office_id[owner],
+        customer_id[owner],
+        sales_rep_id[owner],
+        scheduled_at,
+        outcome,
+        (np.arange(n) < n_converted).astype(np.int8),
+    ]
+
+
+def build_invoice_columns(rng, now, jobs, tax_start_id, tax_end_id):
+    """Invoices for completed work with their line items and payment applications.
+    
+    Returns (invoices, invoice_line_items, payment_applications) column lists whose
+    ids, and the invoice_id FKs between them, are local positions within the batch.
+    """
+    invoiced = np.flatnonzero(np.isin(jobs['status'], ['completed', 'closed_won']))
+    n = len(invoiced)
+    job_id = jobs['id'][invoiced]
+    today = np.datetime64(now, 'D')
+    issue_date = jobs['closed_at'][invoiced].astype('datetime64[D]')
+    due_date = issue_date + np.asarray(INVOICE_PAYMENT_TERMS_DAYS)[rng.integers(0, len(INVOICE_PAYMENT_TERMS_DAYS), n)].astype('timedelta64[D]')
+    
+    # Line items split the contract amount; the invoice total is what the items add up to
+    item_counts = rng.integers(1, MAX_LINE_ITEMS_PER_INVOICE, n, endpoint=True)
+    item_owner = np.repeat(np.arange(n), item_counts)
+    n_items = len(item_owner)
+    item_amount = split_amounts(rng, jobs['total_contract_amount'][invoiced], item_counts)
+    quantity = rng.integers(1, 10, n_items, endpoint=True).astype(np.float64)
+    unit_price = np.round(item_amount / quantity, 2)
+    total_amount = np.round(np.bincount(item_owner, weights=quantity * unit_price, minlength=n), 2)
+    has_tax = rng.random(n_items) > 0.1
+    tax_jurisdiction_id = np.ma.array(rng.integers(tax_start_id, tax_end_id, n_items, endpoint=True), mask=~has_tax)
+    
+    # Status has to agree with the dates: future invoices are drafts, unpaid ones past due are overdue
+    status = weighted_choice(rng, INVOICE_STATUSES, INVOICE_STATUS_WEIGHTS, n)
+    unpaid = np.isin(status, ['sent', 'overdue'])
+    status[unpaid] = np.where(due_date[unpaid] < today, 'overdue', 'sent')
+    status[issue_date > today] = 'draft'
+    
+    # Paid invoices are settled in 1-3 payments, partial ones get 20-80% in 1-2
+    paid = status == 'paid'
+    partial = status == 'partial'
+    payment_counts = np.where(paid, rng.integers(1, 3, n, endpoint=True),
+                              np.where(partial, rng.integers(1, 2, n, endpoint=True), 0))
+    settled = total_amount * np.where(paid, 1.0, rng.uniform(0.2, 0.8, n))
+    payment_owner = np.repeat(np.arange(n), payment_counts)
+    n_payments = len(payment_owner)
+    amount_applied = split_amounts(rng, settled, payment_counts)
+    pay_window = (np.minimum(due_date + np.timedelta64(30, 'D'), today) - issue_date).astype(np.int64).clip(0)
+    payment_date = issue_date[payment_owner] + random_days(rng, pay_window[payment_owner])
+    
+    invoices = [
+        np.arange(n), job_id, [f"INV-{j}" for j in job_id.tolist()], status,
+        issue_date, due_date, total_amount,
+    ]
+    line_items = [
+        np.arange(n_items), item_owner, tax_jurisdiction_id,
+        weighted_choice(rng, LINE_ITEM_DESCRIPTIONS, None, n_items), quantity, unit_price,
+    ]
+    payments = [
+        np.arange(n_payments), payment_owner, payment_date, amount_applied,
+        weighted_choice(rng, PAYMENT_METHODS, PAYMENT_METHOD_WEIGHTS, n_payments),
+    ]
+    return invoices, line_items, payments
+
+
+def build_commission_columns(rng, now, jobs):
+    """A commission for every won job with a rep, in the month the job closed"""
+    won = np.flatnonzero((jobs['status'] == 'closed_won') & ~np.ma.getmaskarray(jobs['sales_rep_user_id']))
+    rep_user_id = np.ma.getdata(jobs['sales_rep_user_id'])[won]
+    basis_amount = jobs['total_contract_amount'][won]
+    # Each rep has a fixed rate tier
+    rate = np.asarray(COMMISSION_RATES)[rep_user_id % len(COMMISSION_RATES)]
+    return [
+        np.arange(len(won)),
+        rep_user_id,
+        jobs['id'][won],
+        jobs['closed_at'][won].astype('datetime64[M]').astype('datetime64[D]'),
+        basis_amount,
+        rate,
+        np.round(basis_amount * rate, 2),
+    ]
+
+
+def build_job_fact_batches(rng, now, office_ids, job_starts, job_counts, customer_starts, customer_counts,
+                           user_starts, user_counts, tax_start_id, tax_end_id, skew=None, first_rows=None):
+    """Jobs for a block of offices plus every fact row derived from them.
+    
+    Children are produced straight from the in-memory job batch, so the full job
+    set is never materialized. Returns {table: columns} in JOB_FACT_TABLES order;
+    ids of the derived tables are local positions rebased by the generator.
+    """
+    job_columns = build_job_columns(rng, now, office_ids, job_starts, job_counts,
+                                    customer_starts, customer_counts, user_starts, user_counts, skew, first_rows)
+    jobs = dict(zip(TABLE_COLUMNS['jobs'], job_columns))
+    invoices, line_items, payments = build_invoice_columns(rng, now, jobs, tax_start_id, tax_end_id)
+    return {
+        'jobs': job_columns,
+        'appointments': build_appointment_columns(rng, now, jobs),
+        'invoices': invoices,
+        'invoice_line_items': line_items,
+        'payment_applications': payments,
+        'commissions': build_commission_columns(rng, now, jobs),
+    }
+
+
+COLUMN_BUILDERS = {
+    'offices': build_office_columns,
+    'teams': build_team_columns,
+    'users': build_user_columns,
+    'customers': build_customer_columns,
+    'leads': build_lead_columns,
+    'jobs': build_job_fact_batches,
+}
+
+
+def generate_partition(task):
+    """Worker entry point: build the column batch for one partition.
+    
+    Every partition is seeded from (seed, table, partition index) alone, so the
+    batch is identical whether it runs inline or on any worker of any pool size.
+    """
+    table, seed, now, partition, args = task
+    rng = np.random.default_rng(partition_seed(seed, table, partition))
+    return COLUMN_BUILDERS[table](rng, now, *args)
+
+
+class OfficeKeyIndex:
+    """Primary key ranges of one table, per office.
+    
+    Rows of the office at position i have ids starts[i] .. starts[i] + counts[i] - 1,
+    so child tables can draw FKs from the right office for any per-office counts
+    without reading ids back from the database.
+    """
+    
+    def __init__(self, office_ids, starts, counts):
+        self.office_ids = office_ids
+        self.starts = starts
+        self.counts = counts
+    
+    def __len__(self):
+        return len(self.office_ids)
+    
+    @property
+    def total(self):
+        return int(self.counts.sum())
+    
+    def block(self, positions):
+        """(starts, counts) for a slice of office positions"""
+        return self.starts[positions], self.counts[positions]
+
+
+class IdAllocator:
+    """Assigns explicit primary keys client side, continuing after existing rows"""
+    
+    def __init__(self, next_ids):
+        self.next_ids = dict(next_ids)  # table -> next unused id
+    
+    def allocate(self, table, count):
+        """Reserve `count` consecutive ids and return the first one"""
+        start = self.next_ids[table]
+        self.next_ids[table] += count
+        return start
+    
+    def allocate_per_office(self, table, office_ids, counts):
+        """Reserve a contiguous id range per office, in office order"""
+        counts = np.broadcast_to(np.asarray(counts, dtype=np.int64), office_ids.shape).copy()
+        if (counts < 0).any():
+            raise ValueError(f"Negative per-office row count for {table}")
+        start = self.allocate(table, int(counts.sum()))
+        starts = start + np.cumsum(counts) - counts
+        return OfficeKeyIndex(office_ids, starts, counts)
+
+
+def id_range(ids):
+    """[first, stop) of an ascending id column, None when it is empty"""
+    return [int(ids[0]), int(ids[-1]) + 1] if len(ids) else None
+
+
+class RunCheckpoint:
+    """Partition-level progress of a MySQL load, kept in a local JSON file for --resume.
+    
+    Holds the run's generation settings and the first free id of every table
+    when it started. Each (table, partition) is recorded with its partition
+    seed and the id ranges it writes: 'started' before its first row is sent,
+    'done' once it is committed. Ids are allocated client side from the
+    recorded first ids, so a resumed run reproduces every id exactly.
+    
+    Partition events are appended to a journal next to the state file rather
+    than rewriting the state, so recording a partition costs the same however
+    many came before it. Loading replays the journal; save() folds it into
+    the state file.
+    """
+    
+    def __init__(self, path, settings=None, next_ids=None, partitions=None, complete=False):
+        self.path = path
+        self.settings = settings or {}
+        self.next_ids = next_ids or {}
+        self.partitions = partitions or {}  # "table/partition" -> {'status', 'seed', 'ids'}
+        self.complete = complete
+        self.journal = None
+        # Partitions are finished from the MySQL writer threads
+        self.lock = threading.Lock()
+    
+    @property
+    def journal_path(self):
+        return self.path + '.journal'
+    
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding='utf-8') as f:
+            state = json.load(f)
+        checkpoint = cls(path, state['settings'], state['next_ids'], state['partitions'], state['complete'])
+        checkpoint.replay()
+        return checkpoint
+    
+    def replay(self):
+        """Apply the partition events journaled since the state file was saved"""
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    key, entry = json.loads(line)
+                except ValueError:
+                    break  # torn last line of an interrupted append
+                if entry['status'] == 'started':
+                    self.partitions[key] = entry
+                elif key in self.partitions:
+                    self.partitions[key]['status'] = 'done'
+    
+    def save(self):
+        """Replace the state file atomically and start an empty journal.
+        
+        The new state is synced before it replaces the old one, so a crash
+        while saving keeps the previous state and its journal.
+        """
+        with self.lock:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            temp_path = self.path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'settings': self.settings, 'next_ids': self.next_ids, 'partitions': self.partitions,
+                           'complete': self.complete}, f, separators=(',', ':'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+            self.close_journal()
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+    
+    def append(self, key, entry):
+        """Journal one partition event and sync it before the partition moves on"""
+        with self.lock:
+            if self.journal is None:
+                self.journal = open(self.journal_path, 'a', encoding='utf-8')
+            self.journal.write(json.dumps([key, entry], separators=(',', ':')) + '\n')
+            self.journal.flush()
+            os.fsync(self.journal.fileno())
+    
+    def close_journal(self):
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+    
+    def begin(self, settings, next_ids):
+        self.settings = settings
+        self.next_ids = {table: int(next_id) for table, next_id in next_ids.items()}
+        self.partitions = {}
+        self.complete = False
+        self.save()
+    
+    def discard(self):
+        """Forget the saved progress; the run that follows cannot be resumed"""
+        self.settings, self.next_ids, self.partitions, self.complete = {}, {}, {}, False
+        self.close_journal()
+        for path in (self.path, self.journal_path):
+            if os.path.exists(path):
+                os.remove(path)
+    
+    def entry(self, table, partition):
+        return self.partitions.get(f"{table}/{partition}")
+    
+    def is_done(self, table, partition):
+        entry = self.entry(table, partition)
+        return entry is not None and entry['status'] == 'done'
+    
+    def start(self, table, partition, seed, ranges):
+        key = f"{table}/{partition}"
+        self.partitions[key] = {'status': 'started', 'seed': seed, 'ids': ranges}
+        self.append(key, self.partitions[key])
+    
+    def finish(self, table, partition):
+        key = f"{table}/{partition}"
+        self.partitions[key]['status'] = 'done'
+        self.append(key, {'status': 'done'})
+    
+    def take_unfinished(self):
+        """Remove and return the partitions that were started but never finished"""
+        unfinished = {key: entry for key, entry in self.partitions.items() if entry['status'] == 'started'}
+        for key in unfinished:
+            del self.partitions[key]
+        return unfinished
+
+
+# Sinks. The generator hands every column batch to a sink: MySQL, or files in an
+# output directory, so datasets can be produced on machines without a database.
+
+def batch_length(batch):
+    return len(batch[0])
+
+
+def slice_batch(batch, start, stop):
+    return [column[start:stop] for column in batch]
+
+
+def open_output(path, compression):
+    """Open a buffered UTF-8 text stream, optionally compressed"""
+    if compression == 'none':
+        raw = open(path, 'wb', buffering=WRITE_BUFFER_SIZE)
+    else:
+        raw = io.BufferedWriter(TEXT_COMPRESSORS[compression][0](path, 'wb'), WRITE_BUFFER_SIZE)
+    return io.TextIOWrapper(raw, encoding='utf-8', newline='')
+
+
+SQL_ESCAPES = str.maketrans({'\\': '\\\\', "'": "\\'", '\n': '\\n', '\r': '\\r', '\0': '\\0', '\x1a': '\\Z'})
+
+
+def sql_literal(value):
+    """Render a Python value as a MySQL literal"""
+    if value is None:
+        return 'NULL'
+    if isinstance(value, str):
+        return "'" + value.translate(SQL_ESCAPES) + "'"
+    if isinstance(value, (datetime, date)):
+        return f"'{value}'"
+    return str(value)
+
+
+def insert_statement(table, rows):
+    """Multi-row INSERT of row tuples in TABLE_COLUMNS order, with the values inlined as literals"""
+    values = ",\n".join("(" + ",".join(sql_literal(value) for value in row) + ")" for row in rows)
+    return f"INSERT INTO {table} ({', '.join(TABLE_COLUMNS[table])}) VALUES\n{values}"
+
+
+def peak_rss_bytes(children=False):
+    """High-water resident set size of this process (or of its finished children)"""
+    if resource is None:
+        return 0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # ru_maxrss is kilobytes on Linux but bytes on macOS
+    return usage.ru_maxrss if sys.platform == 'darwin' else usage.ru_maxrss * 1024
+
+
+class LoadProfiler:
+    """Per-table metrics of a load: stage timings, rows/sec, bytes sent and memory high-water.
+    
+    Stages are generate (building column batches, or waiting for the worker pool
+    to deliver them), serialize (columns to rows, TSV or file formats), insert,
+    commit, and write (the time the generator spent handing batches to the
+    sink, which with --writers is mostly queue back-pressure), plus spool and
+    rollup with --partition-by-month and --rollups. Writer threads report too,
+    so concurrent insert and commit times add up. The fact tables built
+    together with jobs report their generate time under jobs.
+    """
+    
+    def __init__(self, progress_seconds=PROGRESS_SECONDS, tracemalloc_dir=None):
+        self.tables = {}
+        self.stages = {}  # run-wide stage -> seconds
+        self.lock = threading.Lock()
+        self.progress_seconds = progress_seconds
+        self.tracemalloc_dir = tracemalloc_dir
+        self.start()
+    
+    def start(self):
+        """Restart the clock that progress lines and total_seconds count from"""
+        self.started = time.perf_counter()
+        self.last_progress = self.started
+    
+    def table(self, table):
+        return self.tables.setdefault(table, {'rows': 0, 'bytes_sent': 0, 'peak_rss_bytes': 0})
+    
+    def add(self, table, stage=None, seconds=0.0, bytes_sent=0):
+        with self.lock:
+            stats = self.table(table)
+            if stage is not None:
+                stats[f'{stage}_seconds'] = stats.get(f'{stage}_seconds', 0.0) + seconds
+            stats['bytes_sent'] += bytes_sent
+    
+    @contextlib.contextmanager
+    def measure(self, table, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(table, stage, time.perf_counter() - start)
+    
+    def seconds(self, table, stage):
+        return self.tables.get(table, {}).get(f'{stage}_seconds', 0.0)
+    
+    def total_rows(self):
+        return sum(stats['rows'] for stats in self.tables.values())
+    
+    def count_rows(self, table, rows):
+        """Add written rows and print a progress line every progress_seconds"""
+        with self.lock:
+            self.table(table)['rows'] += rows
+        now = time.perf_counter()
+        if now - self.last_progress >= self.progress_seconds:
+            self.last_progress = now
+            elapsed = now - self.started
+            total = self.total_rows()
+            print(f"  ... {elapsed:,.0f}s: {total:,} rows ({total / elapsed:,.0f} rows/sec), "
+                  f"writing {table.replace('_', ' ')}, peak RSS {peak_rss_bytes() / 2**20:,.0f} MiB", flush=True)
+    
+    def finish_table(self, table):
+        """Record the memory high-water once a table is complete"""
+        self.table(table)['peak_rss_bytes'] = peak_rss_bytes()
+    
+    def snapshot(self, stage):
+        """Dump a tracemalloc snapshot after a generation stage (with --tracemalloc)"""
+        if self.tracemalloc_dir is None or not tracemalloc.is_tracing():
+            return
+        os.makedirs(self.tracemalloc_dir, exist_ok=True)
+        path = os.path.join(self.tracemalloc_dir, f'{stage}.tracemalloc')
+        tracemalloc.take_snapshot().dump(path)
+        _, peak = tracemalloc.get_traced_memory()
+        self.table(stage)['traced_peak_bytes'] = peak
+        tracemalloc.reset_peak()
+        print(f"Wrote tracemalloc snapshot {path} (traced peak {peak / 2**20:,.1f} MiB)")
+    
+    def report(self, settings):
+        """Machine-readable summary of the load"""
+        tables = {}
+        for table, stats in self.tables.items():
+            write_seconds = stats.get('write_seconds', 0.0)
+            tables[table] = dict(stats, rows_per_sec=stats['rows'] / write_seconds if write_seconds else None)
+        return {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'settings': settings,
+            'total_seconds': time.perf_counter() - self.started,
+            'total_rows': self.total_rows(),
+            'stages': self.stages,
+            'peak_rss_bytes': peak_rss_bytes(),
+            'worker_peak_rss_bytes': peak_rss_bytes(children=True),
+            'tables': tables,
+        }
+    
+    def write_report(self, path, settings):
+        with open(path, 'w', encoding='utf-8') as handle:
+            json.dump(self.report(settings), handle, indent=2, default=str)
+        print(f"Wrote load profile to {path}")
+
+
+class Sink:
+    """Destination for generated column batches.
+    
+    Sinks that can run SQL (runs_sql) also receive schema and maintenance
+    statements; file sinks only receive data.
+    """
+    
+    name = None
+    runs_sql = False
+    can_query = False
+    dialect = 'mysql'  # SQL dialect of the statements a runs_sql sink receives
+    profiler = None  # LoadProfiler attached by MockDataGenerator
+    
+    @property
+    def label(self):
+        return self.name
+    
+    def measure(self, table, stage):
+        """Time a stage of writing `table` when a profiler is attached"""
+        return self.profiler.measure(table, stage) if self.profiler else contextlib.nullcontext()
+    
+    def count_bytes(self, table, size):
+        if self.profiler:
+            self.profiler.add(table, bytes_sent=size)
+    
+    def open(self):
+        pass
+    
+    def close(self):
+        pass
+    
+    def next_ids(self, tables):
+        """First free primary key per table; file sinks always start a fresh dataset"""
+        return dict.fromkeys(tables, 1)
+    
+    def execute(self, statement):
+        raise NotImplementedError(f"The {self.name} sink cannot run SQL")
+    
+    def fetchall(self, statement):
+        raise NotImplementedError(f"The {self.name} sink cannot run queries")
+    
+    def fetch_columns(self, statement):
+        """Run a query and return one NumPy array per selected column (empty list for no rows)"""
+        return [np.array(column, dtype=object) for column in zip(*self.fetchall(statement))]
+    
+    def commit(self):
+        pass
+    
+    def flush(self):
+        """Block until every written batch has reached the destination"""
+    
+    def when_written(self, callback):
+        """Call callback once every batch written so far has reached the destination"""
+        self.flush()
+        callback()
+    
+    def write(self, table, batch):
+        """Write one column batch in TABLE_COLUMNS order; returns the number of rows"""
+        raise NotImplementedError
+    
+    def restore_table(self, table, paths, rows):
+        """Load a table from cached TSV part files instead of generated batches"""
+        raise NotImplementedError(f"The {self.name} sink cannot restore cached snapshots")
+
+
+class MySQLSink(Sink):
+    """Writes into a live MySQL database with executemany or LOAD DATA LOCAL INFILE.
+    
+    Rows are committed every rows_per_transaction rows (default: chunk_size), sent
+    as statements of chunk_size rows. With writers > 1, writer threads on pooled
+    connections take transactions from a bounded queue, so generation overlaps
+    the inserts and the server sees several concurrent transactions.
+    """
+    
+    name = 'mysql'
+    runs_sql = True
+    can_query = True
+    
+    def __init__(self, host='localhost', database='leap_mock', user='root', password='',
+                 loader='executemany', chunk_size=DEFAULT_CHUNK_SIZE, rows_per_transaction=None, writers=1,
+                 local_infile=False):
         self.host = host
         self.database = database
         self.user = user
         self.password = password
+        self.loader = loader
+        # LOAD DATA LOCAL is needed by the load-data loader and to restore cached snapshots
+        self.local_infile = local_infile or loader == 'load-data'
+        self.chunk_size = chunk_size
+        self.rows_per_transaction = rows_per_transaction or chunk_size
+        self.writers = writers
+        self.connection = None
+        self.cursor = None
+        self.pool = None
+        self.queue = None
+        self.threads = []
+        self.writer_error = None
+        # Transactions queued since the last when_written(), and the callback to run once they commit
+        self.group = {'pending': 0, 'callback': None}
+        self.group_lock = threading.Lock()
+        self.retries = 0
+        self.retry_lock = threading.Lock()
+    
+    @property
+    def label(self):
+        return f"mysql/{self.loader}" + (f" x{self.writers} writers" if self.writers > 1 else "")
+    
+    def connection_args(self):
+        return dict(host=self.host, database=self.database, user=self.user, password=self.password,
+                    allow_local_infile=self.local_infile)
+    
+    def open(self):
+        """Establish database connection (and the writer pool)"""
+        try:
+            self.connection = mysql.connector.connect(**self.connection_args())
+            self.cursor = self.connection.cursor()
+            print(f"Connected to MySQL database: {self.database}")
+        except Error as e:
+            print(f"Error connecting to MySQL: {e}")
+            sys.exit(1)
+        
+        if self.local_infile:
+            self.cursor.execute("SELECT @@GLOBAL.local_infile")
+            if not self.cursor.fetchone()[0]:
+                print("Error: the load-data loader and snapshot restores need local_infile enabled on the server "
+                      "(SET GLOBAL local_infile = 1)")
+                sys.exit(1)
+        
+        if self.writers > 1:
+            self.pool = mysql.connector.pooling.MySQLConnectionPool(
+                pool_name=f"mock-writers-{uuid.uuid4().hex[:8]}", pool_size=self.writers, **self.connection_args())
+            self.queue = queue.Queue(maxsize=2 * self.writers)
+            self.threads = [threading.Thread(target=self.writer_loop, name=f"mock-writer-{i}", daemon=True)
+                            for i in range(self.writers)]
+            for thread in self.threads:
+                thread.start()
+    
+    def close(self):
+        """Drain the writers and close the database connections"""
+        if self.threads:
+            self.queue.join()
+            for _ in self.threads:
+                self.queue.put(None)
+            for thread in self.threads:
+                thread.join()
+            self.threads = []
+            self.queue = None
+        if self.retries:
+            print(f"Retried {self.retries} transactions after deadlocks or lock wait timeouts")
+        if self.connection and self.connection.is_connected():
+            self.cursor.close()
+            self.connection.close()
+            print("MySQL connection closed")
+    
+    def next_ids(self, tables):
+        next_ids = {}
+        for table in tables:
+            self.cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}")
+            next_ids[table] = self.cursor.fetchone()[0] + 1
+        return next_ids
+    
+    def execute(self, statement):
+        self.cursor.execute(statement)
+    
+    def fetchall(self, statement):
+        self.cursor.execute(statement)
+        return self.cursor.fetchall()
+    
+    def commit(self):
+        self.connection.commit()
+    
+    def flush(self):
+        """Wait until every queued transaction is committed"""
+        if self.queue is not None:
+            self.queue.join()
+            self.check_writers()
+    
+    def when_written(self, callback):
+        """Run callback on the writer that commits the last transaction queued so far.
+        
+        Generation carries on meanwhile; the callback never runs if a writer fails.
+        """
+        if self.queue is None:
+            callback()
+            return
+        with self.group_lock:
+            group, self.group = self.group, {'pending': 0, 'callback': None}
+            if group['pending']:
+                group['callback'] = callback
+                return
+        callback()
+    
+    def settle(self, group):
+        """Count one committed transaction of a group, running its callback after the last"""
+        with self.group_lock:
+            group['pending'] -= 1
+            callback = group['callback'] if not group['pending'] else None
+        if callback is not None:
+            callback()
+    
+    def check_writers(self):
+        if self.writer_error is not None:
+            raise RuntimeError(f"MySQL writer failed: {self.writer_error}")
+    
+    def write(self, table, batch):
+        count = 0
+        with self.measure(table, 'serialize'):
+            transactions = list(chunked(column_rows(batch), self.rows_per_transaction))
+        for rows in transactions:
+            if self.queue is not None:
+                self.check_writers()
+                with self.group_lock:
+                    self.group['pending'] += 1
+                self.queue.put((table, rows, self.group))
+            else:
+                self.write_transaction(self.connection, self.cursor, table, rows)
+            count += len(rows)
+        return count
+    
+    def writer_loop(self):
+        """Writer thread: commit queued transactions on a pooled connection until it gets None"""
+        connection = self.pool.get_connection()
+        cursor = connection.cursor()
+        # Parents and children land on different writers in any order; the keys are
+        # assigned client side, so the references hold once every writer is done
+        cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+        try:
+            while True:
+                item = self.queue.get()
+                try:
+                    if item is None:
+                        return
+                    if self.writer_error is None:
+                        table, rows, group = item
+                        self.write_transaction(connection, cursor, table, rows)
+                        self.settle(group)
+                except Exception as e:
+                    self.writer_error = self.writer_error or e
+                finally:
+                    self.queue.task_done()
+        finally:
+            cursor.close()
+            connection.close()
+    
+    def write_transaction(self, connection, cursor, table, rows):
+        """Insert rows as one transaction, retrying it on deadlock or lock wait timeout"""
+        for attempt in range(WRITE_RETRIES + 1):
+            try:
+                for chunk in chunked(rows, self.chunk_size):
+                    if self.loader == 'load-data':
+                        self.load_data(cursor, table, chunk)
+                    else:
+                        self.insert_many(cursor, table, chunk)
+                with self.measure(table, 'commit'):
+                    connection.commit()
+                return
+            except Error as e:
+                connection.rollback()
+                if e.errno not in RETRYABLE_ERRORS or attempt == WRITE_RETRIES:
+                    raise
+                with self.retry_lock:
+                    self.retries += 1
+                time.sleep(RETRY_BACKOFF_SECONDS * 2 ** attempt)
+    
+    def insert_many(self, cursor, table, rows):
+        """Send rows through the parameterized executemany path"""
+        columns = TABLE_COLUMNS[table]
+        with self.measure(table, 'insert'):
+            cursor.executemany(f"INSERT INTO {table} ({', '.join(columns)}) "
+                               f"VALUES ({', '.join(['%s'] * len(columns))})", rows)
+        if self.profiler:
+            # The connector rewrites the batch into one multi-row INSERT and keeps it as .statement
+            statement = getattr(cursor, 'statement', None) or ''
+            self.count_bytes(table, len(statement.encode('utf-8') if isinstance(statement, str) else statement))
+    
+    def load_data_query(self, table):
+        return (f"LOAD DATA LOCAL INFILE %s INTO TABLE {table} CHARACTER SET utf8mb4 "
+                f"FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' "
+                f"({', '.join(TABLE_COLUMNS[table])})")
+    
+    def load_data(self, cursor, table, rows):
+        """Spool rows to a TSV temp file and ingest it with LOAD DATA LOCAL INFILE"""
+        query = self.load_data_query(table)
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', newline='', prefix=f'{table}-', suffix='.tsv') as spool:
+            with self.measure(table, 'serialize'):
+                spool.writelines(tsv_line(row) for row in rows)
+                spool.flush()
+            self.count_bytes(table, spool.tell())
+            with self.measure(table, 'insert'):
+                cursor.execute(query, (spool.name,))
+    
+    def restore_table(self, table, paths, rows):
+        """LOAD DATA every cached part file, one commit per file.
+        
+        Snapshots are complete datasets loaded parents first, so foreign key
+        checks are skipped like on the writer connections.
+        """
+        self.cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+        try:
+            for path in paths:
+                with self.measure(table, 'insert'):
+                    self.cursor.execute(self.load_data_query(table), (path,))
+                with self.measure(table, 'commit'):
+                    self.connection.commit()
+                self.count_bytes(table, os.path.getsize(path))
+        finally:
+            self.cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+
+
+class PartitionedFileSink(Sink):
+    """Base for sinks writing each table as numbered part files: <output_dir>/<table>/part-00000.<ext>.
+    
+    A new part starts every rows_per_file rows. close() writes manifest.json
+    listing the columns, row count and files of every table.
+    """
+    
+    extension = None
+    compressions = ()
+    default_compression = 'none'
+    
+    def __init__(self, output_dir, compression=None, rows_per_file=DEFAULT_ROWS_PER_FILE):
+        self.output_dir = output_dir
+        self.compression = compression or self.default_compression
+        if self.compression not in self.compressions:
+            raise ValueError(f"The {self.name} sink supports {', '.join(self.compressions)} compression, "
+                             f"not {self.compression}")
+        self.rows_per_file = rows_per_file
+        self.tables = {}
+    
+    @property
+    def label(self):
+        return self.name if self.compression == 'none' else f"{self.name}/{self.compression}"
+    
+    def part_path(self, table, index):
+        return os.path.join(self.output_dir, table, f"part-{index:05d}{self.extension}")
+    
+    def open(self):
+        # Start every table fresh, but only remove files this sink would have written
+        for table in TABLE_COLUMNS:
+            directory = os.path.join(self.output_dir, table)
+            os.makedirs(directory, exist_ok=True)
+            for name in os.listdir(directory):
+                if name.startswith('part-'):
+                    os.remove(os.path.join(directory, name))
+        print(f"Writing {self.label} files to {self.output_dir}")
+    
+    def write(self, table, batch):
+        state = self.tables.setdefault(table, {'rows': 0, 'files': [], 'handle': None, 'file_rows': 0})
+        n = batch_length(batch)
+        written = 0
+        while written < n:
+            if state['handle'] is None or state['file_rows'] >= self.rows_per_file:
+                self.finish_part(table, state)
+                path = self.part_path(table, len(state['files']))
+                state['handle'] = self.open_part(table, path)
+                state['files'].append(os.path.relpath(path, self.output_dir))
+                state['file_rows'] = 0
+            take = min(n - written, self.rows_per_file - state['file_rows'])
+            with self.measure(table, 'serialize'):
+                self.write_part(state['handle'], table, slice_batch(batch, written, written + take))
+            state['file_rows'] += take
+            written += take
+        state['rows'] += n
+        return n
+    
+    def finish_part(self, table, state):
+        if state['handle'] is not None:
+            with self.measure(table, 'commit'):
+                self.close_part(state['handle'])
+            state['handle'] = None
+            self.count_bytes(table, os.path.getsize(os.path.join(self.output_dir, state['files'][-1])))
+    
+    def close(self):
+        for table, state in self.tables.items():
+            self.finish_part(table, state)
+        manifest = {
+            'format': self.name,
+            'compression': self.compression,
+            'tables': {
+                table: {'columns': list(TABLE_COLUMNS[table]), 'rows': state['rows'], 'files': state['files']}
+                for table, state in self.tables.items()
+            },
+        }
+        with open(os.path.join(self.output_dir, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f, indent=2)
+        print(f"Wrote manifest to {os.path.join(self.output_dir, 'manifest.json')}")
+    
+    def open_part(self, table, path):
+        raise NotImplementedError
+    
+    def write_part(self, handle, table, batch):
+        raise NotImplementedError
+    
+    def close_part(self, handle):
+        handle.close()
+
+
+class CsvSink(PartitionedFileSink):
+    """CSV part files with a header row; NULL is written as \\N (MySQL's LOAD DATA convention)"""
+    
+    name = 'csv'
+    compressions = tuple(TEXT_COMPRESSORS)
+    
+    @property
+    def extension(self):
+        return '.csv' + TEXT_COMPRESSORS[self.compression][1]
+    
+    def open_part(self, table, path):
+        stream = open_output(path, self.compression)
+        writer = csv.writer(stream, lineterminator='\n')
+        writer.writerow(TABLE_COLUMNS[table])
+        return stream, writer
+    
+    def write_part(self, handle, table, batch):
+        handle[1].writerows(
+            ['\\N' if value is None else value for value in row] for row in column_rows(batch)
+        )
+    
+    def close_part(self, handle):
+        handle[0].close()
+
+
+class TsvSink(PartitionedFileSink):
+    """Tab-separated part files in the default LOAD DATA INFILE format (backslash escapes, \\N for NULL)"""
+    
+    name = 'tsv'
+    extension = '.tsv'
+    compressions = ('none',)
+    
+    def open_part(self, table, path):
+        return open_output(path, 'none')
+    
+    def write_part(self, handle, table, batch):
+        handle.writelines(tsv_line(row) for row in column_rows(batch))
+    
+    def restore_table(self, table, paths, rows):
+        """Copy cached part files into the output directory"""
+        state = self.tables.setdefault(table, {'rows': 0, 'files': [], 'handle': None, 'file_rows': 0})
+        for path in paths:
+            target = self.part_path(table, len(state['files']))
+            shutil.copyfile(path, target)
+            state['files'].append(os.path.relpath(target, self.output_dir))
+            self.count_bytes(table, os.path.getsize(target))
+        state['rows'] += rows
+
+
+def arrow_batch(pa, table, batch):
+    """A column batch as a pyarrow Table (masked entries and NaT become nulls)"""
+    arrays = []
+    for column in batch:
+        if isinstance(column, np.ma.MaskedArray):
+            array = pa.array(np.ma.getdata(column), mask=np.ma.getmaskarray(column))
+        else:
+            array = pa.array(column, from_pandas=True)
+        if pa.types.is_null(array.type):
+            array = array.cast(pa.string())
+        arrays.append(array)
+    return pa.Table.from_arrays(arrays, names=list(TABLE_COLUMNS[table]))
+
+
+class ParquetSink(PartitionedFileSink):
+    """Columnar Parquet part files; each batch becomes a row group without zipping into rows"""
+    
+    name = 'parquet'
+    extension = '.parquet'
+    compressions = ('none', 'snappy', 'gzip', 'zstd', 'brotli', 'lz4')
+    default_compression = 'snappy'
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise RuntimeError("The parquet sink needs pyarrow (pip install pyarrow)")
+        self.pa = pyarrow
+        self.pq = pyarrow.parquet
+        self.schemas = {}
+    
+    def arrow_table(self, table, batch):
+        arrow_table = arrow_batch(self.pa, table, batch)
+        # Later batches may infer narrower types (e.g. an all-NULL column); hold them to the first schema
+        schema = self.schemas.setdefault(table, arrow_table.schema)
+        return arrow_table.cast(schema)
+    
+    def open_part(self, table, path):
+        return {'path': path, 'writer': None}
+    
+    def write_part(self, handle, table, batch):
+        arrow_table = self.arrow_table(table, batch)
+        if handle['writer'] is None:
+            handle['writer'] = self.pq.ParquetWriter(handle['path'], arrow_table.schema, compression=self.compression)
+        handle['writer'].write_table(arrow_table)
+    
+    def close_part(self, handle):
+        if handle['writer'] is not None:
+            handle['writer'].close()
+
+
+class SqlDumpSink(Sink):
+    """A single SQL script of multi-row INSERTs, replayable with the mysql client.
+    
+    Schema and maintenance statements (--create-schema, --clear-data) are written
+    into the script in order, so the dump can rebuild the database on its own.
+    """
+    
+    name = 'sql'
+    runs_sql = True
+    compressions = tuple(TEXT_COMPRESSORS)
+    
+    def __init__(self, output_dir, compression=None, rows_per_statement=DEFAULT_CHUNK_SIZE):
+        self.output_dir = output_dir
+        self.compression = compression or 'none'
+        if self.compression not in self.compressions:
+            raise ValueError(f"The sql sink supports {', '.join(self.compressions)} compression, "
+                             f"not {self.compression}")
+        self.rows_per_statement = rows_per_statement
+        self.path = os.path.join(output_dir, 'mock_data.sql' + TEXT_COMPRESSORS[self.compression][1])
+        self.stream = None
+    
+    @property
+    def label(self):
+        return self.name if self.compression == 'none' else f"{self.name}/{self.compression}"
+    
+    def open(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.stream = open_output(self.path, self.compression)
+        self.stream.write("-- Leap mock data dump\n"
+                          "SET @OLD_FOREIGN_KEY_CHECKS = @@FOREIGN_KEY_CHECKS, FOREIGN_KEY_CHECKS = 0;\n"
+                          "SET @OLD_UNIQUE_CHECKS = @@UNIQUE_CHECKS, UNIQUE_CHECKS = 0;\n")
+        print(f"Writing SQL dump to {self.path}")
+    
+    def close(self):
+        if self.stream is not None:
+            self.stream.write("SET FOREIGN_KEY_CHECKS = @OLD_FOREIGN_KEY_CHECKS;\n"
+                              "SET UNIQUE_CHECKS = @OLD_UNIQUE_CHECKS;\n")
+            self.stream.close()
+            self.stream = None
+    
+    def execute(self, statement):
+        self.stream.write(textwrap.dedent(statement).strip() + ";\n")
+    
+    def write(self, table, batch):
+        count = 0
+        for chunk in chunked(column_rows(batch), self.rows_per_statement):
+            with self.measure(table, 'serialize'):
+                statement = insert_statement(table, chunk) + ";\n"
+            with self.measure(table, 'insert'):
+                self.stream.write(statement)
+            self.count_bytes(table, len(statement))
+            count += len(chunk)
+        return count
+
+
+class EmbeddedSink(Sink):
+    """Base for sinks loading an embedded database file, <output_dir>/mock_data.<ext>.
+    
+    Schema statements arrive in the sink's dialect (see create_table_sql()), so
+    the file holds the same tables and reporting views as the MySQL database
+    and can be queried in-process.
+    """
+    
+    runs_sql = True
+    can_query = True
+    extension = None
+    
+    def __init__(self, output_dir, compression=None):
+        if compression not in (None, 'none'):
+            raise ValueError(f"The {self.name} sink does not compress its database file")
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, 'mock_data' + self.extension)
         self.connection = None
-        self.cursor = None
-        
+    
+    def open(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.connection = self.connect()
+        print(f"Connected to {self.name} database: {self.path}")
+    
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+            print(f"{self.name} database closed")
+    
     def connect(self):
-        """Establish database connection"""
+        raise NotImplementedError
+    
+    def next_ids(self, tables):
+        return {table: self.fetchall(f"SELECT COALESCE(MAX(id), 0) FROM {table}")[0][0] + 1 for table in tables}
+    
+    def execute(self, statement):
+        self.connection.execute(statement)
+    
+    def fetchall(self, statement):
+        return self.connection.execute(statement).fetchall()
+    
+    def commit(self):
+        self.connection.commit()
+
+
+class DuckDBSink(EmbeddedSink):
+    """Appends each batch to a DuckDB file as one Arrow scan, without zipping into rows"""
+    
+    name = 'duckdb'
+    dialect = 'duckdb'
+    extension = '.duckdb'
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
         try:
-            self.connection = mysql.connector.connect(
-                host=self.host,
-                database=self.database,
-                user=self.user,
-                password=self.password
-            )
-            self.cursor = self.connection.cursor()
-            print(f"Connected to MySQL database: {self.database}")
-        except Error as e:
-            print(f"Error connecting to MySQL: {e}")
-            sys.exit(1)
+            import duckdb
+            import pyarrow
+        except ImportError:
+            raise RuntimeError("The duckdb sink needs duckdb and pyarrow (pip install duckdb pyarrow)")
+        self.duckdb = duckdb
+        self.pa = pyarrow
+    
+    def connect(self):
+        return self.duckdb.connect(self.path)
+    
+    def fetch_columns(self, statement):
+        result = self.connection.execute(statement)
+        # to_arrow_table() replaced fetch_arrow_table() in duckdb 1.4
+        arrow_table = (getattr(result, 'to_arrow_table', None) or result.fetch_arrow_table)()
+        return [column.to_numpy() for column in arrow_table.columns] if arrow_table.num_rows else []
+    
+    def commit(self):
+        pass  # every statement commits on its own
+    
+    def write(self, table, batch):
+        with self.measure(table, 'serialize'):
+            arrow_table = arrow_batch(self.pa, table, batch)
+        columns = ', '.join(TABLE_COLUMNS[table])
+        with self.measure(table, 'insert'):
+            self.connection.register('mock_batch', arrow_table)
+            try:
+                self.connection.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM mock_batch")
+            finally:
+                self.connection.unregister('mock_batch')
+        self.count_bytes(table, arrow_table.nbytes)
+        return arrow_table.num_rows
+
+
+def sqlite_column(column):
+    """A batch column with datetimes as the 'YYYY-MM-DD HH:MM:SS' text SQLite's date functions read"""
+    if not (isinstance(column, np.ndarray) and column.dtype.kind == 'M'):
+        return column
+    text = np.char.replace(np.datetime_as_string(column), 'T', ' ').astype(object)
+    text[np.isnat(column)] = None
+    return text
+
+
+class SQLiteSink(EmbeddedSink):
+    """Inserts each batch into a SQLite file with one executemany and one transaction.
+    
+    The file is opened in WAL mode with synchronous=NORMAL, so commits do not
+    wait for fsync on every batch.
+    """
+    
+    name = 'sqlite'
+    dialect = 'sqlite'
+    extension = '.sqlite'
+    
+    def connect(self):
+        import sqlite3
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        return connection
+    
+    def write(self, table, batch):
+        with self.measure(table, 'serialize'):
+            rows = list(column_rows([sqlite_column(column) for column in batch]))
+        placeholders = ', '.join('?' * len(TABLE_COLUMNS[table]))
+        with self.measure(table, 'insert'):
+            self.connection.executemany(
+                f"INSERT INTO {table} ({', '.join(TABLE_COLUMNS[table])}) VALUES ({placeholders})", rows)
+        with self.measure(table, 'commit'):
+            self.connection.commit()
+        return len(rows)
+
+
+def take_batch(batch, index):
+    """Rows `index` of a column batch (list columns such as job_number included)"""
+    return [column[index] if isinstance(column, np.ndarray) else np.asarray(column, dtype=object)[index]
+            for column in batch]
+
+
+class MonthSpoolSink(Sink):
+    """Loads the month-partitioned tables partition by partition (--partition-by-month).
+    
+    Batches of the PARTITIONED_TABLES are split by the month of their partition
+    column and spooled to temp files; flush() then writes each table month after
+    month, so every insert touches a single partition and each partition is
+    filled in one pass. The layout has no foreign keys into these tables, so
+    holding their rows back until the end is safe. Everything else goes straight
+    to the wrapped sink.
+    """
+    
+    def __init__(self, inner):
+        self.inner = inner
+        self.spools = {}  # (table, month) -> temp file of pickled column batches
+    
+    def __getattr__(self, attribute):
+        return getattr(self.inner, attribute)
+    
+    name = property(lambda self: self.inner.name)
+    runs_sql = property(lambda self: self.inner.runs_sql)
+    can_query = property(lambda self: self.inner.can_query)
+    dialect = property(lambda self: self.inner.dialect)
+    label = property(lambda self: self.inner.label + " by month")
+    profiler = property(lambda self: self.inner.profiler, lambda self, value: setattr(self.inner, 'profiler', value))
+    
+    def open(self):
+        self.inner.open()
+    
+    def close(self):
+        """Discard anything still spooled (flush() was not reached) and close the wrapped sink"""
+        for spool in self.spools.values():
+            spool.close()
+        self.spools = {}
+        self.inner.close()
+    
+    def next_ids(self, tables):
+        return self.inner.next_ids(tables)
+    
+    def execute(self, statement):
+        self.inner.execute(statement)
+    
+    def fetchall(self, statement):
+        return self.inner.fetchall(statement)
+    
+    def commit(self):
+        self.inner.commit()
+    
+    def restore_table(self, table, paths, rows):
+        self.inner.restore_table(table, paths, rows)
+    
+    def write(self, table, batch):
+        if table not in PARTITIONED_TABLES:
+            return self.inner.write(table, batch)
+        
+        column = batch[TABLE_COLUMNS[table].index(PARTITIONED_TABLES[table])]
+        months = np.asarray(column).astype('datetime64[M]')
+        order = np.argsort(months, kind='stable')
+        for rows in np.split(order, np.flatnonzero(np.diff(months[order])) + 1):
+            if len(rows):
+                key = (table, months[rows[0]])
+                if key not in self.spools:
+                    self.spools[key] = tempfile.TemporaryFile(prefix=f'{table}-')
+                with self.measure(table, 'spool'):
+                    pickle.dump(take_batch(batch, rows), self.spools[key], protocol=pickle.HIGHEST_PROTOCOL)
+        return batch_length(batch)
+    
+    def flush(self):
+        """Write the spooled tables month by month, then flush the wrapped sink"""
+        tables = list(TABLE_COLUMNS)
+        for table, month in sorted(self.spools, key=lambda key: (tables.index(key[0]), key[1])):
+            spool = self.spools.pop((table, month))
+            spool.seek(0)
+            while True:
+                try:
+                    batch = pickle.load(spool)
+                except EOFError:
+                    break
+                self.inner.write(table, batch)
+            spool.close()
+        self.inner.flush()
+
+
+SINKS = {
+    'mysql': MySQLSink,
+    'csv': CsvSink,
+    'tsv': TsvSink,
+    'parquet': ParquetSink,
+    'sql': SqlDumpSink,
+    'duckdb': DuckDBSink,
+    'sqlite': SQLiteSink,
+}
+
+
+class SnapshotCache:
+    """Local cache of complete generated datasets, stored as TSV part files (--snapshot-cache).
+    
+    Each entry is <cache_dir>/<key>/ holding a TsvSink output and snapshot.json.
+    The key hashes everything the rows depend on plus the schema DDL, so a hit
+    is exactly the dataset a run would generate. Entries are written to a
+    temporary directory and renamed into place once complete; least recently
+    used entries are evicted while the cache is larger than max_bytes.
+    """
+    
+    def __init__(self, cache_dir=DEFAULT_SNAPSHOT_CACHE_DIR, max_bytes=DEFAULT_SNAPSHOT_CACHE_GB << 30):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+    
+    def entry_path(self, key):
+        return os.path.join(self.cache_dir, key)
+    
+    def read_entry(self, key):
+        path = os.path.join(self.entry_path(key), 'snapshot.json')
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    
+    def write_entry(self, key, entry):
+        path = os.path.join(self.entry_path(key), 'snapshot.json')
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(entry, f, indent=2)
+        os.replace(path + '.tmp', path)
+    
+    def lookup(self, key):
+        """The manifest of a cached snapshot (marked as just used), or None"""
+        entry = self.read_entry(key)
+        if entry is not None:
+            entry['last_used'] = time.time()
+            self.write_entry(key, entry)
+        return entry
+    
+    def part_paths(self, key, entry, table):
+        return [os.path.join(self.entry_path(key), name) for name in entry['tables'][table]['files']]
+    
+    def writer(self, key):
+        """A TsvSink writing a pending snapshot into a temporary directory"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        sink = TsvSink(tempfile.mkdtemp(prefix=f'.{key}-', dir=self.cache_dir))
+        for table in TABLE_COLUMNS:
+            os.makedirs(os.path.join(sink.output_dir, table))
+        return sink
+    
+    def discard(self, writer):
+        shutil.rmtree(writer.output_dir, ignore_errors=True)
+    
+    def store(self, key, writer, identity):
+        """Close a pending snapshot, move it into place and evict down to max_bytes"""
+        writer.close()
+        with open(os.path.join(writer.output_dir, 'manifest.json'), encoding='utf-8') as f:
+            manifest = json.load(f)
+        size = sum(os.path.getsize(os.path.join(directory, name))
+                   for directory, _, names in os.walk(writer.output_dir) for name in names)
+        now = time.time()
+        entry = dict(manifest, key=key, identity=identity, bytes=size, created=now, last_used=now)
+        with open(os.path.join(writer.output_dir, 'snapshot.json'), 'w', encoding='utf-8') as f:
+            json.dump(entry, f, indent=2)
+        try:
+            os.rename(writer.output_dir, self.entry_path(key))
+        except OSError:
+            # Another run stored the same snapshot first
+            self.discard(writer)
+            return
+        print(f"Cached snapshot {key} ({size / 2**20:,.1f} MiB) in {self.cache_dir}")
+        self.evict(keep=key)
+    
+    def evict(self, keep=None):
+        entries = []
+        for key in os.listdir(self.cache_dir):
+            entry = None if key.startswith('.') else self.read_entry(key)
+            if entry is not None:
+                entries.append((entry['last_used'], entry['bytes'], key))
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if key != keep:
+                shutil.rmtree(self.entry_path(key), ignore_errors=True)
+                total -= size
+                print(f"Evicted snapshot {key} ({size / 2**20:,.1f} MiB) from the snapshot cache")
+
+
+def key_values(column):
+    """A fetched key column as int64 with 0 for NULL (generated ids start at 1)"""
+    if column.dtype == object:
+        column = np.where(np.equal(column, None), 0, column)
+    elif column.dtype.kind == 'f':  # Arrow turns integer columns with nulls into floats
+        column = np.nan_to_num(column)
+    return column.astype(np.int64)
+
+
+class DatasetValidator:
+    """Reads the loaded tables back and checks what the generator promises (--validate).
+    
+    Tables are streamed parents first in id-ordered chunks (keyset pagination on
+    the primary key). Every table a foreign key points at keeps one int32 per id:
+    the row's office, 1 for tables without offices, 0 for ids that do not exist.
+    Dangling references and references into another office are then array
+    lookups instead of JOINs. Rows without an office_id take the office of their
+    job. The DISTRIBUTION_CHECKS columns are counted along the way and compared
+    with their configured weights, unless `distributions` is off: rows appended
+    by --append start as 'new'/'estimate' and drift through their transitions.
+    """
+    
+    def __init__(self, sink, chunk_size=VALIDATE_CHUNK_SIZE, distributions=True):
+        self.sink = sink
+        self.chunk_size = chunk_size
+        self.distributions = distributions
+        self.parents = {parent for schema in TABLE_SCHEMAS.values() for _, parent in schema.get('foreign_keys', ())}
+        self.keys = {}
+        self.problems = []
+    
+    def chunks(self, table, columns):
+        """Yield {column: array} for successive chunks of a table in id order"""
+        last_id = 0
+        while True:
+            arrays = self.sink.fetch_columns(f"SELECT {', '.join(columns)} FROM {table} "
+                                             f"WHERE id > {last_id} ORDER BY id LIMIT {self.chunk_size}")
+            if not arrays:
+                return
+            yield dict(zip(columns, arrays))
+            last_id = int(arrays[0][-1])
+    
+    def parent_keys(self, parent, values):
+        """Office (or 1) of the referenced parent rows; 0 where the reference dangles"""
+        keys = self.keys[parent]
+        found = np.zeros(len(values), dtype=np.int32)
+        in_range = (values > 0) & (values < len(keys))
+        found[in_range] = keys[values[in_range]]
+        return found
+    
+    def validate_table(self, table, next_id):
+        foreign_keys = TABLE_SCHEMAS[table].get('foreign_keys', [])
+        checks = [check for check in DISTRIBUTION_CHECKS if check[0] == table and self.distributions]
+        columns = ['id'] + [column for column, _ in foreign_keys]
+        for _, column, _, _, only in checks:
+            columns += [name for name in (column, only and only[0]) if name and name not in columns]
+        has_office = 'office_id' in TABLE_COLUMNS[table]
+        office_source = None if has_office or ('job_id', 'jobs') not in foreign_keys else 'job_id'
+        if table in self.parents:
+            self.keys[table] = np.zeros(next_id, dtype=np.int32)
+        
+        rows = 0
+        dangling = dict.fromkeys((column for column, _ in foreign_keys), 0)
+        cross_office = dict(dangling)
+        counts = [{} for _ in checks]
+        for chunk in self.chunks(table, columns):
+            ids = key_values(chunk['id'])
+            rows += len(ids)
+            references = {column: key_values(chunk[column]) for column, _ in foreign_keys}
+            found = {column: self.parent_keys(parent, references[column]) for column, parent in foreign_keys}
+            for column, _ in foreign_keys:
+                dangling[column] += int(np.count_nonzero((references[column] != 0) & (found[column] == 0)))
+            office = references['office_id'] if has_office else found.get(office_source)
+            if office is not None:
+                for column, parent in foreign_keys:
+                    if column not in ('office_id', office_source) and 'office_id' in TABLE_COLUMNS[parent]:
+                        mismatch = (found[column] != 0) & (office != 0) & (found[column] != office)
+                        cross_office[column] += int(np.count_nonzero(mismatch))
+            if table in self.parents:
+                self.keys[table][ids] = office if has_office else 1
+            for (_, column, _, _, only), tally in zip(checks, counts):
+                values = chunk[column]
+                if only is not None:
+                    values = values[key_values(chunk[only[0]]) == only[1]]
+                for value, count in zip(*np.unique(values.astype(str), return_counts=True)):
+                    tally[value] = tally.get(value, 0) + int(count)
+        
+        for column, parent in foreign_keys:
+            if dangling[column]:
+                self.problems.append(f"{table}.{column}: {dangling[column]} references to missing {parent} rows")
+            if cross_office[column]:
+                self.problems.append(f"{table}.{column}: {cross_office[column]} references to {parent} "
+                                     f"of another office")
+        for (_, column, values, weights, _), tally in zip(checks, counts):
+            self.check_distribution(table, column, values, weights, tally)
+        return rows
+    
+    def check_distribution(self, table, column, values, weights, tally):
+        n = sum(tally.values())
+        if not n:
+            return
+        weights = weights or [1 / len(values)] * len(values)
+        for value, weight in zip(values, weights):
+            share = tally.get(value, 0) / n
+            allowed = DISTRIBUTION_SIGMAS * (weight * (1 - weight) / n) ** 0.5 + DISTRIBUTION_TOLERANCE
+            if abs(share - weight) > allowed:
+                self.problems.append(f"{table}.{column}: '{value}' is {share:.1%} of {n} rows, "
+                                     f"configured {weight:.1%}")
+        unknown = n - sum(tally.get(value, 0) for value in values)
+        if unknown:
+            self.problems.append(f"{table}.{column}: {unknown} rows outside {', '.join(values)}")
+    
+    def run(self):
+        """Validate every table; prints a summary and returns the list of problems found"""
+        start = time.perf_counter()
+        self.sink.commit()  # end any open read snapshot, so rows committed by other connections are visible
+        next_ids = self.sink.next_ids(TABLE_SCHEMAS)
+        total_rows = 0
+        for table in TABLE_SCHEMAS:
+            table_start = time.perf_counter()
+            rows = self.validate_table(table, next_ids[table])
+            total_rows += rows
+            print(f"Validated {rows} {table} in {time.perf_counter() - table_start:.1f}s")
+        self.keys = {}
+        print(f"Validated {total_rows} rows in {time.perf_counter() - start:.1f}s: "
+              + (f"{len(self.problems)} problems" if self.problems else "no problems found"))
+        for problem in self.problems:
+            print(f"  {problem}")
+        return self.problems
+
+
+class MockDataGenerator:
+    def __init__(self, host='localhost', database='leap_mock', user='root', password='',
+                 scale_factor=1.0, chunk_size=DEFAULT_CHUNK_SIZE, seed=DEFAULT_SEED, workers=1,
+                 as_of=None, loader='executemany', locale=DEFAULT_LOCALE,
+                 pool_cache_dir=DEFAULT_POOL_CACHE_DIR, sink=None, defer_indexes=False,
+                 index_profile='none', rollups=False, partition_by_month=False, profiler=None,
+                 checkpoint=None, snapshots=None, skew_profile='uniform'):
+        self.scale_factor = scale_factor
+        self.chunk_size = chunk_size
+        self.seed = seed
+        self.workers = workers
+        # Fixed "now" for all timestamps so runs are reproducible; defaults to today at midnight
+        self.now = as_of or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.pool = None
+        self.ids = None
+        self.locale = locale
+        self.pool_cache_dir = pool_cache_dir
+        self.skew_profile = skew_profile
+        self.skew = SKEW_PROFILES[skew_profile]
+        # Without an explicit sink, write to MySQL as before
+        self.sink = sink or MySQLSink(host, database, user, password, loader=loader, chunk_size=chunk_size)
+        self.profiler = profiler or LoadProfiler()
+        self.sink.profiler = self.profiler
+        self.checkpoint = checkpoint
+        self.snapshots = snapshots
+        self.snapshot_writer = None
+        self.defer_indexes = defer_indexes
+        self.index_profile = index_profile
+        self.rollups = rollups
+        self.partition_months = partition_months(self.now) if partition_by_month else None
+        
+    def connect(self):
+        """Open the sink (connects to MySQL for the mysql sink)"""
+        self.sink.open()
     
     def disconnect(self):
-        """Close database connection"""
-        if self.connection and self.connection.is_connected():
-            self.cursor.close()
-            self.connection.close()
-            print("MySQL connection closed")
+        """Close the sink"""
+        self.sink.close()
     
     def execute_schema(self):
-        """Create tables based on the schema"""
-        schema_commands = [
-            """
-            CREATE TABLE IF NOT EXISTS offices (
-              id BIGINT PRIMARY KEY AUTO_INCREMENT,
-              name VARCHAR(120) NOT NULL,
-              tz VARCHAR(64) NOT NULL,
-              latitude DECIMAL(9,6), 
-              longitude DECIMAL(9,6)
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS teams (
-              id BIGINT PRIMARY KEY AUTO_INCREMENT,
-              office_id BIGINT NOT NULL,
-              name VARCHAR(120) NOT NULL,
-              FOREIGN KEY (office_id) REFERENCES offices(id)
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS users (
-              id BIGINT PRIMARY KEY AUTO_INCREMENT,
-              office_id BIGINT NOT NULL,
-              team_id BIGINT NULL,
-              role ENUM('admin','manager','rep','tech') NOT NULL,
-              full_name VARCHAR(160) NOT NULL,
-              email VARCHAR(190) UNIQUE,
-              active TINYINT(1) DEFAULT 1,
-              FOREIGN KEY (office_id) REFERENCES offices(id),
-              FOREIGN KEY (team_id) REFERENCES teams(id)
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS customers (
-              id BIGINT PRIMARY KEY AUTO_INCREMENT,
-              office_id BIGINT NOT NULL,
-              full_name VARCHAR(160) NOT NULL,
-              email VARCHAR(190), 
-              phone VARCHAR(40),
-              address1 VARCHAR(160), 
-              city VARCHAR(100), 
-              state VARCHAR(64), 
-              postal_code VARCHAR(32),
-              latitude DECIMAL(9,6), 
-              longitude DECIMAL(9,6),
-              created_at DATETIME NOT NULL,
-              FOREIGN KEY (office_id) REFERENCES offices(id)
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS referral_sources (
-              id BIGINT PRIMARY KEY AUTO_INCREMENT,
-              name VARCHAR(120) NOT NULL,
-              channel ENUM('web','ad','partner','event','word_of_mouth','other') NOT NULL
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS leads (
-              id BIGINT PRIMARY KEY AUTO_INCREMENT,
-              office_id BIGINT NOT NULL,
-              customer_id BIGINT,
-              referral_source_id BIGINT,
-              status ENUM('new','contacted','qualified','converted','lost') NOT NULL,
-              created_at DATETIME NOT NULL,
-              FOREIGN KEY (office_id) REFERENCES offices(id),
-              FOREIGN KEY (customer_id) REFERENCES customers(id),
-              FOREIGN KEY (referral_source_id) REFERENCES referral_sources(id)
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS jobs (
-              id BIGINT PRIMARY KEY AUTO_INCREMENT,
-              office_id BIGINT NOT NULL,
-              customer_id BIGINT NOT NULL,
-              sales_rep_user_id BIGINT,
-              job_number VARCHAR(50) UNIQUE,
-              status ENUM('estimate','scheduled','in_progress','completed','closed_won','closed_lost','cancelled') NOT NULL,
-              job_type ENUM('residential','commercial','emergency','maintenance') NOT NULL,
-              total_contract_amount DECIMAL(10,2),
-              created_at DATETIME NOT NULL,
-              scheduled_start DATETIME,
-              scheduled_end DATETIME,
-              closed_at DATETIME,
-              FOREIGN KEY (office_id) REFERENCES offices(id),
-              FOREIGN KEY (customer_id) REFERENCES customers(id),
-              FOREIGN KEY (sales_rep_user_id) REFERENCES users(id)
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS appointments (
-              id BIGINT PRIMARY KEY AUTO_INCREMENT,
-              office_id BIGINT NOT NULL,
-              customer_id BIGINT,
-              sales_rep_user_id BIGINT,
-              scheduled_at DATETIME NOT NULL,
-              outcome ENUM('scheduled','completed','cancelled','no_show') NOT NULL,
-              converted_to_job TINYINT(1) DEFAULT 0,
-              FOREIGN KEY (office_id) REFERENCES offices(id),
-              FOREIGN KEY (customer_id) REFERENCES customers(id),
-              FOREIGN KEY (sales_rep_user_id) REFERENCES users(id)
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS invoices (
-              id BIGINT PRIMARY KEY AUTO_INCREMENT,
-              job_id BIGINT NOT NULL,
-              invoice_number VARCHAR(50) UNIQUE,
-              status ENUM('draft','sent','paid','overdue','partial','cancelled') NOT NULL,
-              issue_date DATE NOT NULL,
-              due_date DATE NOT NULL,
-              total_amount DECIMAL(10,2) NOT NULL,
-              FOREIGN KEY (job_id) REFERENCES jobs(id)
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS tax_jurisdictions (
-              id BIGINT PRIMARY KEY AUTO_INCREMENT,
-              name VARCHAR(120) NOT NULL,
-              rate DECIMAL(5,4) NOT NULL
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS invoice_line_items (
-              id BIGINT PRIMARY KEY AUTO_INCREMENT,
-              invoice_id BIGINT NOT NULL,
-              tax_jurisdiction_id BIGINT,
-              description TEXT,
-              quantity DECIMAL(8,2) NOT NULL,
-              unit_price DECIMAL(8,2) NOT NULL,
-              FOREIGN KEY (invoice_id) REFERENCES invoices(id),
-              FOREIGN KEY (tax_jurisdiction_id) REFERENCES tax_jurisdictions(id)
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS payment_applications (
-              id BIGINT PRIMARY KEY AUTO_INCREMENT,
-              invoice_id BIGINT NOT NULL,
-              payment_date DATE NOT NULL,
-              amount_applied DECIMAL(10,2) NOT NULL,
-              payment_method ENUM('cash','check','credit_card','bank_transfer') NOT NULL,
-              FOREIGN KEY (invoice_id) REFERENCES invoices(id)
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS commissions (
-              id BIGINT PRIMARY KEY AUTO_INCREMENT,
-              rep_user_id BIGINT NOT NULL,
-              job_id BIGINT NOT NULL,
-              period_month DATE NOT NULL,
-              basis_amount DECIMAL(10,2) NOT NULL,
-              rate DECIMAL(5,4) NOT NULL,
-              amount DECIMAL(10,2) NOT NULL,
-              FOREIGN KEY (rep_user_id) REFERENCES users(id),
-              FOREIGN KEY (job_id) REFERENCES jobs(id)
-            )
-            """
-        ]
+        """Create tables based on the schema.
         
-        for command in schema_commands:
+        With --defer-indexes the tables get only their primary keys; the rest is
+        built by build_indexes() after the load.
+        """
+        if not self.sink.runs_sql:
+            print(f"Skipping schema creation: the {self.sink.name} sink only writes data files")
+            return
+        
+        for table in TABLE_SCHEMAS:
             try:
-                self.cursor.execute(command)
+                self.sink.execute(create_table_sql(table, self.defer_indexes, self.index_profile,
+                                                   self.partition_months, self.sink.dialect))
+                if self.sink.dialect != 'mysql':
+                    for statement in create_index_sql(table, self.index_profile):
+                        self.sink.execute(statement)
                 print(".", end="", flush=True)
             except Error as e:
                 print(f"\nError creating table: {e}")
+        if self.rollups:
+            for statement in ROLLUP_TABLES.values():
+                self.sink.execute(statement)
         
-        self.connection.commit()
-        print("\nTables created successfully")
+        self.sink.commit()
+        print("\nTables created successfully" + (" (primary keys only)" if self.defer_indexes else ""))
+        self.create_views()
+    
+    def create_views(self):
+        """Create (or replace) the reporting views"""
+        for name, query in REPORTING_VIEWS.items():
+            for statement in create_view_sql(name, query, self.sink.dialect):
+                self.sink.execute(statement)
+        self.sink.commit()
+        print(f"Created {len(REPORTING_VIEWS)} reporting views")
+    
+    def drop_tables(self):
+        """Drop the generated tables and rollups, e.g. to recreate them in another layout"""
+        if self.sink.dialect == 'mysql':
+            self.sink.execute("SET FOREIGN_KEY_CHECKS = 0")
+        for table in [*ROLLUP_TABLES, *reversed(TABLE_SCHEMAS)]:
+            self.sink.execute(f"DROP TABLE IF EXISTS {table}")
+        if self.sink.dialect == 'mysql':
+            self.sink.execute("SET FOREIGN_KEY_CHECKS = 1")
+        print("Dropped existing tables")
+    
+    def drop_indexes(self):
+        """Strip FOREIGN KEYs and secondary indexes from existing tables before a deferred-index load"""
+        if not self.sink.can_query:
+            return
+        
+        foreign_keys = self.sink.fetchall(
+            "SELECT TABLE_NAME, CONSTRAINT_NAME FROM information_schema.REFERENTIAL_CONSTRAINTS "
+            "WHERE CONSTRAINT_SCHEMA = DATABASE()")
+        for table, name in foreign_keys:
+            if table in TABLE_SCHEMAS:
+                self.sink.execute(f"ALTER TABLE {table} DROP FOREIGN KEY {name}")
+        
+        indexes = {}
+        for table, name in self.sink.fetchall(
+                "SELECT DISTINCT TABLE_NAME, INDEX_NAME FROM information_schema.STATISTICS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND INDEX_NAME <> 'PRIMARY'"):
+            if table in TABLE_SCHEMAS:
+                indexes.setdefault(table, []).append(name)
+        for table, names in indexes.items():
+            self.sink.execute(f"ALTER TABLE {table} " + ", ".join(f"DROP INDEX {name}" for name in names))
+        if foreign_keys or indexes:
+            print(f"Dropped secondary indexes and foreign keys on {len(indexes)} tables for a deferred load")
+    
+    def add_missing_profile_indexes(self):
+        """Add index-profile indexes that an existing schema does not have yet"""
+        if not self.sink.can_query:
+            return
+        if self.sink.dialect != 'mysql':
+            for table in TABLE_SCHEMAS:
+                for statement in create_index_sql(table, self.index_profile):
+                    self.sink.execute(statement)
+            return
+        existing = set(self.sink.fetchall(
+            "SELECT DISTINCT TABLE_NAME, INDEX_NAME FROM information_schema.STATISTICS "
+            "WHERE TABLE_SCHEMA = DATABASE()"))
+        for table, indexes in INDEX_PROFILES[self.index_profile].items():
+            missing = [(name, columns) for name, columns in indexes if (table, name) not in existing]
+            if missing:
+                self.sink.execute(f"ALTER TABLE {table} " + ", ".join(
+                    f"ADD KEY {name} ({', '.join(columns)})" for name, columns in missing))
+    
+    def build_indexes(self):
+        """Build every UNIQUE key, profile index and FOREIGN KEY in one ALTER TABLE per table.
+        
+        FK checks are off while building: the generator assigns keys client side,
+        so the references are valid by construction and re-validating them would
+        cost a full scan per constraint. Returns the time spent.
+        """
+        start = time.perf_counter()
+        self.sink.execute("SET FOREIGN_KEY_CHECKS = 0")
+        for table in TABLE_SCHEMAS:
+            clauses = index_clauses(table, self.index_profile, self.partition_months is not None)
+            if table == 'jobs' and self.rollups:
+                name, columns = ROLLUP_SOURCE_INDEX
+                clauses.append(f"KEY {name} ({', '.join(columns)})")
+            if clauses:
+                table_start = time.perf_counter()
+                self.sink.execute(f"ALTER TABLE {table} " + ", ".join(f"ADD {clause}" for clause in clauses))
+                print(f"Built {len(clauses)} indexes/constraints on {table} in {time.perf_counter() - table_start:.1f}s")
+        self.sink.execute("SET FOREIGN_KEY_CHECKS = 1")
+        self.sink.commit()
+        return time.perf_counter() - start
     
     def clear_tables(self):
         """Clear all tables for fresh data generation"""
@@ -226,105 +2830,204 @@ class MockDataGenerator:
             'users', 'teams', 'tax_jurisdictions', 'referral_sources', 'offices'
         ]
         
-        self.cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
-        for table in tables:
-            self.cursor.execute(f"TRUNCATE TABLE {table}")
-        self.cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
-        self.connection.commit()
+        if not self.sink.runs_sql:
+            print(f"Nothing to clear: the {self.sink.name} sink starts every table fresh")
+            return
+        
+        if self.rollups:
+            # They only exist after --create-schema or an earlier rollup load
+            existing = ROLLUP_TABLES
+            if self.sink.can_query:
+                existing = {row[0] for row in self.sink.fetchall(
+                    "SELECT TABLE_NAME FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE()")}
+            tables += [table for table in ROLLUP_TABLES if table in existing]
+        
+        if self.sink.dialect == 'mysql':
+            self.sink.execute("SET FOREIGN_KEY_CHECKS = 0")
+            for table in tables:
+                self.sink.execute(f"TRUNCATE TABLE {table}")
+            self.sink.execute("SET FOREIGN_KEY_CHECKS = 1")
+        else:
+            for table in tables:  # children first
+                self.sink.execute(f"DELETE FROM {table}")
+        self.sink.commit()
         print("All tables cleared")
     
-    def generate_offices(self, count=5):
-        """Generate office records"""
-        offices = []
-        cities = [
-            ('New York', 'America/New_York', 40.7128, -74.0060),
-            ('Los Angeles', 'America/Los_Angeles', 34.0522, -118.2437),
-            ('Chicago', 'America/Chicago', 41.8781, -87.6298),
-            ('Houston', 'America/Chicago', 29.7604, -95.3698),
-            ('Phoenix', 'America/Phoenix', 33.4484, -112.0740),
-            ('Philadelphia', 'America/New_York', 39.9526, -75.1652),
-            ('San Antonio', 'America/Chicago', 29.4241, -98.4936),
-            ('San Diego', 'America/Los_Angeles', 32.7157, -117.1611),
-            ('Dallas', 'America/Chicago', 32.7767, -96.7970),
-            ('San Jose', 'America/Los_Angeles', 37.3382, -121.8863)
-        ]
+    def office_count(self):
+        """Number of offices for the configured scale factor"""
+        return max(1, round(BASE_OFFICE_COUNT * self.scale_factor))
+    
+    def insert_rows(self, table, batches):
+        """Insert (partition, column batch) pairs from an iterable with the configured loader.
         
-        for i in range(count):
-            city_data = cities[i % len(cities)]
-            office = (
-                f"{city_data[0]} Office",
-                city_data[1],
-                city_data[2] + random.uniform(-0.1, 0.1),
-                city_data[3] + random.uniform(-0.1, 0.1)
-            )
-            offices.append(office)
-        
-        query = "INSERT INTO offices (name, tz, latitude, longitude) VALUES (%s, %s, %s, %s)"
-        self.cursor.executemany(query, offices)
-        self.connection.commit()
+        Batches are consumed one at a time, so peak memory is independent of how
+        many rows the iterable produces. Partitions a resumed run already
+        finished come as None and are skipped. Returns the number of rows inserted.
+        """
+        count = 0
+        for partition, batch in batches:
+            if batch is not None:
+                with self.checkpointed(table, partition, {table: id_range(batch[0])}):
+                    count += self.write_batch(table, batch)
+        return count
+    
+    def single_partition(self, table, batch):
+        """The (partition, batch) pairs of a table written in one piece"""
+        return [(0, None if self.partition_done(table, 0) else batch)]
+    
+    def partition_done(self, table, partition):
+        return self.checkpoint is not None and self.checkpoint.is_done(table, partition)
+    
+    @contextlib.contextmanager
+    def checkpointed(self, table, partition, ranges):
+        """Record a partition's id ranges before writing it, and mark it done once committed.
         
-        # Get the actual IDs that were inserted
-        self.cursor.execute("SELECT id FROM offices ORDER BY id")
-        office_ids = [row[0] for row in self.cursor.fetchall()]
-        print(f"Generated {count} offices")
-        return min(office_ids), max(office_ids)
+        With writer threads the partition is marked by the writer that commits
+        its last transaction, so generation does not wait for the inserts.
+        """
+        if self.checkpoint is None:
+            yield
+            return
+        self.checkpoint.start(table, partition, partition_seed(self.seed, table, partition), ranges)
+        yield
+        self.sink.when_written(functools.partial(self.checkpoint.finish, table, partition))
     
-    def generate_teams(self, office_start_id, office_end_id, teams_per_office=3):
-        """Generate team records"""
-        teams = []
-        team_names = ['Sales Team', 'Service Team', 'Installation Team', 'Admin Team', 'Support Team']
+    def write_batch(self, table, batch):
+        """Hand one column batch to the sink and record its write throughput"""
+        with self.profiler.measure(table, 'write'):
+            count = self.sink.write(table, batch)
+        if self.snapshot_writer is not None:
+            with self.profiler.measure(table, 'snapshot'):
+                self.snapshot_writer.write(table, batch)
+        self.profiler.count_rows(table, count)
+        return count
+    
+    def print_generated(self, table, count, verb='Generated'):
+        """Report rows generated for a table and the rate the loader wrote them at"""
+        self.profiler.finish_table(table)
+        elapsed = self.profiler.seconds(table, 'write')
+        rate = count / elapsed if elapsed else 0
+        print(f"{verb} {count} {table.replace('_', ' ')} ({rate:,.0f} rows/sec via {self.sink.label})")
+    
+    def read_next_ids(self):
+        """Start an IdAllocator after the highest existing id of every generated table"""
+        return IdAllocator(self.sink.next_ids(TABLE_COLUMNS))
+    
+    def partition_batches(self, table, partitions):
+        """Yield (partition, column batch) for every partition's builder args, in partition order.
         
-        for office_id in range(office_start_id, office_end_id + 1):
-            for i in range(teams_per_office):
-                team = (office_id, team_names[i % len(team_names)])
-                teams.append(team)
+        Partitions the checkpoint records as done are not generated; their batch
+        is None. With a worker pool, at most two partitions per worker are in
+        flight, so memory stays bounded even when the database is slower than generation.
+        """
+        tasks = ((index, (table, self.seed, self.now, index, args)) for index, args in enumerate(partitions))
         
-        query = "INSERT INTO teams (office_id, name) VALUES (%s, %s)"
-        self.cursor.executemany(query, teams)
-        self.connection.commit()
+        if self.pool is None:
+            for index, task in tasks:
+                if self.partition_done(table, index):
+                    yield index, None
+                    continue
+                with self.profiler.measure(table, 'generate'):
+                    batch = generate_partition(task)
+                yield index, batch
+        else:
+            def collect():
+                index, result = pending.popleft()
+                if result is None:
+                    return index, None
+                with self.profiler.measure(table, 'generate'):
+                    return index, result.get()
+            
+            pending = deque()
+            for index, task in tasks:
+                done = self.partition_done(table, index)
+                pending.append((index, None if done else self.pool.apply_async(generate_partition, (task,))))
+                if len(pending) >= self.workers * 2:
+                    yield collect()
+            while pending:
+                yield collect()
+        self.profiler.snapshot(table)
+    
+    def activity_counts(self, per_office, office_count, minimum=0):
+        """Per-office row counts: `per_office` each, or the same total spread by office activity.
+        
+        Under a skewed profile every office still gets `minimum` rows.
+        """
+        weights = office_activity(self.skew, self.seed, office_count)
+        if weights is None:
+            return per_office
+        return minimum + apportion(max(per_office - minimum, 0) * office_count, weights)
+    
+    def office_blocks(self, office_count):
+        """Split office positions into partition slices"""
+        for start in range(0, office_count, OFFICES_PER_PARTITION):
+            yield slice(start, start + OFFICES_PER_PARTITION)
+    
+    def row_blocks(self, rows, per_office):
+        """Split a table's per-office rows into partitions no larger than a uniform one.
+        
+        Whole offices are packed, at most OFFICES_PER_PARTITION of them and
+        OFFICES_PER_PARTITION * per_office rows per partition; an office with
+        more rows than that (a busy one under a skewed profile) is spread over
+        partitions of its own. Yields (office slice, starts, counts, first_rows);
+        first_rows is None for whole offices.
+        """
+        budget = OFFICES_PER_PARTITION * per_office
+        counts = rows.counts.tolist()
+        start = 0
+        while start < len(counts):
+            block = slice(start, start + 1)
+            if counts[start] > budget:
+                for first in range(0, counts[start], budget):
+                    yield (block, rows.starts[block], np.array([min(budget, counts[start] - first)]),
+                           np.array([first]))
+                start += 1
+                continue
+            stop, total = start, 0
+            while stop < len(counts) and stop - start < OFFICES_PER_PARTITION and total + counts[stop] <= budget:
+                total += counts[stop]
+                stop += 1
+            block = slice(start, stop)
+            yield block, rows.starts[block], rows.counts[block], None
+            start = stop
+    
+    def generate_offices(self, count=BASE_OFFICE_COUNT):
+        """Generate office records"""
+        start = self.ids.allocate('offices', count)
+        office_ids = np.arange(start, start + count)
+        partitions = (
+            (office_ids[block], np.arange(count)[block])
+            for block in self.office_blocks(count)
+        )
+        
+        count = self.insert_rows('offices', self.partition_batches('offices', partitions))
+        self.print_generated('offices', count)
+        return OfficeKeyIndex(office_ids, office_ids, np.ones(count, dtype=np.int64))
+    
+    def generate_teams(self, offices, teams_per_office=TEAMS_PER_OFFICE):
+        """Generate team records"""
+        teams = self.ids.allocate_per_office('teams', offices.office_ids, teams_per_office)
+        partitions = (
+            (offices.office_ids[block], *teams.block(block))
+            for block in self.office_blocks(len(offices))
+        )
         
-        # Get the actual IDs that were inserted
-        self.cursor.execute("SELECT id FROM teams ORDER BY id")
-        team_ids = [row[0] for row in self.cursor.fetchall()]
-        print(f"Generated {len(teams)} teams")
-        return min(team_ids), max(team_ids)
+        count = self.insert_rows('teams', self.partition_batches('teams', partitions))
+        self.print_generated('teams', count)
+        return teams
     
-    def generate_users(self, office_start_id, office_end_id, team_start_id, team_end_id, users_per_office=10):
+    def generate_users(self, offices, teams, users_per_office=USERS_PER_OFFICE):
         """Generate user records"""
-        users = []
-        roles = ['admin', 'manager', 'rep', 'tech']
-        role_weights = [0.1, 0.2, 0.4, 0.3]  # Distribution of roles
-        
-        for office_id in range(office_start_id, office_end_id + 1):
-            # Calculate team range for this office
-            teams_per_office = 3
-            office_index = office_id - office_start_id
-            office_team_start = team_start_id + (office_index * teams_per_office)
-            office_team_end = office_team_start + teams_per_office - 1
-            
-            for i in range(users_per_office):
-                role = random.choices(roles, weights=role_weights)[0]
-                team_id = random.randint(office_team_start, office_team_end) if random.random() > 0.2 else None
-                
-                user = (
-                    office_id,
-                    team_id,
-                    role,
-                    fake.name(),
-                    fake.email(),
-                    1 if random.random() > 0.1 else 0  # 90% active users
-                )
-                users.append(user)
-        
-        query = "INSERT INTO users (office_id, team_id, role, full_name, email, active) VALUES (%s, %s, %s, %s, %s, %s)"
-        self.cursor.executemany(query, users)
-        self.connection.commit()
+        users = self.ids.allocate_per_office('users', offices.office_ids,
+                                             self.activity_counts(users_per_office, len(offices), minimum=1))
+        partitions = (
+            (offices.office_ids[block], starts, counts, *teams.block(block), first_rows)
+            for block, starts, counts, first_rows in self.row_blocks(users, users_per_office)
+        )
         
-        # Get the actual IDs that were inserted
-        self.cursor.execute("SELECT id FROM users ORDER BY id")
-        user_ids = [row[0] for row in self.cursor.fetchall()]
-        print(f"Generated {len(users)} users")
-        return min(user_ids), max(user_ids)
+        count = self.insert_rows('users', self.partition_batches('users', partitions))
+        self.print_generated('users', count)
+        return users
     
     def generate_referral_sources(self):
         """Generate referral source records"""
@@ -341,169 +3044,669 @@ class MockDataGenerator:
             ('Referral Program', 'partner')
         ]
         
-        query = "INSERT INTO referral_sources (name, channel) VALUES (%s, %s)"
-        self.cursor.executemany(query, sources)
-        self.connection.commit()
-        print(f"Generated {len(sources)} referral sources")
-        return 1, len(sources)
+        start = self.ids.allocate('referral_sources', len(sources))
+        ids = list(range(start, start + len(sources)))
+        count = self.insert_rows('referral_sources',
+                                 self.single_partition('referral_sources', [ids, *zip(*sources)]))
+        self.print_generated('referral_sources', count)
+        return ids[0], ids[-1]
     
-    def generate_customers(self, office_start_id, office_end_id, customers_per_office=50):
+    def generate_customers(self, offices, customers_per_office=CUSTOMERS_PER_OFFICE):
         """Generate customer records"""
-        customers = []
-        
-        for office_id in range(office_start_id, office_end_id + 1):
-            for i in range(customers_per_office):
-                created_at = fake.date_time_between(start_date='-2y', end_date='now')
-                
-                customer = (
-                    office_id,
-                    fake.name(),
-                    fake.email() if random.random() > 0.2 else None,
-                    fake.phone_number() if random.random() > 0.1 else None,
-                    fake.street_address(),
-                    fake.city(),
-                    fake.state_abbr(),
-                    fake.postcode(),
-                    fake.latitude(),
-                    fake.longitude(),
-                    created_at
-                )
-                customers.append(customer)
-        
-        query = """INSERT INTO customers 
-                   (office_id, full_name, email, phone, address1, city, state, postal_code, latitude, longitude, created_at) 
-                   VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"""
-        self.cursor.executemany(query, customers)
-        self.connection.commit()
+        customers = self.ids.allocate_per_office('customers', offices.office_ids,
+                                                 self.activity_counts(customers_per_office, len(offices), minimum=1))
+        partitions = (
+            (offices.office_ids[block], starts, counts, self.skew, first_rows)
+            for block, starts, counts, first_rows in self.row_blocks(customers, customers_per_office)
+        )
         
-        # Get the actual IDs that were inserted
-        self.cursor.execute("SELECT id FROM customers ORDER BY id")
-        customer_ids = [row[0] for row in self.cursor.fetchall()]
-        print(f"Generated {len(customers)} customers")
-        return min(customer_ids), max(customer_ids)
+        count = self.insert_rows('customers', self.partition_batches('customers', partitions))
+        self.print_generated('customers', count)
+        return customers
     
-    def generate_leads(self, office_start_id, office_end_id, customer_start_id, customer_end_id, 
-                      referral_start_id, referral_end_id, leads_per_office=30):
+    def generate_leads(self, offices, customers, referral_start_id, referral_end_id,
+                       leads_per_office=LEADS_PER_OFFICE):
         """Generate lead records"""
-        leads = []
-        statuses = ['new', 'contacted', 'qualified', 'converted', 'lost']
-        status_weights = [0.2, 0.3, 0.2, 0.2, 0.1]
-        
-        for office_id in range(office_start_id, office_end_id + 1):
-            # Calculate customer range for this office
-            customers_per_office = 50
-            office_index = office_id - office_start_id
-            office_customer_start = customer_start_id + (office_index * customers_per_office)
-            office_customer_end = office_customer_start + customers_per_office - 1
-            
-            for i in range(leads_per_office):
-                status = random.choices(statuses, weights=status_weights)[0]
-                customer_id = random.randint(office_customer_start, office_customer_end)
-                referral_id = random.randint(referral_start_id, referral_end_id)
-                created_at = fake.date_time_between(start_date='-1y', end_date='now')
-                
-                lead = (office_id, customer_id, referral_id, status, created_at)
-                leads.append(lead)
+        leads = self.ids.allocate_per_office('leads', offices.office_ids,
+                                             self.activity_counts(leads_per_office, len(offices)))
+        partitions = (
+            (offices.office_ids[block], starts, counts, *customers.block(block),
+             referral_start_id, referral_end_id, self.skew, first_rows)
+            for block, starts, counts, first_rows in self.row_blocks(leads, leads_per_office)
+        )
         
-        query = "INSERT INTO leads (office_id, customer_id, referral_source_id, status, created_at) VALUES (%s, %s, %s, %s, %s)"
-        self.cursor.executemany(query, leads)
-        self.connection.commit()
+        count = self.insert_rows('leads', self.partition_batches('leads', partitions))
+        self.print_generated('leads', count)
+        return leads
+    
+    def generate_tax_jurisdictions(self):
+        """Generate tax jurisdiction records"""
+        start = self.ids.allocate('tax_jurisdictions', len(TAX_JURISDICTIONS))
+        ids = list(range(start, start + len(TAX_JURISDICTIONS)))
+        count = self.insert_rows('tax_jurisdictions',
+                                 self.single_partition('tax_jurisdictions', [ids, *zip(*TAX_JURISDICTIONS)]))
+        self.print_generated('tax_jurisdictions', count)
+        return ids[0], ids[-1]
+    
+    def rebase_fact_batch(self, table, batch, bases):
+        """Turn partition-local ids of a derived fact batch into allocated primary keys.
         
-        # Get the actual IDs that were inserted
-        self.cursor.execute("SELECT id FROM leads ORDER BY id")
-        lead_ids = [row[0] for row in self.cursor.fetchall()]
-        print(f"Generated {len(leads)} leads")
-        return min(lead_ids), max(lead_ids)
-    
-    def generate_jobs(self, office_start_id, office_end_id, customer_start_id, customer_end_id, 
-                     user_start_id, user_end_id, jobs_per_office=40):
-        """Generate job records"""
-        jobs = []
-        statuses = ['estimate', 'scheduled', 'in_progress', 'completed', 'closed_won', 'closed_lost', 'cancelled']
-        status_weights = [0.15, 0.15, 0.1, 0.2, 0.25, 0.1, 0.05]
-        job_types = ['residential', 'commercial', 'emergency', 'maintenance']
-        
-        for office_id in range(office_start_id, office_end_id + 1):
-            # Calculate ranges for this office
-            customers_per_office = 50
-            users_per_office = 10
-            office_index = office_id - office_start_id
-            
-            office_customer_start = customer_start_id + (office_index * customers_per_office)
-            office_customer_end = office_customer_start + customers_per_office - 1
-            office_user_start = user_start_id + (office_index * users_per_office)
-            office_user_end = office_user_start + users_per_office - 1
+        `bases` maps each table already written for this partition to its first id.
+        """
+        n = len(batch[0])
+        bases[table] = self.ids.allocate(table, n)
+        columns = TABLE_COLUMNS[table]
+        batch[0] = batch[0] + bases[table]
+        for column, parent in PARTITION_LOCAL_KEYS.get(table, {}).items():
+            position = columns.index(column)
+            batch[position] = batch[position] + bases[parent]
+        return batch
+    
+    def generate_jobs(self, offices, customers, users, tax_start_id, tax_end_id, jobs_per_office=JOBS_PER_OFFICE):
+        """Generate job records and stream the fact tables derived from them.
+        
+        Each job partition is written parent-first with its appointments,
+        invoices, line items, payments and commissions before the next one is built.
+        """
+        jobs = self.ids.allocate_per_office('jobs', offices.office_ids,
+                                            self.activity_counts(jobs_per_office, len(offices)))
+        if ((jobs.counts > 0) & (customers.counts == 0)).any():
+            raise ValueError("Every office with jobs needs at least one customer (jobs.customer_id is NOT NULL)")
+        partitions = (
+            (offices.office_ids[block], starts, counts, *customers.block(block), *users.block(block),
+             tax_start_id, tax_end_id, self.skew, first_rows)
+            for block, starts, counts, first_rows in self.row_blocks(jobs, jobs_per_office)
+        )
+        
+        counts = dict.fromkeys(JOB_FACT_TABLES, 0)
+        for partition, batches in self.partition_batches('jobs', partitions):
+            if batches is None:
+                self.skip_fact_partition(partition)
+                continue
+            bases = {}
+            for table in JOB_FACT_TABLES[1:]:
+                with self.profiler.measure(table, 'generate'):
+                    batches[table] = self.rebase_fact_batch(table, batches[table], bases)
+            ranges = {'jobs': id_range(batches['jobs'][0])}
+            ranges.update((table, [bases[table], bases[table] + batch_length(batches[table])])
+                          for table in JOB_FACT_TABLES[1:])
             
-            for i in range(jobs_per_office):
-                status = random.choices(statuses, weights=status_weights)[0]
-                job_type = random.choice(job_types)
-                customer_id = random.randint(office_customer_start, office_customer_end)
-                sales_rep_id = random.randint(office_user_start, office_user_end)
-                
-                created_at = fake.date_time_between(start_date='-18m', end_date='now')
-                job_number = f"JOB-{office_id}-{i+1:04d}"
-                
-                # Generate contract amount based on job type
-                if job_type == 'residential':
-                    amount = random.uniform(500, 15000)
-                elif job_type == 'commercial':
-                    amount = random.uniform(2000, 50000)
-                elif job_type == 'emergency':
-                    amount = random.uniform(200, 8000)
-                else:  # maintenance
-                    amount = random.uniform(100, 3000)
-                
-                scheduled_start = None
-                scheduled_end = None
-                closed_at = None
-                
-                if status in ['scheduled', 'in_progress', 'completed', 'closed_won']:
-                    scheduled_start = created_at + timedelta(days=random.randint(1, 30))
-                    scheduled_end = scheduled_start + timedelta(hours=random.randint(2, 48))
-                    
-                    if status in ['completed', 'closed_won']:
-                        closed_at = scheduled_end + timedelta(days=random.randint(0, 7))
-                elif status in ['closed_lost', 'cancelled']:
-                    closed_at = created_at + timedelta(days=random.randint(1, 60))
-                
-                job = (
-                    office_id, customer_id, sales_rep_id, job_number, status, 
-                    job_type, amount, created_at, scheduled_start, scheduled_end, closed_at
-                )
-                jobs.append(job)
-        
-        query = """INSERT INTO jobs 
-                   (office_id, customer_id, sales_rep_user_id, job_number, status, job_type, 
-                    total_contract_amount, created_at, scheduled_start, scheduled_end, closed_at) 
-                   VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"""
-        self.cursor.executemany(query, jobs)
-        self.connection.commit()
+            with self.checkpointed('jobs', partition, ranges):
+                for table in JOB_FACT_TABLES:
+                    counts[table] += self.write_batch(table, batches[table])
+                    if table == 'jobs' and self.rollups:
+                        with self.profiler.measure(table, 'rollup'):
+                            self.update_rollups(batches[table])
+                            self.sink.commit()
         
-        # Get the actual IDs that were inserted
-        self.cursor.execute("SELECT id FROM jobs ORDER BY id")
-        job_ids = [row[0] for row in self.cursor.fetchall()]
-        print(f"Generated {len(jobs)} jobs")
-        return min(job_ids), max(job_ids)
+        for table in JOB_FACT_TABLES:
+            self.print_generated(table, counts[table])
+        return jobs
     
-    def generate_all_mock_data(self):
-        """Generate all mock data in proper order"""
-        print("Starting mock data generation...")
+    def skip_fact_partition(self, partition):
+        """Reserve the fact-table ids a finished jobs partition wrote, so later partitions keep theirs"""
+        ranges = self.checkpoint.entry('jobs', partition)['ids']
+        for table in JOB_FACT_TABLES[1:]:
+            first, stop = ranges[table]
+            if self.ids.allocate(table, stop - first) != first:
+                raise RuntimeError(f"Checkpoint {self.checkpoint.path} does not match this run ({table} ids differ)")
+    
+    def run_settings(self):
+        """Settings that determine the generated rows; a resumed run must reuse them"""
+        return {
+            'scale_factor': self.scale_factor,
+            'seed': self.seed,
+            'as_of': self.now.isoformat(),
+            'locale': self.locale,
+            'skew_profile': self.skew_profile,
+            'rollups': self.rollups,
+            'defer_indexes': self.defer_indexes,
+            'index_profile': self.index_profile,
+        }
+    
+    def start_ids(self):
+        """Start the IdAllocator, from the checkpoint when resuming.
+        
+        Rows of partitions the interrupted run started but did not finish are
+        deleted (children first), so those partitions can be written again.
+        """
+        if self.checkpoint is None or not self.checkpoint.next_ids:
+            self.ids = self.read_next_ids()
+            if self.checkpoint is not None:
+                self.checkpoint.begin(self.run_settings(), self.ids.next_ids)
+            return False
+        
+        self.ids = IdAllocator(self.checkpoint.next_ids)
+        unfinished = self.checkpoint.take_unfinished()
+        order = list(TABLE_COLUMNS)
+        ranges = sorted(((table, ids) for entry in unfinished.values()
+                         for table, ids in entry['ids'].items() if ids),
+                        key=lambda item: order.index(item[0]), reverse=True)
+        # With several writers, committed children may reference rows of an unfinished
+        # parent partition; writing that partition again restores the same ids
+        self.sink.execute("SET FOREIGN_KEY_CHECKS = 0")
+        for table, (first, stop) in ranges:
+            self.sink.execute(f"DELETE FROM {table} WHERE id >= {first} AND id < {stop}")
+        self.sink.execute("SET FOREIGN_KEY_CHECKS = 1")
+        self.sink.commit()
+        self.checkpoint.save()
+        
+        done = sum(entry['status'] == 'done' for entry in self.checkpoint.partitions.values())
+        print(f"Resuming from {self.checkpoint.path}: {done} partitions already loaded"
+              + (f", discarded the partial rows of {', '.join(sorted(unfinished))}" if unfinished else ""))
+        # Rollup increments of a partial jobs partition may have been committed; recompute its months
+        return self.rollups and any(key.startswith('jobs/') for key in unfinished)
+    
+    def snapshot_identity(self):
+        """Everything the generated rows depend on, plus the DDL of the schema they load into"""
+        return {
+            'generator_version': GENERATOR_VERSION,
+            'value_pool_format': VALUE_POOL_FORMAT,
+            'scale_factor': self.scale_factor,
+            'seed': self.seed,
+            'as_of': self.now.isoformat(),
+            'locale': self.locale,
+            'skew': self.skew,
+            'schema': [create_table_sql(table, index_profile=self.index_profile, months=self.partition_months)
+                       for table in TABLE_SCHEMAS],
+        }
+    
+    def restore_snapshot(self, key, entry):
+        """Load a cached snapshot into the sink instead of generating; returns whether rollups need a refresh"""
+        next_ids = self.sink.next_ids(TABLE_COLUMNS)
+        if any(next_id != 1 for next_id in next_ids.values()):
+            raise RuntimeError("Restoring a cached snapshot needs empty tables; add --clear-data")
+        # A restore has no partitions to resume from; a failed one is rerun with --clear-data
+        if self.checkpoint is not None:
+            self.checkpoint.discard()
+            self.checkpoint = None
+        print(f"Restoring snapshot {key} from {self.snapshots.cache_dir}...")
+        # Tables are listed in the order they were generated, parents first
+        for table, manifest in entry['tables'].items():
+            with self.profiler.measure(table, 'write'):
+                self.sink.restore_table(table, self.snapshots.part_paths(key, entry, table), manifest['rows'])
+            self.profiler.count_rows(table, manifest['rows'])
+            self.print_generated(table, manifest['rows'], verb='Restored')
+        if not self.rollups:
+            return False
+        # Rebuild the rollups from the restored jobs, through the dirty-month refresh
+        self.sink.execute(
+            "INSERT INTO rollup_dirty_months (period_month, marked_at) "
+            "SELECT DISTINCT DATE_FORMAT(COALESCE(closed_at, created_at), '%Y-%m-01'), NOW(6) FROM jobs "
+            "ON DUPLICATE KEY UPDATE marked_at = VALUES(marked_at)")
+        self.sink.commit()
+        return True
+    
+    def generate_tables(self):
+        """Generate every table in dependency order; returns whether rollups need a refresh"""
+        # Primary keys are assigned here, so no stage has to read ids back
+        rollups_stale = self.start_ids()
+        if self.snapshot_writer is not None and any(next_id != 1 for next_id in self.ids.next_ids.values()):
+            print("Not caching a snapshot: the tables already had rows")
+            self.snapshots.discard(self.snapshot_writer)
+            self.snapshot_writer = None
         
         # Generate base entities
-        office_start, office_end = self.generate_offices(5)
-        team_start, team_end = self.generate_teams(office_start, office_end)
-        user_start, user_end = self.generate_users(office_start, office_end, team_start, team_end)
+        offices = self.generate_offices(self.office_count())
+        teams = self.generate_teams(offices)
+        users = self.generate_users(offices, teams)
         referral_start, referral_end = self.generate_referral_sources()
+        tax_start, tax_end = self.generate_tax_jurisdictions()
         
         # Generate customer-related data
-        customer_start, customer_end = self.generate_customers(office_start, office_end)
-        lead_start, lead_end = self.generate_leads(office_start, office_end, customer_start, customer_end, 
-                                                  referral_start, referral_end)
-        job_start, job_end = self.generate_jobs(office_start, office_end, customer_start, customer_end, 
-                                               user_start, user_end)
+        customers = self.generate_customers(offices)
+        self.generate_leads(offices, customers, referral_start, referral_end)
+        self.generate_jobs(offices, customers, users, tax_start, tax_end)
+        return rollups_stale
+    
+    def validate(self, distributions=True):
+        """Check the loaded tables with a DatasetValidator; raises RuntimeError on problems"""
+        start = time.perf_counter()
+        problems = DatasetValidator(self.sink, distributions=distributions).run()
+        self.profiler.stages['validate'] = time.perf_counter() - start
+        if problems:
+            raise RuntimeError(f"validation found {len(problems)} problems")
+    
+    def create_rollups(self):
+        """Create the rollup tables, their views and the jobs index the refresh reads through"""
+        for statement in ROLLUP_TABLES.values():
+            self.sink.execute(statement)
+        for name, query in ROLLUP_VIEWS.items():
+            self.sink.execute(f"CREATE OR REPLACE VIEW {name} AS {textwrap.dedent(query).strip()}")
+        # A deferred-index load builds it with the other indexes after the data is in
+        if self.sink.can_query and not self.defer_indexes:
+            name, columns = ROLLUP_SOURCE_INDEX
+            if not self.sink.fetchall(
+                    "SELECT 1 FROM information_schema.STATISTICS WHERE TABLE_SCHEMA = DATABASE() "
+                    f"AND TABLE_NAME = 'jobs' AND INDEX_NAME = {sql_literal(name)}"):
+                self.sink.execute(f"ALTER TABLE jobs ADD KEY {name} ({', '.join(columns)})")
+        self.sink.commit()
+    
+    def update_rollups(self, batch):
+        """Add a jobs batch to the rollups and mark its months for the next refresh (the caller commits)"""
+        sales_rows, company_rows, months = job_rollups(batch)
+        if not months:
+            return
+        values = lambda rows: ", ".join("(" + ", ".join(map(sql_literal, row)) + ")" for row in rows)
+        self.sink.execute(
+            "INSERT INTO rollup_sales_performance (office_id, rep_user_id, period_month, won_amount, jobs_count) "
+            f"VALUES {values(sales_rows)} ON DUPLICATE KEY UPDATE "
+            "won_amount = won_amount + VALUES(won_amount), jobs_count = jobs_count + VALUES(jobs_count)")
+        self.sink.execute(
+            "INSERT INTO rollup_company_performance (office_id, period_month, revenue_won, lost_jobs, won_jobs) "
+            f"VALUES {values(company_rows)} ON DUPLICATE KEY UPDATE "
+            "revenue_won = revenue_won + VALUES(revenue_won), lost_jobs = lost_jobs + VALUES(lost_jobs), "
+            "won_jobs = won_jobs + VALUES(won_jobs)")
+        self.mark_dirty_months(months)
+    
+    def mark_dirty_months(self, months):
+        """Record months whose rollup rows the next --refresh-rollups must recompute"""
+        self.sink.execute(
+            "INSERT INTO rollup_dirty_months (period_month, marked_at) VALUES "
+            + ", ".join(f"({sql_literal(month)}, NOW(6))" for month in months)
+            + " ON DUPLICATE KEY UPDATE marked_at = VALUES(marked_at)")
+    
+    def refresh_rollups(self):
+        """Recompute the rollup rows of every month marked dirty since the last refresh.
+        
+        Runs as one transaction, so dashboards see either the old or the new
+        rollups. Months marked again while the refresh runs stay dirty.
+        """
+        self.create_rollups()
+        start = time.perf_counter()
+        self.sink.execute("SET @refresh_started = NOW(6)")
+        months = [month for month, in self.sink.fetchall(
+            "SELECT period_month FROM rollup_dirty_months ORDER BY period_month")]
+        if not months:
+            print("Rollups are up to date")
+            return
+        
+        listed = ", ".join(sql_literal(f"{month:%Y-%m-01}") for month in months)
+        for table, query in ROLLUP_REFRESH.items():
+            self.sink.execute(f"DELETE FROM {table} WHERE period_month IN ({listed})")
+            self.sink.execute(query.format(window=rollup_window(months)))
+        self.sink.execute(f"DELETE FROM rollup_dirty_months WHERE period_month IN ({listed}) "
+                          "AND marked_at <= @refresh_started")
+        self.sink.commit()
+        print(f"Refreshed rollups for {len(months)} months ({months[0]:%Y-%m} to {months[-1]:%Y-%m}) "
+              f"in {time.perf_counter() - start:.1f}s")
+    
+    def generate_all_mock_data(self):
+        """Generate all mock data in proper order"""
+        if self.checkpoint is not None and self.checkpoint.complete:
+            print(f"Nothing to resume: the run in {self.checkpoint.path} already completed")
+            return
+        print(f"Starting mock data generation (scale factor {self.scale_factor}, "
+              f"seed {self.seed}, {self.workers} worker(s))...")
+        
+        # A resumed run writes only part of the dataset, so it neither uses nor fills the cache
+        snapshot = None
+        if self.snapshots is not None and not (self.checkpoint is not None and self.checkpoint.next_ids):
+            identity = self.snapshot_identity()
+            key = hashlib.sha256(json.dumps(identity, sort_keys=True).encode()).hexdigest()[:32]
+            snapshot = self.snapshots.lookup(key)
+            if snapshot is None:
+                print(f"Snapshot {key} is not cached; generating and caching it")
+                self.snapshot_writer = self.snapshots.writer(key)
+        
+        if snapshot is None:
+            pool_args = (self.pool_cache_dir, self.locale, self.seed)
+            load_value_pools(*pool_args)
+            if self.workers > 1:
+                self.pool = multiprocessing.Pool(self.workers, initializer=load_value_pools, initargs=pool_args)
+        if self.defer_indexes:
+            self.drop_indexes()
+        elif self.index_profile != 'none':
+            self.add_missing_profile_indexes()
+        
+        if self.rollups:
+            self.create_rollups()
+        
+        load_start = time.perf_counter()
+        self.profiler.start()
+        try:
+            if snapshot is not None:
+                rollups_stale = self.restore_snapshot(key, snapshot)
+            else:
+                rollups_stale = self.generate_tables()
+            flush_start = time.perf_counter()
+            self.sink.flush()
+            if self.snapshot_writer is not None:
+                self.snapshots.store(key, self.snapshot_writer, identity)
+                self.snapshot_writer = None
+        finally:
+            if self.pool is not None:
+                self.pool.terminate()
+                self.pool.join()
+                self.pool = None
+            if self.snapshot_writer is not None:
+                self.snapshots.discard(self.snapshot_writer)
+                self.snapshot_writer = None
+        load_seconds = time.perf_counter() - load_start
+        self.profiler.stages.update(flush=time.perf_counter() - flush_start, load=load_seconds)
         
+        total_rows = self.profiler.total_rows()
+        total_time = sum(self.profiler.seconds(table, 'write') for table in self.profiler.tables)
+        print(f"Loaded {total_rows} rows in {total_time:.1f}s "
+              f"({total_rows / total_time if total_time else 0:,.0f} rows/sec via {self.sink.label})")
+        if self.defer_indexes:
+            index_seconds = self.build_indexes()
+            self.profiler.stages['index_build'] = index_seconds
+            print(f"Load phase: {load_seconds:.1f}s, index build: {index_seconds:.1f}s "
+                  f"(total {load_seconds + index_seconds:.1f}s)")
+        else:
+            print(f"Load phase (indexes maintained during load): {load_seconds:.1f}s")
+        if rollups_stale:
+            self.refresh_rollups()
+        if self.checkpoint is not None:
+            self.checkpoint.complete = True
+            self.checkpoint.save()
         print("Mock data generation completed successfully!")
 
+
+class LiveIngest:
+    """Continues an existing dataset forward in time as a steady write stream (--append).
+    
+    Every transaction mixes new leads and jobs with status transitions and
+    closures of open ones, following LEAD_TRANSITIONS / JOB_TRANSITIONS. The
+    simulated clock starts at the latest created_at and advances time_scale
+    seconds per wall-clock second.
+    """
+    
+    def __init__(self, generator, rate=DEFAULT_INGEST_RATE, duration=None,
+                 rows_per_transaction=DEFAULT_ROWS_PER_TRANSACTION, time_scale=1.0):
+        self.generator = generator
+        self.sink = generator.sink
+        self.rate = rate
+        self.duration = duration
+        self.rows_per_transaction = rows_per_transaction
+        self.time_scale = time_scale
+        self.lead_weights = transition_weights(LEAD_TRANSITIONS, LEAD_STATUSES, LEAD_STATUS_WEIGHTS)
+        self.job_weights = transition_weights(JOB_TRANSITIONS, JOB_STATUSES, JOB_STATUS_WEIGHTS)
+    
+    def load_state(self):
+        """Read max ids, latest created_at, and the customers and users of every office"""
+        latest = [self.sink.fetchall(f"SELECT MAX(created_at) FROM {table}")[0][0] for table in ('leads', 'jobs')]
+        latest = [value for value in latest if value is not None]
+        if not latest:
+            raise RuntimeError("Append mode continues an existing dataset; generate one first")
+        self.clock_start = max(latest)
+        self.generator.ids = self.generator.read_next_ids()
+        
+        self.office_ids = np.array([row[0] for row in self.sink.fetchall("SELECT id FROM offices ORDER BY id")],
+                                   dtype=np.int64)
+        self.office_weights = office_activity(self.generator.skew, self.generator.seed, len(self.office_ids))
+        for table in ('customers', 'users'):
+            rows = np.array(self.sink.fetchall(f"SELECT office_id, id FROM {table} ORDER BY office_id, id"),
+                            dtype=np.int64).reshape(-1, 2)
+            setattr(self, table, group_by_office(self.office_ids, rows[:, 0], rows[:, 1]))
+        self.referral_range = self.sink.fetchall("SELECT MIN(id), MAX(id) FROM referral_sources")[0]
+        self.job_numbers = dict(self.sink.fetchall("SELECT office_id, COUNT(*) FROM jobs GROUP BY office_id"))
+    
+    def clock(self, elapsed):
+        return self.clock_start + timedelta(seconds=elapsed * self.time_scale)
+    
+    def created_at(self, rng, clock, n):
+        """Timestamps spread over the simulated span of one transaction"""
+        span = max(1, int(self.rows_per_transaction / self.rate * self.time_scale))
+        return np.datetime64(clock, 's') + seconds(rng.integers(0, span, n))
+    
+    def office_counts(self, rng, count, eligible):
+        """Spread `count` new rows over the eligible offices, by office activity under a skew profile"""
+        choices = np.flatnonzero(eligible)
+        weights = None
+        if self.office_weights is not None:
+            weights = self.office_weights[choices] / self.office_weights[choices].sum()
+        return np.bincount(rng.choice(choices, size=count, p=weights), minlength=len(self.office_ids))
+    
+    def new_leads(self, rng, clock, count):
+        """INSERT new leads; built like a full load, then started as 'new' at the clock"""
+        if not count or self.referral_range[0] is None:
+            return 0
+        customer_starts, customer_counts, customer_ids = self.customers
+        leads = self.generator.ids.allocate_per_office(
+            'leads', self.office_ids, self.office_counts(rng, count, np.ones(len(self.office_ids), bool)))
+        batch = build_lead_columns(rng, clock, self.office_ids, leads.starts, leads.counts,
+                                   customer_starts, customer_counts, *self.referral_range, self.generator.skew)
+        customer = batch[2]
+        batch[2] = np.ma.array(customer_ids[np.ma.getdata(customer)], mask=np.ma.getmaskarray(customer))
+        batch[4] = np.full(count, 'new', dtype=object)
+        batch[5] = self.created_at(rng, clock, count)
+        self.sink.execute(insert_statement('leads', column_rows(batch)))
+        return count
+    
+    def new_jobs(self, rng, clock, count):
+        """INSERT new jobs; built like a full load, then started as estimates at the clock"""
+        customer_starts, customer_counts, customer_ids = self.customers
+        user_starts, user_counts, user_ids = self.users
+        if not count or not customer_counts.any():
+            return 0
+        jobs = self.generator.ids.allocate_per_office(
+            'jobs', self.office_ids, self.office_counts(rng, count, customer_counts > 0))
+        batch = build_job_columns(rng, clock, self.office_ids, jobs.starts, jobs.counts,
+                                  customer_starts, customer_counts, user_starts, user_counts, self.generator.skew)
+        columns = dict(zip(TABLE_COLUMNS['jobs'], range(len(batch))))
+        rep = batch[columns['sales_rep_user_id']]
+        batch[columns['customer_id']] = customer_ids[batch[columns['customer_id']]]
+        batch[columns['sales_rep_user_id']] = np.ma.array(user_ids[np.ma.getdata(rep)], mask=np.ma.getmaskarray(rep))
+        # Job numbers continue each office's sequence
+        job_numbers = []
+        for office_id in batch[columns['office_id']].tolist():
+            self.job_numbers[office_id] = self.job_numbers.get(office_id, 0) + 1
+            job_numbers.append(f"JOB-{office_id}-{self.job_numbers[office_id]:04d}")
+        batch[columns['job_number']] = job_numbers
+        batch[columns['status']] = np.full(count, 'estimate', dtype=object)
+        batch[columns['created_at']] = self.created_at(rng, clock, count)
+        nat = np.full(count, np.datetime64('NaT', 's'))
+        for column in ('scheduled_start', 'scheduled_end', 'closed_at'):
+            batch[columns[column]] = nat
+        self.sink.execute(insert_statement('jobs', column_rows(batch)))
+        if self.generator.rollups:
+            self.generator.update_rollups(batch)
+        return count
+    
+    def open_rows(self, rng, table, transitions, columns):
+        """A window of rows still in an open status, starting at a random id"""
+        statuses = ", ".join(map(sql_literal, transitions))
+        start_id = int(rng.integers(1, max(self.generator.ids.next_ids[table], 2)))
+        query = (f"SELECT {columns} FROM {table} WHERE id >= {{start}} AND status IN ({statuses}) "
+                 f"ORDER BY id LIMIT {INGEST_CANDIDATES}")
+        rows = self.sink.fetchall(query.format(start=start_id))
+        if len(rows) < INGEST_CANDIDATES and start_id > 1:
+            rows += self.sink.fetchall(query.format(start=1))
+        return rows
+    
+    def transition_leads(self, rng, count):
+        """Move open leads one step along LEAD_TRANSITIONS"""
+        if not count:
+            return 0
+        candidates = self.open_rows(rng, 'leads', LEAD_TRANSITIONS, "id, status")
+        picked = [candidates[i] for i in rng.permutation(len(candidates))[:count]]
+        for lead_id, status in picked:
+            successors = LEAD_TRANSITIONS[status]
+            new_status = successors[rng.choice(len(successors), p=self.lead_weights[status])]
+            self.sink.execute(f"UPDATE leads SET status = {sql_literal(new_status)} "
+                              f"WHERE id = {lead_id} AND status = {sql_literal(status)}")
+        return len(picked)
+    
+    def transition_jobs(self, rng, clock, count):
+        """Move open jobs one step along JOB_TRANSITIONS, scheduling and closing them at the clock.
+        
+        Work starts only once scheduled_start has passed and completes once
+        scheduled_end has; the schedule itself follows the full-load rules.
+        """
+        if not count:
+            return 0
+        candidates = self.open_rows(rng, 'jobs', JOB_TRANSITIONS,
+                                    "id, status, created_at, scheduled_start, scheduled_end, closed_at")
+        ready = [
+            row for row in candidates
+            if not (row[1] == 'scheduled' and row[3] is not None and row[3] > clock)
+            and not (row[1] == 'in_progress' and row[4] is not None and row[4] > clock)
+        ]
+        picked = [ready[i] for i in rng.permutation(len(ready))[:count]]
+        months = set()
+        for job_id, status, created_at, scheduled_start, scheduled_end, closed_at in picked:
+            months.add(f"{closed_at or created_at:%Y-%m-01}")
+            successors = JOB_TRANSITIONS[status]
+            new_status = successors[rng.choice(len(successors), p=self.job_weights[status])]
+            if new_status == 'scheduled':
+                scheduled_start = clock + timedelta(days=int(rng.integers(1, 30, endpoint=True)))
+                scheduled_end = scheduled_start + timedelta(hours=int(rng.integers(2, 48, endpoint=True)))
+            elif new_status in ('completed', 'closed_lost', 'cancelled'):
+                closed_at = clock
+            months.add(f"{closed_at or created_at:%Y-%m-01}")
+            self.sink.execute(
+                f"UPDATE jobs SET status = {sql_literal(new_status)}, "
+                f"scheduled_start = {sql_literal(scheduled_start)}, scheduled_end = {sql_literal(scheduled_end)}, "
+                f"closed_at = {sql_literal(closed_at)} WHERE id = {job_id} AND status = {sql_literal(status)}")
+        # Transitions move jobs between rollup rows; --refresh-rollups recomputes those months
+        if months and self.generator.rollups:
+            self.generator.mark_dirty_months(sorted(months))
+        return len(picked)
+    
+    def run(self):
+        """Write transactions of rows_per_transaction rows at `rate` rows/sec until the duration is up"""
+        self.load_state()
+        if self.generator.rollups:
+            self.generator.create_rollups()
+        rng = np.random.default_rng(partition_seed(self.generator.seed, 'append', self.clock_start.isoformat()))
+        operations = list(INGEST_MIX)
+        mix = np.array([INGEST_MIX[operation] for operation in operations])
+        mix = mix / mix.sum()
+        
+        print(f"Appending ~{self.rate:g} rows/sec in transactions of {self.rows_per_transaction} rows, "
+              f"clock starting at {self.clock_start} ({self.time_scale:g}x)"
+              + (f" for {self.duration:g}s" if self.duration else " until interrupted"))
+        counts = dict.fromkeys(operations, 0)
+        planned = transactions = 0
+        start = last_report = time.perf_counter()
+        try:
+            while self.duration is None or time.perf_counter() - start < self.duration:
+                clock = self.clock(time.perf_counter() - start)
+                slots = np.bincount(rng.choice(len(operations), size=self.rows_per_transaction, p=mix),
+                                    minlength=len(operations))
+                requested = dict(zip(operations, slots.tolist()))
+                counts['lead'] += self.new_leads(rng, clock, requested['lead'])
+                counts['job'] += self.new_jobs(rng, clock, requested['job'])
+                counts['lead_transition'] += self.transition_leads(rng, requested['lead_transition'])
+                counts['job_transition'] += self.transition_jobs(rng, clock, requested['job_transition'])
+                self.sink.commit()
+                transactions += 1
+                planned += self.rows_per_transaction
+                
+                # Pace on planned rows: the n-th row is due n / rate seconds after the start
+                delay = start + planned / self.rate - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                if time.perf_counter() - last_report >= INGEST_REPORT_SECONDS:
+                    last_report = time.perf_counter()
+                    written = sum(counts.values())
+                    print(f"Appended {written:,} rows in {transactions:,} transactions "
+                          f"({written / (last_report - start):,.0f} rows/sec, clock {clock:%Y-%m-%d %H:%M})")
+        except KeyboardInterrupt:
+            self.sink.connection.rollback()
+            print("\nStopping live ingest")
+        
+        elapsed = time.perf_counter() - start
+        written = sum(counts.values())
+        print(f"Appended {counts['lead']} leads and {counts['job']} jobs, moved {counts['lead_transition']} leads "
+              f"and {counts['job_transition']} jobs forward ({written:,} rows in {transactions:,} transactions, "
+              f"{written / elapsed if elapsed else 0:,.0f} rows/sec)")
+
+
+class ShadowReload:
+    """Blue/green reload (--reload): build the next dataset in a shadow schema, then swap it in.
+    
+    The generator loads <database>_shadow while dashboards keep reading
+    <database>. Once the shadow row counts match what was written, a single
+    multi-table RENAME TABLE moves the live tables to <database>_previous and
+    the shadow tables into <database>, so readers see either the old or the
+    new generation. The previous generation stays until the next reload, and
+    rollback() swaps it back the same way. Views are not renamed: they resolve
+    tables by name, so the live views read the new tables right away.
+    """
+    
+    def __init__(self, sink):
+        self.sink = sink  # connection to the live database
+        self.database = sink.database
+        self.shadow = f"{self.database}_shadow"
+        self.previous = f"{self.database}_previous"
+    
+    def open(self):
+        self.sink.open()
+    
+    def close(self):
+        self.sink.close()
+    
+    def tables(self, database):
+        """Generated and rollup tables present in a schema, parents first"""
+        names = {name for name, in self.sink.fetchall(
+            "SELECT TABLE_NAME FROM information_schema.TABLES "
+            f"WHERE TABLE_SCHEMA = {sql_literal(database)} AND TABLE_TYPE = 'BASE TABLE'")}
+        return [table for table in [*TABLE_SCHEMAS, *ROLLUP_TABLES] if table in names]
+    
+    def reset_schema(self, database):
+        """Recreate an empty schema with the live database's character set and collation"""
+        charset, collation = self.sink.fetchall(
+            "SELECT DEFAULT_CHARACTER_SET_NAME, DEFAULT_COLLATION_NAME FROM information_schema.SCHEMATA "
+            f"WHERE SCHEMA_NAME = {sql_literal(self.database)}")[0]
+        self.sink.execute(f"DROP DATABASE IF EXISTS `{database}`")
+        self.sink.execute(f"CREATE DATABASE `{database}` CHARACTER SET {charset} COLLATE {collation}")
+    
+    def prepare(self):
+        self.reset_schema(self.shadow)
+        print(f"Loading the next generation into {self.shadow}")
+    
+    def validate(self, expected):
+        """Check that every shadow table exists and holds the rows the generator wrote"""
+        present = self.tables(self.shadow)
+        problems = [f"{table} is missing" for table in TABLE_SCHEMAS if table not in present]
+        for table in TABLE_SCHEMAS:
+            if table in present:
+                count = self.sink.fetchall(f"SELECT COUNT(*) FROM `{self.shadow}`.{table}")[0][0]
+                if count != expected.get(table, 0):
+                    problems.append(f"{table} has {count:,} rows, expected {expected.get(table, 0):,}")
+        if problems:
+            raise RuntimeError(f"{self.shadow} failed validation, the live dataset is unchanged: "
+                               + "; ".join(problems))
+        print(f"Validated row counts of {len(TABLE_SCHEMAS)} tables in {self.shadow}")
+    
+    def swap(self, source, retired):
+        """Atomically move the live tables to `retired` and the tables of `source` into the live database"""
+        incoming = self.tables(source)
+        outgoing = self.tables(self.database)
+        self.reset_schema(retired)
+        self.sink.execute("RENAME TABLE " + ", ".join(
+            [f"`{self.database}`.{table} TO `{retired}`.{table}" for table in outgoing]
+            + [f"`{source}`.{table} TO `{self.database}`.{table}" for table in incoming]))
+        
+        # Views stay in the live database; make sure they match the tables that arrived
+        for name, query in REPORTING_VIEWS.items():
+            self.sink.execute(f"CREATE OR REPLACE VIEW {name} AS {textwrap.dedent(query).strip()}")
+        for name, query in ROLLUP_VIEWS.items():
+            if set(ROLLUP_TABLES) <= set(incoming):
+                self.sink.execute(f"CREATE OR REPLACE VIEW {name} AS {textwrap.dedent(query).strip()}")
+            else:
+                self.sink.execute(f"DROP VIEW IF EXISTS {name}")
+        self.sink.commit()
+    
+    def promote(self, expected):
+        """Validate the shadow schema and swap it in, keeping the live tables in the previous schema"""
+        self.validate(expected)
+        start = time.perf_counter()
+        self.swap(self.shadow, self.previous)
+        print(f"Swapped the new generation into {self.database} in {time.perf_counter() - start:.2f}s; "
+              f"the previous one is kept in {self.previous} (--rollback restores it)")
+    
+    def rollback(self):
+        """Swap the previous generation back in; the current one moves to the shadow schema"""
+        if not self.tables(self.previous):
+            raise RuntimeError(f"No previous generation to roll back to in {self.previous}")
+        self.swap(self.previous, self.shadow)
+        print(f"Rolled {self.database} back to the previous generation; the replaced one is in {self.shadow}")
+
+
 def main():
     parser = argparse.ArgumentParser(description='Generate mock data for Leap project')
     parser.add_argument('--host', default='localhost', help='MySQL host (default: localhost)')
@@ -511,20 +3714,236 @@ def main():
     parser.add_argument('--user', default='root', help='MySQL user (default: root)')
     parser.add_argument('--password', default='', help='MySQL password (default: empty)')
     parser.add_argument('--create-schema', action='store_true', help='Create database schema')
+    parser.add_argument('--drop-schema', action='store_true',
+                        help='Drop the existing tables before creating the schema (with --create-schema)')
     parser.add_argument('--clear-data', action='store_true', help='Clear existing data before generating')
+    parser.add_argument('--scale-factor', type=float, default=1.0,
+                        help='Multiply every table size by this factor (default: 1.0 = 5 offices)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f'Rows per insert batch and commit (default: {DEFAULT_CHUNK_SIZE})')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED,
+                        help=f'Global random seed (default: {DEFAULT_SEED})')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes for row generation; output is identical for any value (default: 1)')
+    parser.add_argument('--sink', choices=tuple(SINKS), default='mysql',
+                        help='Where rows go: a MySQL database, csv/tsv/parquet/sql files in --output-dir, '
+                             'or an embedded duckdb/sqlite database file there (default: mysql)')
+    parser.add_argument('--output-dir', default='mock_data',
+                        help='Directory for file and embedded database sinks (default: ./mock_data)')
+    parser.add_argument('--compression', default=None,
+                        help='File sink compression: none/gzip/bz2/xz for csv and sql, '
+                             'none/snappy/gzip/zstd/brotli/lz4 for parquet (default: none, parquet: snappy)')
+    parser.add_argument('--rows-per-file', type=int, default=DEFAULT_ROWS_PER_FILE,
+                        help=f'Rows per csv/parquet part file (default: {DEFAULT_ROWS_PER_FILE})')
+    parser.add_argument('--loader', choices=LOADERS, default='executemany',
+                        help='How rows are sent to MySQL: parameterized executemany or LOAD DATA LOCAL INFILE (default: executemany)')
+    parser.add_argument('--defer-indexes', action='store_true',
+                        help='Load into primary-key-only tables, then build UNIQUE keys, indexes and '
+                             'foreign keys in one ALTER TABLE per table')
+    parser.add_argument('--index-profile', choices=tuple(INDEX_PROFILES), default='none',
+                        help='Secondary index set to build (default: none; reporting = indexes for the '
+                             'GROUP BY and date filters of the reporting views)')
+    parser.add_argument('--partition-by-month', action='store_true',
+                        help='Create leads, jobs and invoices RANGE-partitioned by month (with --create-schema) '
+                             'and load them partition by partition')
+    parser.add_argument('--rollups', action='store_true',
+                        help='Maintain the rep x month and office x month rollup tables while loading jobs')
+    parser.add_argument('--refresh-rollups', action='store_true',
+                        help='Only recompute rollup months touched since the last refresh, then exit')
+    parser.add_argument('--append', action='store_true',
+                        help='Continue the existing dataset as a live write stream instead of a full load')
+    parser.add_argument('--rate', type=float, default=DEFAULT_INGEST_RATE,
+                        help=f'Append mode: rows written per second (default: {DEFAULT_INGEST_RATE})')
+    parser.add_argument('--duration', type=float, default=None,
+                        help='Append mode: seconds to run (default: until interrupted)')
+    parser.add_argument('--rows-per-transaction', type=int, default=None,
+                        help='Rows committed per transaction (default: --chunk-size; '
+                             f'{DEFAULT_ROWS_PER_TRANSACTION} in append mode)')
+    parser.add_argument('--writers', type=int, default=1,
+                        help=f'MySQL writer threads on pooled connections (default: 1, at most {MAX_WRITERS})')
+    parser.add_argument('--time-scale', type=float, default=1.0,
+                        help='Append mode: simulated seconds per wall-clock second (default: 1)')
+    parser.add_argument('--locale', default=DEFAULT_LOCALE,
+                        help=f'Faker locale for names, emails, addresses and phones (default: {DEFAULT_LOCALE})')
+    parser.add_argument('--pool-cache-dir', default=DEFAULT_POOL_CACHE_DIR,
+                        help=f'Where generated Faker value pools are cached (default: {DEFAULT_POOL_CACHE_DIR})')
+    parser.add_argument('--skew-profile', choices=tuple(SKEW_PROFILES), default='uniform',
+                        help='Activity skew and seasonality: uniform sampling, or production-like Zipf volume '
+                             'per office/rep/customer, seasonal and weekday timestamps and long-tail amounts '
+                             '(default: uniform)')
+    parser.add_argument('--as-of', type=lambda s: datetime.strptime(s, '%Y-%m-%d'), default=None,
+                        help='Date that generated timestamps lead up to, YYYY-MM-DD (default: today)')
+    parser.add_argument('--reload', action='store_true',
+                        help='Blue/green reload: generate into <database>_shadow, validate row counts, then swap '
+                             'all tables into <database> with one atomic RENAME TABLE (implies --create-schema)')
+    parser.add_argument('--rollback', action='store_true',
+                        help='Swap the generation kept in <database>_previous by the last --reload back in, then exit')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue the interrupted load recorded in the checkpoint: finished partitions are '
+                             'skipped and its generation settings (scale factor, seed, as-of, ...) are reused')
+    parser.add_argument('--checkpoint-dir', default=DEFAULT_CHECKPOINT_DIR,
+                        help=f'Where mysql loads record per-partition progress for --resume '
+                             f'(default: {DEFAULT_CHECKPOINT_DIR})')
+    parser.add_argument('--snapshot-cache', action='store_true',
+                        help='Restore the dataset from the local snapshot cache when it holds one for the same seed, '
+                             'scale, as-of date, locale and schema; otherwise generate it and cache it '
+                             '(mysql and tsv sinks)')
+    parser.add_argument('--snapshot-cache-dir', default=DEFAULT_SNAPSHOT_CACHE_DIR,
+                        help=f'Snapshot cache location (default: {DEFAULT_SNAPSHOT_CACHE_DIR})')
+    parser.add_argument('--snapshot-cache-size', type=float, default=DEFAULT_SNAPSHOT_CACHE_GB,
+                        help='Evict least recently used snapshots beyond this many GB '
+                             f'(default: {DEFAULT_SNAPSHOT_CACHE_GB})')
+    parser.add_argument('--validate', action='store_true',
+                        help='Read every table back after the load and check foreign keys, office consistency '
+                             'and status/type distributions against the configured weights (with --append only '
+                             'keys and offices); exits non-zero on problems')
+    parser.add_argument('--profile-report', metavar='PATH', default=None,
+                        help='Write per-table generate/serialize/insert/commit times, rows/sec, bytes sent '
+                             'and peak RSS of the load as JSON')
+    parser.add_argument('--cprofile', metavar='PATH', default=None,
+                        help='Run the load under cProfile, dump the stats to PATH and print the hottest functions '
+                             '(use --workers 1 to include the row builders)')
+    parser.add_argument('--tracemalloc', metavar='DIR', default=None,
+                        help='Trace allocations and dump a tracemalloc snapshot into DIR after each generated table')
     
     args = parser.parse_args()
+    if args.scale_factor <= 0:
+        parser.error('--scale-factor must be positive')
+    if args.chunk_size < 1:
+        parser.error('--chunk-size must be at least 1')
+    if args.workers < 1:
+        parser.error('--workers must be at least 1')
+    if args.rows_per_file < 1:
+        parser.error('--rows-per-file must be at least 1')
+    if not 1 <= args.writers <= MAX_WRITERS:
+        parser.error(f'--writers must be between 1 and {MAX_WRITERS}')
+    if args.rate <= 0 or args.time_scale <= 0:
+        parser.error('--rate and --time-scale must be positive')
+    if args.rows_per_transaction is not None and args.rows_per_transaction < 1:
+        parser.error('--rows-per-transaction must be at least 1')
+    if args.snapshot_cache:
+        if args.sink not in ('mysql', 'tsv'):
+            parser.error('--snapshot-cache restores into the mysql or tsv sink')
+        if args.append or args.refresh_rollups:
+            parser.error('--snapshot-cache applies to full loads')
+        if args.snapshot_cache_size <= 0:
+            parser.error('--snapshot-cache-size must be positive')
+    
+    shadow_reload = None
+    if args.reload or args.rollback:
+        if args.sink != 'mysql':
+            parser.error('--reload and --rollback swap tables of a mysql database')
+        if args.append or args.refresh_rollups or args.resume or args.clear_data or args.drop_schema:
+            parser.error('--reload always loads a fresh dataset; it cannot be combined with --append, '
+                         '--refresh-rollups, --resume, --clear-data or --drop-schema')
+        shadow_reload = ShadowReload(MySQLSink(args.host, args.database, args.user, args.password))
+        if args.rollback:
+            try:
+                shadow_reload.open()
+                shadow_reload.rollback()
+            except (Error, RuntimeError) as e:
+                print(f"Error: {e}")
+                sys.exit(1)
+            finally:
+                shadow_reload.close()
+            return
+        args.create_schema = True
+    
+    try:
+        if args.sink == 'mysql':
+            sink = MySQLSink(args.host, shadow_reload.shadow if shadow_reload else args.database,
+                             args.user, args.password,
+                             loader=args.loader, chunk_size=args.chunk_size,
+                             rows_per_transaction=args.rows_per_transaction, writers=args.writers,
+                             local_infile=args.snapshot_cache)
+        elif args.sink == 'sql':
+            sink = SqlDumpSink(args.output_dir, compression=args.compression, rows_per_statement=args.chunk_size)
+        elif issubclass(SINKS[args.sink], EmbeddedSink):
+            sink = SINKS[args.sink](args.output_dir, compression=args.compression)
+        else:
+            sink = SINKS[args.sink](args.output_dir, compression=args.compression, rows_per_file=args.rows_per_file)
+    except (ValueError, RuntimeError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    if sink.dialect != 'mysql' and (args.partition_by_month or args.rollups or args.refresh_rollups
+                                    or args.defer_indexes or args.append):
+        parser.error(f'--partition-by-month, --rollups, --refresh-rollups, --defer-indexes and --append '
+                     f'need MySQL; the {args.sink} sink loads plain tables')
+    if (args.rollups or args.refresh_rollups) and not sink.runs_sql:
+        parser.error(f'rollups need a SQL sink; the {args.sink} sink has no tables to maintain')
+    if args.drop_schema and not args.create_schema:
+        parser.error('--drop-schema only makes sense with --create-schema')
+    if args.partition_by_month:
+        if not sink.runs_sql:
+            parser.error(f'--partition-by-month needs a SQL sink; the {args.sink} sink has no tables')
+        sink = MonthSpoolSink(sink)
+    if args.writers > 1 and args.sink != 'mysql':
+        parser.error('--writers applies to the mysql sink only')
+    if args.append and not sink.can_query:
+        parser.error(f'--append continues a live database; the {args.sink} sink cannot read one')
+    if args.refresh_rollups and not sink.can_query:
+        parser.error(f'--refresh-rollups reads the database; the {args.sink} sink cannot')
+    if args.validate and not sink.can_query:
+        parser.error(f'--validate reads the loaded tables back; the {args.sink} sink cannot')
+    if args.defer_indexes and not sink.runs_sql:
+        parser.error(f'--defer-indexes needs a SQL sink; the {args.sink} sink has no indexes')
+    
+    # Full mysql loads checkpoint every partition; month spooling holds rows back until the end,
+    # and a reload rebuilds its shadow schema from scratch
+    checkpoint = None
+    checkpoint_path = os.path.join(args.checkpoint_dir, f"{args.host}-{args.database}.json")
+    if args.resume:
+        if args.sink != 'mysql' or args.partition_by_month or args.append or args.refresh_rollups:
+            parser.error('--resume continues a full mysql load without --partition-by-month')
+        if args.clear_data or args.drop_schema:
+            parser.error('--resume keeps the loaded rows; drop --clear-data and --drop-schema')
+        if not os.path.exists(checkpoint_path):
+            parser.error(f'no checkpoint to resume at {checkpoint_path}')
+        checkpoint = RunCheckpoint.load(checkpoint_path)
+        settings = checkpoint.settings
+        if not settings:
+            parser.error(f'{checkpoint_path} records no load to resume')
+        args.scale_factor, args.seed, args.locale = settings['scale_factor'], settings['seed'], settings['locale']
+        args.skew_profile = settings.get('skew_profile', 'uniform')
+        args.as_of = datetime.fromisoformat(settings['as_of'])
+        args.rollups, args.defer_indexes = settings['rollups'], settings['defer_indexes']
+        args.index_profile = settings['index_profile']
+    elif args.sink == 'mysql' and not (args.partition_by_month or args.append or args.refresh_rollups
+                                       or args.reload):
+        checkpoint = RunCheckpoint(checkpoint_path)
     
     generator = MockDataGenerator(
-        host=args.host,
-        database=args.database,
-        user=args.user,
-        password=args.password
+        scale_factor=args.scale_factor,
+        chunk_size=args.chunk_size,
+        seed=args.seed,
+        workers=args.workers,
+        as_of=args.as_of,
+        locale=args.locale,
+        pool_cache_dir=args.pool_cache_dir,
+        sink=sink,
+        defer_indexes=args.defer_indexes,
+        index_profile=args.index_profile,
+        rollups=args.rollups,
+        partition_by_month=args.partition_by_month,
+        profiler=LoadProfiler(tracemalloc_dir=args.tracemalloc),
+        checkpoint=checkpoint,
+        snapshots=SnapshotCache(args.snapshot_cache_dir, int(args.snapshot_cache_size * 2**30))
+        if args.snapshot_cache else None,
+        skew_profile=args.skew_profile
     )
+    profile = cProfile.Profile() if args.cprofile else None
+    if args.tracemalloc:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
     
     try:
+        if shadow_reload is not None:
+            shadow_reload.open()
+            shadow_reload.prepare()
         generator.connect()
         
+        if args.drop_schema:
+            generator.drop_tables()
+        
         if args.create_schema:
             print("Creating database schema...")
             generator.execute_schema()
@@ -533,13 +3952,53 @@ def main():
             print("Clearing existing data...")
             generator.clear_tables()
         
-        generator.generate_all_mock_data()
+        if args.refresh_rollups:
+            generator.refresh_rollups()
+        elif args.append:
+            LiveIngest(generator, rate=args.rate, duration=args.duration,
+                       rows_per_transaction=args.rows_per_transaction or DEFAULT_ROWS_PER_TRANSACTION,
+                       time_scale=args.time_scale).run()
+        elif profile is not None:
+            profile.runcall(generator.generate_all_mock_data)
+        else:
+            generator.generate_all_mock_data()
+        
+        if args.validate:
+            # Appended rows follow the live lifecycle, not the full-load status weights
+            generator.validate(distributions=not args.append)
+        
+        if shadow_reload is not None:
+            shadow_reload.promote({table: stats['rows'] for table, stats in generator.profiler.tables.items()})
         
     except Exception as e:
         print(f"Error: {e}")
+        if checkpoint is not None and checkpoint.next_ids and not checkpoint.complete:
+            print(f"Progress is checkpointed in {checkpoint.path}; rerun with --resume to continue")
         sys.exit(1)
     finally:
         generator.disconnect()
+        if shadow_reload is not None:
+            shadow_reload.close()
+    
+    if profile is not None:
+        profile.dump_stats(args.cprofile)
+        print(f"Wrote cProfile stats to {args.cprofile}; hottest functions by cumulative time:")
+        pstats.Stats(profile).sort_stats('cumulative').print_stats(PROFILE_TOP_FUNCTIONS)
+    if args.profile_report:
+        generator.profiler.write_report(args.profile_report, {
+            'scale_factor': args.scale_factor,
+            'seed': args.seed,
+            'skew_profile': args.skew_profile,
+            'as_of': generator.now,
+            'workers': args.workers,
+            'chunk_size': args.chunk_size,
+            'sink': generator.sink.label,
+            'writers': args.writers,
+            'defer_indexes': args.defer_indexes,
+            'index_profile': args.index_profile,
+            'partition_by_month': args.partition_by_month,
+            'rollups': args.rollups,
+        })
 
 if __name__ == "__main__":
     main()